@@ -0,0 +1,475 @@
+"""
+backends do Navegador: cada um traduz as ações (localizar, esperar, clicar, digitar...)
+para as chamadas nativas da biblioteca que controla o navegador
+
+    BackendSelenium     selenium (Chrome, Edge e Firefox)
+    BackendUndetected   undetected-chromedriver (Chrome undetected)
+    BackendDrission     DrissionPage (Edge undetected), com esperas e cliques direto via CDP
+"""
+
+#bibliotecas para medir o tempo das esperas
+import time
+
+#bibliotecas do selenium
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.support.ui import Select
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    NoSuchElementException,
+    TimeoutException,
+)
+
+#tradução dos XPaths para buscas por id/CSS
+from .localizadores import compilar_localizador, seletor_css
+
+#exceções do DrissionPage equivalentes às de "impedimento" do selenium
+from DrissionPage.errors import ElementLostError, CanNotClickError, NoRectError
+
+#exceções que justificam tentar a ação de novo (ver Navegador._repetir_por_interceptacao)
+EXCECOES_REPETIVEIS = (
+    ElementClickInterceptedException,
+    ElementNotInteractableException,
+    StaleElementReferenceException,
+    ElementLostError,
+    CanNotClickError,
+    NoRectError,
+)
+
+#põe o foco no campo com o cursor no final do texto atual (antes do Input.insertText)
+SCRIPT_FOCAR_FINAL = r"""
+const el = arguments[0];
+el.focus();
+if (typeof el.setSelectionRange === 'function') {
+    try { el.setSelectionRange(el.value.length, el.value.length); } catch (e) {}
+} else if (el.isContentEditable) {
+    const intervalo = document.createRange();
+    intervalo.selectNodeContents(el);
+    intervalo.collapse(false);
+    const selecao = window.getSelection();
+    selecao.removeAllRanges();
+    selecao.addRange(intervalo);
+}
+"""
+
+#acrescenta o texto ao campo (ou substitui, com arguments[2]) pelo setter nativo do value,
+#para que frameworks (React, Vue...) percebam a mudança, e dispara os eventos input e change
+SCRIPT_INSERIR_TEXTO = r"""
+const el = arguments[0], texto = arguments[1], substituir = arguments[2];
+el.focus();
+if (el.isContentEditable) {
+    if (substituir) el.textContent = '';
+    document.execCommand('insertText', false, texto);
+    return;
+}
+const prototipo = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+Object.getOwnPropertyDescriptor(prototipo, 'value').set.call(el, substituir ? texto : (el.value || '') + texto);
+el.dispatchEvent(new Event('input', {bubbles: true}));
+el.dispatchEvent(new Event('change', {bubbles: true}));
+"""
+
+class BackendSelenium:
+    '''
+    Backend que executa as ações com o selenium (WebDriverWait + expected_conditions).
+
+    Args:
+        navegador (Navegador): O Navegador dono do backend (fornece o driver, a espera padrão e as métricas).
+    '''
+    #condição de espera -> expected_condition do selenium
+    CONDICOES = {
+        "presente": EC.presence_of_element_located,
+        "clicavel": EC.element_to_be_clickable,
+        "visivel": EC.visibility_of_element_located,
+        "invisivel": EC.invisibility_of_element_located,
+        "todos": EC.presence_of_all_elements_located,
+    }
+    #estratégia do localizador compilado -> By do selenium
+    ESTRATEGIAS = {
+        "id": By.ID,
+        "css": By.CSS_SELECTOR,
+        "xpath": By.XPATH,
+    }
+
+    def __init__(self, navegador):
+
+        self.navegador = navegador
+
+    @property
+    def driver(self):
+        return self.navegador.driver
+
+    def localizar(self, xpath: str):
+
+        '''
+        Traduz o XPath para a busca mais rápida (id, CSS ou o próprio XPath). XPaths malformados
+        levantam XPathInvalidoErro aqui, antes de qualquer ida ao navegador.
+
+        Args:
+            xpath (str): O XPath do elemento.
+
+        Returns:
+            tuple: O localizador do selenium (By, valor).
+        '''
+        localizador = compilar_localizador(xpath, self.navegador.compilar_xpath)
+        return (self.ESTRATEGIAS[localizador.estrategia], localizador.valor)
+
+    def aguardar(self, xpath: str, condicao: str = "presente", timeout: float = None):
+
+        '''
+        Aguarda o elemento atingir a condição e o devolve.
+
+        Args:
+            xpath (str): O XPath do elemento.
+            condicao (str): "presente", "clicavel", "visivel", "invisivel" ou "todos" (lista de elementos). Padrão é "presente".
+            timeout (float, opcional): Tempo máximo de espera (em segundos). Padrão é o tempo_wait do driver.
+
+        Returns:
+            O elemento nativo (ou a lista de elementos, ou True para "invisivel").
+        '''
+        espera = self.navegador.wait if timeout is None else self.navegador._criar_espera(timeout)
+        return espera.until(self.CONDICOES[condicao](self.localizar(xpath)))
+
+    def encontrar(self, xpath: str):
+
+        '''devolve o primeiro elemento, sem esperar (NoSuchElementException se não existir)'''
+        return self.driver.find_element(*self.localizar(xpath))
+
+    def clicar(self, elemento):
+        elemento.click()
+
+    def digitar(self, elemento, texto: str):
+        elemento.send_keys(texto)
+
+    def inserir(self, elemento, texto: str):
+
+        '''
+        Insere o texto de uma vez, sem um evento de tecla por caractere: via CDP (Input.insertText, que
+        dispara beforeinput/input como uma colagem) no Chrome e no Edge, e via script no Firefox (ou sem CDP).
+
+        Args:
+            elemento: O elemento nativo (já localizado).
+            texto (str): O texto a acrescentar ao campo.
+        '''
+        if self.navegador.navegador == "firefox":
+            self.preencher(elemento, texto)
+            return
+        self.executar_script(SCRIPT_FOCAR_FINAL, elemento)
+        try:
+            self.navegador._executar_cdp("Input.insertText", {"text": texto})
+        except NotImplementedError: #driver sem CDP (ex: WebDriver remoto)
+            self.preencher(elemento, texto)
+
+    def preencher(self, elemento, texto: str, substituir: bool = False):
+
+        '''acrescenta (ou substitui) o valor do campo via script, com os eventos input e change'''
+        self.executar_script(SCRIPT_INSERIR_TEXTO, elemento, texto, substituir)
+
+    def limpar(self, elemento):
+        elemento.clear()
+
+    def passar_mouse(self, elemento):
+        ActionChains(self.driver).move_to_element(elemento).perform()
+
+    def selecionar_texto(self, elemento, texto: str):
+        Select(elemento).select_by_visible_text(texto)
+
+    def selecionar_valor(self, elemento, valor):
+        Select(elemento).select_by_value(valor)
+
+    def texto(self, elemento):
+        return elemento.text
+
+    def atributo(self, elemento, atributo: str):
+        return elemento.get_attribute(atributo)
+
+    def texto_selecionado(self, elemento):
+        return Select(elemento).first_selected_option.text
+
+    def rolar_ate(self, elemento):
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", elemento)
+
+    def selecionado(self, elemento):
+        return elemento.is_selected()
+
+    def habilitado(self, elemento):
+        return elemento.is_enabled()
+
+    def visivel(self, elemento):
+        return elemento.is_displayed()
+
+    def localizar_iframe(self, xpath: str):
+
+        '''aguarda o iframe existir (no frame atual) e devolve a referência usada para entrar nele'''
+        return self.aguardar(xpath, "presente")
+
+    def mudar_para_iframe(self, quadro):
+
+        '''entra num iframe já localizado (StaleElementReferenceException/NoSuchFrameException se a referência expirou)'''
+        self.driver.switch_to.frame(quadro)
+
+    def iframe_valido(self, quadro):
+
+        '''no selenium, uma referência expirada só é detectada ao tentar entrar no iframe'''
+        return True
+
+    def entrar_iframe(self, xpath: str):
+
+        '''muda o foco para dentro do iframe, esperando ele estar disponível'''
+        quadro = self.localizar_iframe(xpath)
+        self.mudar_para_iframe(quadro)
+        return quadro
+
+    def subir_iframe(self):
+        self.driver.switch_to.parent_frame()
+
+    def sair_iframe(self):
+        self.driver.switch_to.default_content()
+
+    def esquecer_iframes(self):
+
+        '''chamado após navegar ou trocar de aba (o driver já volta sozinho para a página principal)'''
+        pass
+
+    def executar_script(self, script: str, *args):
+        return self.driver.execute_script(script, *args)
+
+    def url_atual(self):
+        return self.driver.current_url
+
+    def abrir(self, url: str):
+        self.driver.get(url)
+
+    def recarregar(self):
+        self.driver.refresh()
+
+    def aba_atual(self):
+        return self.driver.current_window_handle
+
+    def abas(self):
+        return self.driver.window_handles
+
+    def nova_aba(self):
+
+        '''abre uma aba em branco (sem trocar o foco) e devolve o handle'''
+        # 'tab' abre uma aba. 'window' abriria uma nova janela separada.
+        return self.driver.execute("newWindow", {"type": "tab"})["value"]["handle"]
+
+    def focar_aba(self, handle: str):
+        self.driver.switch_to.window(handle)
+
+    def fechar_aba(self, handle: str):
+
+        '''fecha a aba, que precisa estar em foco'''
+        # .close() fecha SÓ a aba atual (diferente de .quit() que fecha tudo)
+        self.driver.close()
+
+class BackendUndetected(BackendSelenium):
+    '''
+    Backend do undetected-chromedriver. O driver é um webdriver.Chrome corrigido,
+    portanto as ações são as mesmas do selenium.
+    '''
+
+class BackendDrission(BackendSelenium):
+    '''
+    Backend do DrissionPage (ChromiumPage). Localiza, espera e clica direto via CDP,
+    sem passar pelo protocolo WebDriver, o que é bem mais rápido.
+    Dentro de um iframe as ações são executadas no objeto do frame (ChromiumFrame) e, em outra aba,
+    no objeto da aba (ChromiumTab): o ChromiumPage continua preso à aba em que foi aberto.
+    '''
+    def __init__(self, navegador):
+
+        super().__init__(navegador)
+        self._quadros = [] #iframes em que o foco está, do mais externo ao mais interno
+        self._aba = None #aba em foco (ChromiumTab), ou None para a aba do próprio ChromiumPage
+
+    @property
+    def pagina(self):
+
+        '''aba em foco (o ChromiumPage ou um ChromiumTab)'''
+        return self._aba if self._aba is not None else self.driver
+
+    @property
+    def contexto(self):
+
+        '''página ou iframe onde as ações são executadas'''
+        return self._quadros[-1] if self._quadros else self.pagina
+
+    def localizar(self, xpath: str):
+
+        #mesma tradução do selenium, no formato de localizador do DrissionPage ("css:..." ou "xpath:...")
+        localizador = compilar_localizador(xpath, self.navegador.compilar_xpath)
+        css = seletor_css(localizador)
+        return f"css:{css}" if css is not None else f"xpath:{xpath}"
+
+    def _tempo_limite(self, timeout: float = None):
+
+        '''função interna que devolve o timeout informado ou o tempo_wait do driver'''
+        return self.navegador._tempo_wait if timeout is None else timeout
+
+    def _localizar(self, xpath: str, timeout: float):
+
+        '''função interna que aguarda o elemento existir (busca nativa do DrissionPage)'''
+        elemento = self.contexto.ele(self.localizar(xpath), timeout=timeout)
+        if not elemento: #NoneElement
+            raise TimeoutException(f"Elemento não encontrado em {timeout} segundos: {xpath}")
+        return elemento
+
+    def _invisivel(self, xpath: str):
+
+        '''função interna que verifica se o elemento não existe ou não está visível'''
+        try:
+            elemento = self.contexto.ele(self.localizar(xpath), timeout=0)
+            return not elemento or not elemento.states.is_displayed
+        except ElementLostError:
+            return True
+
+    def aguardar(self, xpath: str, condicao: str = "presente", timeout: float = None):
+
+        if condicao not in self.CONDICOES:
+            raise KeyError(condicao)
+        timeout = self._tempo_limite(timeout)
+        inicio = time.perf_counter()
+        limite = inicio + timeout
+        try:
+            if condicao == "todos":
+                elementos = self.contexto.eles(self.localizar(xpath), timeout=timeout)
+                if not elementos:
+                    raise TimeoutException(f"Nenhum elemento encontrado em {timeout} segundos: {xpath}")
+                return list(elementos)
+
+            if condicao == "invisivel":
+                while not self._invisivel(xpath):
+                    if time.perf_counter() >= limite:
+                        raise TimeoutException(f"O elemento continuou visível por {timeout} segundos: {xpath}")
+                    time.sleep(self.navegador._intervalo_poll)
+                return True
+
+            elemento = self._localizar(xpath, timeout)
+            restante = max(limite - time.perf_counter(), 0)
+            if condicao == "clicavel" and not elemento.wait.clickable(wait_moved=False, timeout=restante, raise_err=False):
+                raise TimeoutException(f"O elemento não ficou clicável em {timeout} segundos: {xpath}")
+            if condicao == "visivel" and not elemento.wait.displayed(timeout=restante, raise_err=False):
+                raise TimeoutException(f"O elemento não ficou visível em {timeout} segundos: {xpath}")
+            return elemento
+        finally:
+            self.navegador._acumular("espera", time.perf_counter() - inicio)
+
+    def encontrar(self, xpath: str):
+
+        elemento = self.contexto.ele(self.localizar(xpath), timeout=0)
+        if not elemento:
+            raise NoSuchElementException(f"Elemento não encontrado: {xpath}")
+        return elemento
+
+    def clicar(self, elemento):
+        elemento.click()
+
+    def digitar(self, elemento, texto: str):
+        elemento.input(texto)
+
+    def limpar(self, elemento):
+        elemento.clear()
+
+    def passar_mouse(self, elemento):
+        elemento.hover()
+
+    def selecionar_texto(self, elemento, texto: str):
+        if not elemento.select.by_text(texto):
+            raise NoSuchElementException(f"Opção com o texto '{texto}' não encontrada.")
+
+    def selecionar_valor(self, elemento, valor):
+        if not elemento.select.by_value(valor):
+            raise NoSuchElementException(f"Opção com o valor '{valor}' não encontrada.")
+
+    def texto(self, elemento):
+        return elemento.text
+
+    def atributo(self, elemento, atributo: str):
+        #assim como no selenium, "value" devolve o valor atual do campo (e não o do HTML)
+        if atributo == "value":
+            return elemento.value
+        return elemento.attr(atributo)
+
+    def texto_selecionado(self, elemento):
+        return elemento.select.selected_option.text
+
+    def rolar_ate(self, elemento):
+        elemento.scroll.to_see()
+
+    def selecionado(self, elemento):
+        #checkbox e radio usam "checked"; option usa "selected"
+        if elemento.tag == "input":
+            return bool(elemento.states.is_checked)
+        return bool(elemento.states.is_selected)
+
+    def habilitado(self, elemento):
+        return elemento.states.is_enabled
+
+    def visivel(self, elemento):
+        return elemento.states.is_displayed
+
+    def localizar_iframe(self, xpath: str):
+
+        inicio = time.perf_counter()
+        try:
+            quadro = self.contexto.get_frame(self.localizar(xpath), timeout=self._tempo_limite())
+        finally:
+            self.navegador._acumular("espera", time.perf_counter() - inicio)
+        if not quadro:
+            raise TimeoutException(f"Iframe não encontrado: {xpath}")
+        return quadro
+
+    def mudar_para_iframe(self, quadro):
+        self._quadros.append(quadro)
+
+    def iframe_valido(self, quadro):
+        try:
+            return bool(quadro.states.is_alive)
+        except Exception:
+            return False
+
+    def subir_iframe(self):
+        if self._quadros:
+            self._quadros.pop()
+
+    def sair_iframe(self):
+        self._quadros = []
+
+    def esquecer_iframes(self):
+        self._quadros = []
+
+    def executar_script(self, script: str, *args):
+        return self.contexto.run_js(script, *args)
+
+    def url_atual(self):
+        return self.pagina.url
+
+    def abrir(self, url: str):
+        self.pagina.get(url)
+
+    def recarregar(self):
+        self.pagina.refresh()
+
+    def aba_atual(self):
+        return self.pagina.tab_id
+
+    def abas(self):
+        return self.driver.tab_ids
+
+    def nova_aba(self):
+        return self.driver.new_tab().tab_id
+
+    def focar_aba(self, handle: str):
+
+        self._aba = None if handle == self.driver.tab_id else self.driver.get_tab(handle)
+        self.driver.activate_tab(handle)
+        self._quadros = []
+
+    def fechar_aba(self, handle: str):
+
+        self.driver.close_tabs(handle)
+        if self._aba is not None and self._aba.tab_id == handle:
+            self._aba = None
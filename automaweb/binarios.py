@@ -0,0 +1,202 @@
+"""
+cache em disco dos binários resolvidos (driver, navegador e versão)
+
+sem o cache, cada abertura de driver chama o Selenium Manager (que consulta versões
+e pode acessar a internet) e o undetected-chromedriver baixa e corrige o chromedriver
+de novo. com o cache, as aberturas seguintes (inclusive em outros processos) usam
+os caminhos já resolvidos e só voltam a resolver se o navegador for atualizado.
+"""
+
+#bibliotecas para manipulação de arquivos e pastas
+from contextlib import contextmanager
+import shutil
+import json
+import os
+
+try: #trava entre processos (Linux/macOS)
+    import fcntl
+except ImportError:
+    fcntl = None
+try: #trava entre processos (Windows)
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+PASTA_CACHE_PADRAO = os.path.join(os.path.expanduser("~"), ".cache", "automaweb")
+
+def _impressao(caminho: str):
+
+    '''função interna que identifica a versão de um binário pelo tamanho e data de modificação'''
+    if not caminho:
+        return None
+    try:
+        informacoes = os.stat(os.path.realpath(caminho))
+    except OSError:
+        return None
+    return [informacoes.st_size, informacoes.st_mtime_ns]
+
+class CacheBinarios:
+    '''
+    Cache (compartilhado entre processos) dos caminhos de driver e navegador já resolvidos.
+    Uma entrada só é reutilizada se os dois arquivos ainda existirem e não tiverem mudado.
+
+    Args:
+        pasta (str, opcional): A pasta do cache. Padrão é ~/.cache/automaweb (ou a variável de ambiente AUTOMAWEB_CACHE).
+    '''
+    def __init__(self, pasta: str = None):
+
+        self.pasta = pasta or os.environ.get("AUTOMAWEB_CACHE") or PASTA_CACHE_PADRAO
+        self.arquivo = os.path.join(self.pasta, "binarios.json")
+
+    @contextmanager
+    def _travar(self):
+
+        '''função interna que impede dois processos de gravarem o cache ao mesmo tempo'''
+        os.makedirs(self.pasta, exist_ok=True)
+        with open(os.path.join(self.pasta, "binarios.lock"), "a+") as trava:
+            if fcntl is not None:
+                fcntl.flock(trava.fileno(), fcntl.LOCK_EX)
+            elif msvcrt is not None:
+                trava.seek(0)
+                msvcrt.locking(trava.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(trava.fileno(), fcntl.LOCK_UN)
+                elif msvcrt is not None:
+                    trava.seek(0)
+                    msvcrt.locking(trava.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def _ler(self):
+
+        try:
+            with open(self.arquivo, "r", encoding="utf-8") as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+
+    def _gravar(self, dados: dict):
+
+        temporario = f"{self.arquivo}.{os.getpid()}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump(dados, arquivo, indent=4)
+        os.replace(temporario, self.arquivo)
+
+    def obter(self, chave: str):
+
+        '''
+        Devolve a entrada do cache se ela ainda for válida.
+
+        Args:
+            chave (str): A chave da entrada (ex: "chrome").
+
+        Returns:
+            dict: A entrada ({"driver", "navegador", "versao", ...}) ou None.
+        '''
+        entrada = self._ler().get(chave)
+        if not entrada:
+            return None
+        if not os.path.isfile(entrada.get("driver", "")):
+            return None
+        if _impressao(entrada["driver"]) != entrada.get("impressao_driver"):
+            return None
+        if entrada.get("navegador") and _impressao(entrada["navegador"]) != entrada.get("impressao_navegador"):
+            #o navegador foi atualizado (ou removido): a versão do driver pode não bater mais
+            return None
+        return entrada
+
+    def salvar(self, chave: str, driver: str, navegador: str = None, **extras):
+
+        '''
+        Grava (ou substitui) uma entrada no cache.
+
+        Args:
+            chave (str): A chave da entrada.
+            driver (str): O caminho do executável do driver.
+            navegador (str, opcional): O caminho do executável do navegador.
+            **extras: Outros dados (ex: versao).
+
+        Returns:
+            dict: A entrada gravada.
+        '''
+        entrada = {
+            "driver": driver,
+            "navegador": navegador,
+            "impressao_driver": _impressao(driver),
+            "impressao_navegador": _impressao(navegador),
+            **extras,
+        }
+        with self._travar():
+            dados = self._ler()
+            dados[chave] = entrada
+            self._gravar(dados)
+        return entrada
+
+    def atualizar(self, chave: str, **extras):
+
+        '''atualiza campos extras (ex: versao) de uma entrada existente'''
+        with self._travar():
+            dados = self._ler()
+            if chave in dados:
+                dados[chave].update(extras)
+                self._gravar(dados)
+
+    def invalidar(self, chave: str = None):
+
+        '''
+        Remove uma entrada (ou todas, se a chave não for informada) do cache.
+
+        Args:
+            chave (str, opcional): A chave da entrada.
+        '''
+        with self._travar():
+            dados = self._ler()
+            if chave is None:
+                dados = {}
+            else:
+                dados.pop(chave, None)
+            self._gravar(dados)
+
+    def guardar_driver_corrigido(self, origem: str, nome: str):
+
+        '''
+        Copia um driver já corrigido (undetected-chromedriver) para dentro da pasta do cache.
+
+        Args:
+            origem (str): O caminho do driver corrigido.
+            nome (str): O nome do arquivo dentro do cache.
+
+        Returns:
+            str: O caminho da cópia.
+        '''
+        destino = os.path.join(self.pasta, nome)
+        with self._travar():
+            temporario = f"{destino}.{os.getpid()}.tmp"
+            shutil.copy2(origem, temporario)
+            os.replace(temporario, destino)
+        return destino
+
+def resolver_com_selenium_manager(options):
+
+    '''
+    Pergunta ao Selenium Manager os caminhos do driver e do navegador para as opções informadas.
+    Se a consulta normal falhar (ex: máquina sem internet), tenta de novo no modo offline.
+
+    Args:
+        options: As opções do navegador (ChromeOptions, EdgeOptions ou FirefoxOptions).
+
+    Returns:
+        dict: {"driver_path": ..., "browser_path": ...}
+    '''
+    from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+    argumentos = ["--browser", options.capabilities["browserName"]]
+    if getattr(options, "browser_version", None):
+        argumentos += ["--browser-version", str(options.browser_version)]
+    if getattr(options, "binary_location", None):
+        argumentos += ["--browser-path", str(options.binary_location)]
+    try:
+        return SeleniumManager().binary_paths(argumentos)
+    except Exception:
+        return SeleniumManager().binary_paths(argumentos + ["--offline"])
@@ -0,0 +1,170 @@
+"""
+conexão direta com o Chrome DevTools Protocol (CDP) de uma aba do navegador
+
+o selenium só permite enviar comandos CDP (execute_cdp_cmd), sem receber eventos.
+esta conexão abre um websocket próprio com a aba e permite assinar eventos
+(ex: frames de screencast, respostas de rede) sem bloquear o fluxo principal.
+"""
+
+#biblioteca de websocket (já instalada como dependência do selenium)
+import websocket
+
+#bibliotecas para tarefas em segundo plano
+import threading
+import itertools
+import json
+
+class ErroCDP(RuntimeError):
+    '''Erro devolvido pelo navegador para um comando CDP.'''
+
+class SessaoCDP:
+    '''
+    Sessão CDP ligada a uma única aba (target) do navegador.
+
+    Args:
+        url_websocket (str): O endereço "ws://.../devtools/page/<id>" da aba.
+    '''
+    def __init__(self, url_websocket: str):
+
+        #suppress_origin evita a recusa do Chrome 111+ (que exige --remote-allow-origins)
+        self._ws = websocket.create_connection(url_websocket, suppress_origin=True, enable_multithread=True)
+        self._ids = itertools.count(1)
+        self._pendentes = {} #id do comando -> [evento, resposta]
+        self._ouvintes = {} #nome do evento -> lista de funções
+        self._lock = threading.Lock()
+        self._aberta = True
+        self._thread = threading.Thread(target=self._ler, name="automaweb-cdp", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def endereco_depuracao(driver):
+
+        '''
+        Descobre o endereço "host:porta" de depuração remota de um driver Chrome/Edge.
+
+        Args:
+            driver: O driver do selenium, undetected-chromedriver ou DrissionPage.
+
+        Returns:
+            str: O endereço de depuração (ex: "127.0.0.1:9222").
+        '''
+        if hasattr(driver, "address"): #DrissionPage
+            return driver.address
+        capacidades = getattr(driver, "capabilities", {}) or {}
+        for chave in ("goog:chromeOptions", "ms:edgeOptions"):
+            endereco = capacidades.get(chave, {}).get("debuggerAddress")
+            if endereco:
+                return endereco
+        raise NotImplementedError("O driver atual não expõe um endereço de depuração CDP.")
+
+    @property
+    def aberta(self):
+
+        '''indica se o websocket ainda está conectado'''
+        return self._aberta
+
+    def executar(self, metodo: str, parametros: dict = None, timeout: float = 30):
+
+        '''
+        Envia um comando CDP e aguarda a resposta.
+
+        Args:
+            metodo (str): O nome do comando (ex: "Page.enable").
+            parametros (dict, opcional): Os parâmetros do comando.
+            timeout (float): Tempo máximo de espera pela resposta (em segundos). Padrão é 30.
+
+        Returns:
+            dict: O resultado do comando.
+        '''
+        id_comando = next(self._ids)
+        pendente = [threading.Event(), None]
+        with self._lock:
+            self._pendentes[id_comando] = pendente
+        self._ws.send(json.dumps({"id": id_comando, "method": metodo, "params": parametros or {}}))
+
+        if not pendente[0].wait(timeout):
+            with self._lock:
+                self._pendentes.pop(id_comando, None)
+            raise TimeoutError(f"O comando CDP '{metodo}' não respondeu em {timeout} segundos.")
+        resposta = pendente[1]
+        if resposta is None:
+            raise ErroCDP(f"A conexão CDP foi encerrada antes da resposta de '{metodo}'.")
+        if "error" in resposta:
+            raise ErroCDP(f"{metodo}: {resposta['error'].get('message')}")
+        return resposta.get("result", {})
+
+    def enviar(self, metodo: str, parametros: dict = None):
+
+        '''
+        Envia um comando CDP sem aguardar a resposta (útil dentro de ouvintes de eventos).
+
+        Args:
+            metodo (str): O nome do comando.
+            parametros (dict, opcional): Os parâmetros do comando.
+        '''
+        self._ws.send(json.dumps({"id": next(self._ids), "method": metodo, "params": parametros or {}}))
+
+    def ao_receber(self, evento: str, funcao):
+
+        '''
+        Registra uma função para ser chamada a cada ocorrência do evento.
+        A função recebe o dicionário "params" do evento e roda na thread de leitura,
+        portanto deve ser rápida (delegue trabalhos pesados para outra thread).
+
+        Args:
+            evento (str): O nome do evento (ex: "Page.screencastFrame").
+            funcao (callable): A função que receberá os parâmetros do evento.
+        '''
+        with self._lock:
+            self._ouvintes.setdefault(evento, []).append(funcao)
+
+    def remover_ouvinte(self, evento: str, funcao):
+
+        '''remove uma função registrada com ao_receber()'''
+        with self._lock:
+            if funcao in self._ouvintes.get(evento, []):
+                self._ouvintes[evento].remove(funcao)
+
+    def fechar(self):
+
+        '''
+        Encerra a conexão com a aba (o navegador continua aberto).
+        '''
+        self._aberta = False
+        try:
+            self._ws.close()
+        except Exception:
+            pass
+
+    def _ler(self):
+
+        '''função interna que recebe as mensagens do websocket e as distribui'''
+        try:
+            while self._aberta:
+                mensagem = json.loads(self._ws.recv())
+                if "id" in mensagem:
+                    with self._lock:
+                        pendente = self._pendentes.pop(mensagem["id"], None)
+                    if pendente is not None:
+                        pendente[1] = mensagem
+                        pendente[0].set()
+                    continue
+
+                with self._lock:
+                    ouvintes = list(self._ouvintes.get(mensagem.get("method"), []))
+                for funcao in ouvintes:
+                    try:
+                        funcao(mensagem.get("params", {}))
+                    except Exception as e:
+                        print(f"Erro no ouvinte do evento '{mensagem.get('method')}': {e}")
+        except Exception:
+            #websocket fechado (aba ou navegador encerrados)
+            pass
+        finally:
+            self._aberta = False
+            #libera quem ainda estava esperando resposta
+            with self._lock:
+                pendentes = list(self._pendentes.values())
+                self._pendentes.clear()
+            for pendente in pendentes:
+                pendente[0].set()
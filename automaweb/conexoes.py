@@ -0,0 +1,155 @@
+"""
+conexões HTTP do WebDriver compartilhadas entre as sessões, com a latência de cada ida e volta
+
+o selenium cria um urllib3.PoolManager por sessão com uma única conexão por host: com
+várias threads (ou várias sessões no mesmo grid) as conexões extras são abertas e
+descartadas a cada comando. aqui todas as sessões do processo usam o mesmo PoolManager,
+com várias conexões keep-alive por host, e cada comando tem a sua ida e volta medida
+(por sessão e no total do processo).
+"""
+
+#bibliotecas de rede e para tarefas em paralelo
+import threading
+import urllib3
+import time
+
+from .metricas import Histograma
+
+#limites (em segundos) dos baldes da latência dos comandos, mais finos que os das ações
+LIMITES_IDA_VOLTA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_configuracao = {"conexoes_por_host": 16, "hosts": 64}
+_gerenciador = None
+_trava = threading.Lock()
+
+class LatenciaComandos:
+    '''
+    Histograma (thread-safe) do tempo de ida e volta dos comandos WebDriver (requisição HTTP + resposta completa).
+    '''
+    def __init__(self):
+
+        self._histograma = Histograma(LIMITES_IDA_VOLTA)
+        self._trava = threading.Lock()
+
+    def observar(self, duracao: float):
+
+        '''registra a ida e volta de um comando (em segundos)'''
+        with self._trava:
+            self._histograma.observar(duracao)
+
+    def resumo(self):
+
+        '''
+        Devolve as estatísticas (contagem, média, mínimo, máximo, p50, p90, p99 e baldes), em segundos.
+
+        Returns:
+            dict: As estatísticas.
+        '''
+        with self._trava:
+            return self._histograma.resumo()
+
+    def limpar(self):
+
+        '''descarta as amostras registradas'''
+        with self._trava:
+            self._histograma = Histograma(LIMITES_IDA_VOLTA)
+
+#todas as idas e voltas do processo (a soma de todas as sessões)
+latencia_global = LatenciaComandos()
+
+class ConexaoMedida:
+    '''
+    Intermediário entre o RemoteConnection do selenium e o PoolManager compartilhado: repassa as requisições
+    e mede cada ida e volta. O clear() do fechamento da sessão não derruba as conexões das outras sessões.
+
+    Args:
+        gerenciador (urllib3.PoolManager): O gerenciador de conexões (o compartilhado ou o próprio da sessão).
+        latencia (LatenciaComandos): Onde registrar a latência desta sessão.
+        compartilhado (bool): Se True, o clear() não fecha as conexões. Padrão é True.
+    '''
+    def __init__(self, gerenciador, latencia: LatenciaComandos, compartilhado: bool = True):
+
+        self._gerenciador = gerenciador
+        self._latencia = latencia
+        self._compartilhado = compartilhado
+
+    def request(self, method, url, **kwargs):
+
+        inicio = time.perf_counter()
+        try:
+            return self._gerenciador.request(method, url, **kwargs)
+        finally:
+            duracao = time.perf_counter() - inicio
+            self._latencia.observar(duracao)
+            latencia_global.observar(duracao)
+
+    def clear(self):
+
+        #o gerenciador compartilhado é de todas as sessões: as conexões ociosas ficam para as próximas
+        if not self._compartilhado:
+            self._gerenciador.clear()
+
+    def __getattr__(self, nome):
+
+        return getattr(self._gerenciador, nome)
+
+def configurar_conexoes(conexoes_por_host: int = 16, hosts: int = 64):
+
+    '''
+    Ajusta o gerenciador de conexões compartilhado pelas sessões WebDriver (vale para os drivers abertos depois).
+
+    Args:
+        conexoes_por_host (int): Quantas conexões keep-alive ficam abertas por host (driver local ou nó do grid). Padrão é 16.
+        hosts (int): Quantos hosts diferentes mantêm conexões abertas ao mesmo tempo. Padrão é 64.
+    '''
+    global _gerenciador
+    with _trava:
+        _configuracao.update({"conexoes_por_host": conexoes_por_host, "hosts": hosts})
+        _gerenciador = None
+
+def gerenciador_compartilhado():
+
+    '''
+    Devolve o urllib3.PoolManager compartilhado (criado na primeira chamada).
+
+    Returns:
+        urllib3.PoolManager: O gerenciador de conexões.
+    '''
+    global _gerenciador
+    with _trava:
+        if _gerenciador is None:
+            #block=False: com mais threads que conexões, as extras são abertas na hora em vez de esperar na fila
+            _gerenciador = urllib3.PoolManager(
+                num_pools=_configuracao["hosts"], maxsize=_configuracao["conexoes_por_host"], block=False
+            )
+        return _gerenciador
+
+def instalar_conexao(driver, latencia: LatenciaComandos):
+
+    '''
+    Troca as conexões próprias do driver do selenium pelo gerenciador compartilhado, medindo cada comando.
+    Drivers com proxy ou HTTPS mantêm o seu gerenciador (só passam a ser medidos).
+
+    Args:
+        driver: O driver do selenium (ou do undetected-chromedriver).
+        latencia (LatenciaComandos): Onde registrar a latência da sessão.
+
+    Returns:
+        bool: True se o driver passou a usar o gerenciador compartilhado.
+    '''
+    executor = getattr(driver, "command_executor", None)
+    original = getattr(executor, "_conn", None)
+    if original is None: #DrissionPage (CDP direto) ou keep_alive desligado
+        return False
+    if isinstance(original, ConexaoMedida):
+        return True
+    configuracao = getattr(executor, "_client_config", None)
+    #proxy e HTTPS (certificados) dependem das opções de cada sessão
+    proprio = getattr(executor, "_proxy_url", None) or getattr(configuracao, "ignore_certificates", False) \
+        or str(getattr(configuracao, "remote_server_addr", "")).startswith("https")
+    if proprio:
+        executor._conn = ConexaoMedida(original, latencia, compartilhado=False)
+        return False
+    executor._conn = ConexaoMedida(gerenciador_compartilhado(), latencia)
+    original.clear() #fecha a conexão usada na criação da sessão
+    return True
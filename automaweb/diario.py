@@ -0,0 +1,348 @@
+"""
+diário de tarefas em SQLite: registra o andamento de lotes longos para retomar de onde parou
+
+cada item do lote passa por pendente -> executando -> concluida (ou falhou).
+ao reiniciar, os itens concluídos são pulados, os que falharam são tentados de novo
+(até max_tentativas) e os que ficaram "executando" por um worker que morreu voltam
+para a fila quando a reserva expira. vários workers (threads ou processos) podem
+puxar tarefas do mesmo arquivo sem processar o mesmo item duas vezes.
+
+exemplo:
+    diario = DiarioTarefas("lote_clientes.db", max_tentativas=3)
+    diario.adicionar(clientes, chave="cpf")
+    diario.processar(lambda cliente: cadastrar(nav, cliente))
+    print(diario.resumo())
+"""
+
+#bibliotecas para o banco de dados e tarefas em paralelo
+import threading
+import sqlite3
+import socket
+import json
+import time
+import os
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tarefas (
+    chave TEXT PRIMARY KEY,
+    dados TEXT,
+    estado TEXT NOT NULL DEFAULT 'pendente',
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    trabalhador TEXT,
+    reservada_ate REAL,
+    resultado TEXT,
+    erro TEXT,
+    criada_em REAL NOT NULL,
+    atualizada_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tarefas_estado ON tarefas (estado);
+"""
+
+#tarefas que falharam, inclusive as de um worker que morreu na última tentativa (ainda "executando", com a reserva expirada)
+CONDICAO_FALHAS = "estado = 'falhou' OR (estado = 'executando' AND reservada_ate < ? AND tentativas >= ?)"
+
+class Tarefa:
+    '''
+    Tarefa reservada por um worker.
+
+    Atributos:
+        chave (str): A chave única do item.
+        dados: Os dados do item (como foram adicionados).
+        tentativas (int): Quantas vezes o item já foi reservado, contando a atual.
+        trabalhador (str): O worker que reservou a tarefa.
+    '''
+    def __init__(self, chave, dados, tentativas, trabalhador=None):
+
+        self.chave = chave
+        self.dados = dados
+        self.tentativas = tentativas
+        self.trabalhador = trabalhador
+
+    def __repr__(self):
+        return f"Tarefa({self.chave!r}, tentativa {self.tentativas})"
+
+class DiarioTarefas:
+    '''
+    Diário de tarefas (SQLite) compartilhado entre workers.
+
+    Args:
+        caminho (str): O arquivo do banco (criado se não existir).
+        max_tentativas (int): Quantas vezes um item pode ser tentado antes de ser dado como esgotado. Padrão é 3.
+        tempo_reserva (float): Por quantos segundos uma tarefa fica reservada para um worker. Se o worker
+            morrer, a tarefa volta para a fila depois desse tempo. Padrão é 600.
+    '''
+    def __init__(self, caminho: str, max_tentativas: int = 3, tempo_reserva: float = 600):
+
+        self.caminho = caminho
+        self.max_tentativas = max_tentativas
+        self.tempo_reserva = tempo_reserva
+        self.trabalhador = f"{socket.gethostname()}:{os.getpid()}"
+        self._local = threading.local() #uma conexão por thread (o sqlite3 não compartilha conexões entre threads)
+        self._conexao().executescript(ESQUEMA)
+
+    def _conexao(self):
+
+        '''função interna que devolve a conexão da thread atual'''
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            #autocommit (isolation_level=None): as transações são abertas explicitamente com BEGIN IMMEDIATE
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode=WAL") #leitores não bloqueiam o worker que grava
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    def _transacao(self, funcao):
+
+        '''função interna que executa a função numa transação com trava de escrita (BEGIN IMMEDIATE)'''
+        conexao = self._conexao()
+        conexao.execute("BEGIN IMMEDIATE")
+        try:
+            resultado = funcao(conexao)
+            conexao.execute("COMMIT")
+            return resultado
+        except BaseException:
+            conexao.execute("ROLLBACK")
+            raise
+
+    def adicionar(self, itens, chave=None):
+
+        '''
+        Adiciona itens ao diário. Itens já existentes (mesma chave) são ignorados,
+        então é seguro chamar de novo ao reiniciar o lote.
+
+        Args:
+            itens (iterable): Os itens (qualquer valor serializável em JSON).
+            chave (str | callable, opcional): O campo do item usado como chave (para dicionários) ou uma
+                função que recebe o item e devolve a chave. Padrão é o próprio item convertido em texto.
+
+        Returns:
+            int: Quantos itens novos foram adicionados.
+        '''
+        if chave is None:
+            obter_chave = str
+        elif callable(chave):
+            obter_chave = chave
+        else:
+            obter_chave = lambda item: item[chave]
+        agora = time.time()
+        linhas = [(str(obter_chave(item)), json.dumps(item, ensure_ascii=False, default=str), agora, agora) for item in itens]
+
+        def inserir(conexao):
+            antes = conexao.total_changes
+            conexao.executemany(
+                "INSERT OR IGNORE INTO tarefas (chave, dados, criada_em, atualizada_em) VALUES (?, ?, ?, ?)", linhas
+            )
+            return conexao.total_changes - antes
+
+        return self._transacao(inserir)
+
+    def proximo(self, trabalhador: str = None):
+
+        '''
+        Reserva a próxima tarefa disponível: pendente, com falha e tentativas restantes,
+        ou com a reserva expirada (worker que morreu no meio).
+
+        Args:
+            trabalhador (str, opcional): A identificação do worker. Padrão é "maquina:pid".
+
+        Returns:
+            Tarefa: A tarefa reservada ou None se não houver mais nada a fazer.
+        '''
+        trabalhador = trabalhador or f"{self.trabalhador}:{threading.get_ident()}"
+
+        def reservar(conexao):
+            agora = time.time()
+            linha = conexao.execute(
+                """
+                SELECT chave, dados, tentativas FROM tarefas
+                WHERE (estado = 'pendente' AND tentativas < ?)
+                   OR (estado = 'falhou' AND tentativas < ?)
+                   OR (estado = 'executando' AND reservada_ate < ? AND tentativas < ?)
+                ORDER BY tentativas, rowid LIMIT 1
+                """,
+                (self.max_tentativas, self.max_tentativas, agora, self.max_tentativas),
+            ).fetchone()
+            if linha is None:
+                return None
+            conexao.execute(
+                """
+                UPDATE tarefas SET estado = 'executando', tentativas = tentativas + 1, trabalhador = ?,
+                    reservada_ate = ?, atualizada_em = ? WHERE chave = ?
+                """,
+                (trabalhador, agora + self.tempo_reserva, agora, linha[0]),
+            )
+            return Tarefa(linha[0], json.loads(linha[1]), linha[2] + 1, trabalhador)
+
+        return self._transacao(reservar)
+
+    def _atualizar(self, tarefa, campos, valores):
+
+        '''função interna que atualiza a tarefa só se ela ainda for deste worker (a reserva pode ter expirado e passado para outro)'''
+        condicao, parametros = "chave = ?", [getattr(tarefa, "chave", tarefa)]
+        trabalhador = getattr(tarefa, "trabalhador", None)
+        if trabalhador is not None:
+            condicao += " AND estado = 'executando' AND trabalhador = ?"
+            parametros.append(trabalhador)
+        return self._transacao(lambda conexao: conexao.execute(
+            f"UPDATE tarefas SET {campos} WHERE {condicao}", (*valores, *parametros)
+        ).rowcount > 0)
+
+    def renovar(self, tarefa):
+
+        '''
+        Estende a reserva de uma tarefa demorada (evita que outro worker a pegue).
+
+        Args:
+            tarefa (Tarefa | str): A tarefa ou a sua chave.
+
+        Returns:
+            bool: False se a tarefa não está mais reservada para este worker.
+        '''
+        agora = time.time()
+        if not hasattr(tarefa, "trabalhador"):
+            return self._transacao(lambda conexao: conexao.execute(
+                "UPDATE tarefas SET reservada_ate = ?, atualizada_em = ? WHERE chave = ? AND estado = 'executando'",
+                (agora + self.tempo_reserva, agora, tarefa),
+            ).rowcount > 0)
+        return self._atualizar(tarefa, "reservada_ate = ?, atualizada_em = ?", (agora + self.tempo_reserva, agora))
+
+    def concluir(self, tarefa, resultado=None):
+
+        '''
+        Marca a tarefa como concluída. Com uma Tarefa, a conclusão só vale se a reserva ainda for deste
+        worker: se ela expirou e outro worker pegou o item, a conclusão atrasada é ignorada.
+
+        Args:
+            tarefa (Tarefa | str): A tarefa ou a sua chave.
+            resultado (opcional): Um resultado (serializável em JSON) para guardar junto.
+
+        Returns:
+            bool: False se a conclusão foi ignorada (reserva perdida).
+        '''
+        return self._atualizar(
+            tarefa, "estado = 'concluida', reservada_ate = NULL, resultado = ?, erro = NULL, atualizada_em = ?",
+            (json.dumps(resultado, ensure_ascii=False, default=str), time.time()),
+        )
+
+    def falhar(self, tarefa, erro=None):
+
+        '''
+        Marca a tarefa como falha. Ela será tentada de novo enquanto houver tentativas restantes.
+        Assim como no concluir, a falha de uma reserva perdida é ignorada.
+
+        Args:
+            tarefa (Tarefa | str): A tarefa ou a sua chave.
+            erro (Exception | str, opcional): O erro, guardado para consulta.
+
+        Returns:
+            bool: False se a falha foi ignorada (reserva perdida).
+        '''
+        if isinstance(erro, BaseException):
+            erro = f"{type(erro).__name__}: {erro}"
+        return self._atualizar(
+            tarefa, "estado = 'falhou', reservada_ate = NULL, erro = ?, atualizada_em = ?", (erro, time.time())
+        )
+
+    def processar(self, funcao, trabalhador: str = None, ao_falhar=None):
+
+        '''
+        Executa a função em cada tarefa disponível até a fila acabar, registrando sucesso ou falha.
+        Pode ser chamado em várias threads/processos ao mesmo tempo.
+
+        Args:
+            funcao (callable): Recebe os dados do item e devolve um resultado (opcional).
+            trabalhador (str, opcional): A identificação do worker.
+            ao_falhar (callable, opcional): Chamada com (tarefa, erro) quando o item falha
+                (ex: tirar uma screenshot ou reiniciar o navegador).
+
+        Returns:
+            dict: Quantas tarefas este worker concluiu e quantas falharam.
+        '''
+        contagem = {"concluidas": 0, "falhas": 0}
+        while True:
+            tarefa = self.proximo(trabalhador)
+            if tarefa is None:
+                return contagem
+            try:
+                resultado = funcao(tarefa.dados)
+            except Exception as e:
+                print(f"Erro na tarefa '{tarefa.chave}' (tentativa {tarefa.tentativas}/{self.max_tentativas}): {e}")
+                if not self.falhar(tarefa, e):
+                    print(f"A reserva da tarefa '{tarefa.chave}' expirou e passou para outro worker: falha ignorada")
+                    continue
+                contagem["falhas"] += 1
+                if ao_falhar is not None:
+                    ao_falhar(tarefa, e)
+                continue
+            if not self.concluir(tarefa, resultado):
+                print(f"A reserva da tarefa '{tarefa.chave}' expirou e passou para outro worker: conclusão ignorada")
+                continue
+            contagem["concluidas"] += 1
+
+    def resumo(self):
+
+        '''
+        Conta as tarefas por situação.
+
+        Returns:
+            dict: pendente, executando, concluida, falhou (ainda com tentativas) e esgotada (sem tentativas restantes,
+                contando as que ficaram "executando" com a reserva expirada).
+        '''
+        contagem = {"pendente": 0, "executando": 0, "concluida": 0, "falhou": 0, "esgotada": 0}
+        #uma tarefa na última tentativa ainda em andamento (reserva válida) não está esgotada
+        for estado, esgotada, total in self._conexao().execute(
+            """
+            SELECT estado, tentativas >= ? AND (estado = 'falhou' OR (estado = 'executando' AND reservada_ate < ?)),
+                COUNT(*) FROM tarefas GROUP BY 1, 2
+            """,
+            (self.max_tentativas, time.time()),
+        ):
+            contagem["esgotada" if esgotada else estado] += total
+        return contagem
+
+    def falhas(self):
+
+        '''
+        Lista as tarefas que falharam (com o último erro), inclusive as que ficaram "executando" na última
+        tentativa por um worker que morreu (sem erro registrado).
+
+        Returns:
+            list: Dicionários {chave, dados, tentativas, erro}.
+        '''
+        return [
+            {"chave": chave, "dados": json.loads(dados), "tentativas": tentativas, "erro": erro}
+            for chave, dados, tentativas, erro in self._conexao().execute(
+                f"SELECT chave, dados, tentativas, erro FROM tarefas WHERE {CONDICAO_FALHAS} ORDER BY rowid",
+                (time.time(), self.max_tentativas),
+            )
+        ]
+
+    def reiniciar_falhas(self):
+
+        '''
+        Devolve à fila (com as tentativas zeradas) as tarefas que falharam, inclusive as esgotadas
+        e as que ficaram "executando" na última tentativa por um worker que morreu.
+
+        Returns:
+            int: Quantas tarefas voltaram para a fila.
+        '''
+        def reiniciar(conexao):
+            agora = time.time()
+            return conexao.execute(
+                f"""
+                UPDATE tarefas SET estado = 'pendente', tentativas = 0, trabalhador = NULL, reservada_ate = NULL,
+                    atualizada_em = ? WHERE {CONDICAO_FALHAS}
+                """,
+                (agora, agora, self.max_tentativas),
+            ).rowcount
+
+        return self._transacao(reiniciar)
+
+    def fechar(self):
+
+        '''fecha a conexão da thread atual'''
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
@@ -0,0 +1,97 @@
+"""
+exceções do automaweb
+
+no modo autônomo (ver interface.py) as situações que antes abriam uma janela
+de aviso passam a levantar estas exceções, que podem ser tratadas pelo worker.
+"""
+
+class AutomaWebErro(Exception):
+    '''
+    Exceção base do automaweb.
+    '''
+
+class DriverNaoIniciadoErro(AutomaWebErro, RuntimeError):
+    '''
+    Uma ação do Navegador foi chamada antes de abrir_driver().
+    '''
+
+class ArquivoCookiesNaoEncontradoErro(AutomaWebErro, FileNotFoundError):
+    '''
+    O arquivo de cookies informado em carregar_cookies() não existe.
+    '''
+
+class PastaNaoEncontradaErro(AutomaWebErro, FileNotFoundError):
+    '''
+    A pasta informada não existe.
+    '''
+
+class InteracaoIndisponivelErro(AutomaWebErro, RuntimeError):
+    '''
+    A função precisa de um usuário (janela de seleção de arquivo/pasta) e o modo autônomo está ativo.
+    '''
+
+class PlanoInvalidoErro(AutomaWebErro, ValueError):
+    '''
+    O plano de ações tem passos inválidos (ação desconhecida, argumento faltando, XPath malformado...).
+    '''
+
+class ErroPlano(AutomaWebErro, RuntimeError):
+    '''
+    Um passo do plano de ações falhou durante a execução.
+
+    Atributos:
+        indice (int): A posição do passo que falhou (começando em 0).
+        passo (dict): O passo que falhou.
+        resultado (ResultadoPlano): Os tempos e valores dos passos executados até a falha.
+    '''
+    def __init__(self, mensagem: str, indice: int = None, passo: dict = None, resultado=None):
+
+        super().__init__(mensagem)
+        self.indice = indice
+        self.passo = passo
+        self.resultado = resultado
+
+class XPathInvalidoErro(AutomaWebErro, ValueError):
+    '''
+    O XPath está malformado (verificado antes de ir ao navegador, ver localizadores.py).
+
+    Atributos:
+        xpath (str): O XPath recusado.
+        posicao (int): A posição (começando em 0) em que o problema foi encontrado.
+        problema (str): A descrição do problema.
+    '''
+    def __init__(self, problema: str, xpath: str = None, posicao: int = None):
+
+        self.problema = problema
+        self.xpath = xpath
+        self.posicao = posicao
+        mensagem = f"XPath inválido ({problema})"
+        if xpath is not None:
+            mensagem += f": {xpath}"
+            if posicao is not None:
+                mensagem += f"\n{' ' * (len(mensagem.splitlines()[-1]) - len(xpath) + posicao)}^"
+        super().__init__(mensagem)
+
+class TextoDigitadoErro(AutomaWebErro, RuntimeError):
+    '''
+    O valor do campo depois de digitar não é o texto esperado (ver digitar(verificar=True)).
+
+    Atributos:
+        esperado (str): O valor esperado.
+        obtido (str): O valor encontrado no campo.
+        xpath (str): O XPath do campo.
+        posicao (int): A posição (começando em 0) do primeiro caractere diferente.
+    '''
+    def __init__(self, esperado: str, obtido: str, xpath: str = None):
+
+        self.esperado = esperado
+        self.obtido = obtido or ""
+        self.xpath = xpath
+        self.posicao = next(
+            (i for i, (a, b) in enumerate(zip(esperado, self.obtido)) if a != b), min(len(esperado), len(self.obtido))
+        )
+        mensagem = "O texto do campo não é o esperado"
+        if xpath is not None:
+            mensagem += f" ({xpath})"
+        mensagem += f": {len(self.obtido)} de {len(esperado)} caracteres, primeira diferença na posição {self.posicao}."
+        super().__init__(mensagem)
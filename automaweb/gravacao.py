@@ -0,0 +1,193 @@
+"""
+gravação contínua da aba via screencast do CDP, guardada num buffer circular em disco
+"""
+
+#bibliotecas para tarefas em segundo plano
+from collections import deque
+import threading
+import base64
+import queue
+
+#bibliotecas para manipulação de arquivos e pastas
+import subprocess
+import tempfile
+import shutil
+import json
+import os
+
+class GravadorTela:
+    '''
+    Grava os frames do screencast de uma aba num buffer circular em disco, limitado por tamanho.
+    Os frames mais antigos são apagados conforme o limite é atingido.
+
+    Args:
+        sessao (SessaoCDP): A sessão CDP da aba que será gravada.
+        pasta (str, opcional): A pasta do buffer. Padrão é uma pasta temporária nova.
+        tamanho_maximo_mb (float): Tamanho máximo ocupado pelo buffer em disco (em MB). Padrão é 100.
+        qualidade (int): Qualidade JPEG dos frames (0 a 100). Padrão é 50.
+        largura_maxima (int): Largura máxima dos frames (em pixels). Padrão é 1280.
+        altura_maxima (int): Altura máxima dos frames (em pixels). Padrão é 720.
+        a_cada_n_frames (int): Grava apenas 1 a cada N frames gerados pelo navegador. Padrão é 1.
+    '''
+    def __init__(self, sessao, pasta: str = None, tamanho_maximo_mb: float = 100, qualidade: int = 50,
+                 largura_maxima: int = 1280, altura_maxima: int = 720, a_cada_n_frames: int = 1):
+
+        self.sessao = sessao
+        self.pasta = pasta or tempfile.mkdtemp(prefix="automaweb_gravacao_")
+        os.makedirs(self.pasta, exist_ok=True)
+        self.tamanho_maximo = int(tamanho_maximo_mb * 1024 * 1024)
+        self._parametros = {
+            "format": "jpeg",
+            "quality": qualidade,
+            "maxWidth": largura_maxima,
+            "maxHeight": altura_maxima,
+            "everyNthFrame": a_cada_n_frames,
+        }
+        self._frames = deque() #(timestamp, caminho, tamanho) do mais antigo para o mais novo
+        self._tamanho_atual = 0
+        self._sequencia = 0
+        self._lock = threading.Lock()
+        self._fila = queue.Queue()
+        self._thread = None
+        self.gravando = False
+
+    def iniciar(self):
+
+        '''
+        Começa a receber e gravar os frames.
+        '''
+        if self.gravando:
+            return
+        self._thread = threading.Thread(target=self._gravar, name="automaweb-screencast", daemon=True)
+        self._thread.start()
+        self.sessao.ao_receber("Page.screencastFrame", self._ao_receber_frame)
+        self.sessao.executar("Page.startScreencast", self._parametros)
+        self.gravando = True
+
+    def parar(self):
+
+        '''
+        Para a gravação e aguarda a escrita dos frames pendentes (o buffer em disco é mantido).
+        '''
+        if not self.gravando:
+            return
+        self.gravando = False
+        try:
+            if self.sessao.aberta:
+                self.sessao.executar("Page.stopScreencast", timeout=5)
+        finally:
+            self.sessao.remover_ouvinte("Page.screencastFrame", self._ao_receber_frame)
+            self._fila.put(None)
+            self._thread.join()
+
+    def retomar(self, sessao):
+
+        '''
+        Volta a gravar numa nova sessão CDP (ex: depois de reciclar o navegador), mantendo o buffer já gravado.
+
+        Args:
+            sessao (SessaoCDP): A sessão da aba do navegador reaberto.
+        '''
+        self.parar()
+        self.sessao = sessao
+        self.iniciar()
+
+    def exportar(self, destino: str, ultimos_segundos: float = 30, como_video: bool = False):
+
+        '''
+        Copia os frames dos últimos N segundos para uma pasta (sequência de imagens)
+        ou, se como_video=True e o ffmpeg estiver instalado, gera um vídeo MP4.
+
+        Args:
+            destino (str): A pasta (sequência de imagens) ou o arquivo .mp4 (vídeo) de saída.
+            ultimos_segundos (float): Quantos segundos finais da gravação exportar. Padrão é 30.
+            como_video (bool): Se True, gera um vídeo com o ffmpeg. Padrão é False.
+
+        Returns:
+            str: O caminho da pasta ou do vídeo gerado.
+        '''
+        #aguarda os frames que ainda estão na fila de gravação
+        self._fila.join()
+        with self._lock:
+            frames = list(self._frames)
+        if frames:
+            limite = frames[-1][0] - ultimos_segundos
+            frames = [frame for frame in frames if frame[0] >= limite and os.path.exists(frame[1])]
+
+        if como_video:
+            ffmpeg = shutil.which("ffmpeg")
+            if ffmpeg is None:
+                raise FileNotFoundError("O ffmpeg não foi encontrado no PATH para gerar o vídeo.")
+            if not frames:
+                raise ValueError("Não há frames gravados para exportar.")
+            #o concat do ffmpeg respeita a duração real de cada frame (o screencast não tem FPS fixo)
+            lista = os.path.join(self.pasta, "lista_ffmpeg.txt")
+            with open(lista, "w") as arquivo:
+                for atual, seguinte in zip(frames, frames[1:] + [frames[-1]]):
+                    arquivo.write(f"file '{atual[1]}'\n")
+                    arquivo.write(f"duration {max(seguinte[0] - atual[0], 0.001):.3f}\n")
+            subprocess.run(
+                [ffmpeg, "-y", "-loglevel", "error", "-f", "concat", "-safe", "0", "-i", lista,
+                 "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", "-vsync", "vfr", destino],
+                check=True,
+            )
+            os.remove(lista)
+            return destino
+
+        os.makedirs(destino, exist_ok=True)
+        quadros = []
+        for indice, (momento, caminho, _) in enumerate(frames, start=1):
+            nome = f"frame_{indice:05d}.jpg"
+            shutil.copy2(caminho, os.path.join(destino, nome))
+            quadros.append({"arquivo": nome, "timestamp": momento})
+        with open(os.path.join(destino, "quadros.json"), "w") as arquivo:
+            json.dump(quadros, arquivo, indent=4)
+        return destino
+
+    def limpar(self):
+
+        '''
+        Para a gravação e apaga a pasta do buffer.
+        '''
+        self.parar()
+        shutil.rmtree(self.pasta, ignore_errors=True)
+        with self._lock:
+            self._frames.clear()
+            self._tamanho_atual = 0
+
+    def _ao_receber_frame(self, parametros):
+
+        '''função interna (thread de leitura CDP): confirma o frame na hora e delega a gravação'''
+        #o ack libera o navegador para gerar o próximo frame; não espera a resposta
+        self.sessao.enviar("Page.screencastFrameAck", {"sessionId": parametros["sessionId"]})
+        self._fila.put((parametros["metadata"].get("timestamp", 0), parametros["data"]))
+
+    def _gravar(self):
+
+        '''função interna que decodifica os frames, grava em disco e descarta os mais antigos'''
+        while True:
+            item = self._fila.get()
+            try:
+                if item is None:
+                    return
+                momento, dados = item
+                dados = base64.b64decode(dados)
+                self._sequencia += 1
+                caminho = os.path.join(self.pasta, f"{self._sequencia:08d}.jpg")
+                with open(caminho, "wb") as arquivo:
+                    arquivo.write(dados)
+
+                with self._lock:
+                    self._frames.append((momento, caminho, len(dados)))
+                    self._tamanho_atual += len(dados)
+                    while self._tamanho_atual > self.tamanho_maximo and len(self._frames) > 1:
+                        _, antigo, tamanho = self._frames.popleft()
+                        self._tamanho_atual -= tamanho
+                        try:
+                            os.remove(antigo)
+                        except OSError:
+                            pass
+            except Exception as e:
+                print(f"Erro ao gravar frame do screencast: {e}")
+            finally:
+                self._fila.task_done()
@@ -0,0 +1,350 @@
+"""
+pool de navegadores remotos (Selenium Grid, nós soltos ou selenium-server standalone)
+
+cada nó é um endereço WebDriver remoto (ex: http://maquina:4444) com uma capacidade
+(quantas sessões ele aguenta ao mesmo tempo). o pool abre cada sessão no nó saudável
+menos ocupado, verifica a saúde dos nós pelo /status do WebDriver e guarda as sessões
+devolvidas para reaproveitá-las: abrir um navegador remoto leva segundos, já limpar os
+cookies e voltar para about:blank leva milissegundos.
+
+exemplo:
+    pool = PoolGrid(["http://maquina1:4444", ("http://maquina2:4444", 8)], navegador="chrome", headless=True)
+    with pool.sessao() as nav:
+        nav.abrir_url("https://exemplo.com")
+        nav.clicar("//button[@id='entrar']")
+    pool.fechar()
+"""
+
+#bibliotecas de rede da biblioteca padrão (verificação de saúde)
+import urllib.request
+import json
+
+#bibliotecas para tarefas em paralelo
+from contextlib import contextmanager
+import threading
+import time
+
+class NoGrid:
+    '''
+    Um nó (endereço WebDriver remoto) do pool.
+
+    Atributos:
+        url (str): O endereço do nó (ex: http://maquina:4444 ou http://maquina:4444/wd/hub).
+        capacidade (int): Quantas sessões o nó aguenta ao mesmo tempo (None até a primeira verificação, se não informada).
+        em_uso (int): Quantas sessões do pool estão abertas no nó (emprestadas ou ociosas).
+        ociosos (list): As sessões devolvidas, prontas para serem reaproveitadas.
+        saudavel (bool): O resultado da última verificação de saúde.
+        latencia (float): O tempo de resposta do /status na última verificação (em segundos).
+        falhas (int): Quantas falhas seguidas (do /status ou ao abrir uma sessão) o nó teve.
+        ultima_verificacao (float): O momento (time.monotonic) da última verificação.
+    '''
+    def __init__(self, url: str, capacidade: int = None):
+
+        self.url = url.rstrip("/")
+        self.capacidade = capacidade
+        self.em_uso = 0
+        self.ociosos = []
+        self.saudavel = True
+        self.latencia = None
+        self.falhas = 0
+        self.ultima_verificacao = None
+
+    def __repr__(self):
+
+        return f"NoGrid({self.url!r}, {self.em_uso}/{self.capacidade}, {'saudável' if self.saudavel else 'fora do ar'})"
+
+    @property
+    def livre(self):
+
+        '''quantas sessões novas ainda cabem no nó'''
+        return max((self.capacidade or 1) - self.em_uso, 0)
+
+    def verificar(self, timeout: float = 5):
+
+        '''
+        Consulta o /status do nó e atualiza a saúde, a latência e (se não foi informada) a capacidade.
+
+        Args:
+            timeout (float): Tempo máximo da consulta (em segundos). Padrão é 5.
+
+        Returns:
+            bool: True se o nó está pronto para receber sessões.
+        '''
+        inicio = time.perf_counter()
+        try:
+            with urllib.request.urlopen(f"{self.url}/status", timeout=timeout) as resposta:
+                valor = json.loads(resposta.read().decode("utf-8")).get("value", {})
+            self.saudavel = bool(valor.get("ready"))
+            #o Grid 4 informa quantas sessões cada nó aceita; um servidor sem essa informação conta como 1
+            if self.capacidade is None:
+                self.capacidade = sum(no.get("maxSessions", 0) for no in valor.get("nodes", [])) or 1
+        except Exception as e:
+            print(f"O nó {self.url} não respondeu à verificação de saúde: {e}")
+            self.saudavel = False
+        self.latencia = time.perf_counter() - inicio
+        self.ultima_verificacao = time.monotonic()
+        self.falhas = 0 if self.saudavel else self.falhas + 1
+        return self.saudavel
+
+class PoolGrid:
+    '''
+    Pool de sessões (Navegador) espalhadas por vários nós WebDriver remotos, respeitando a capacidade de cada nó.
+
+    Args:
+        nos (list): Os nós: endereços ("http://maquina:4444"), pares (endereço, capacidade) ou NoGrid.
+            Sem capacidade, ela é lida do /status (Grid 4) ou fica 1.
+        navegador (str): O navegador das sessões (edge, chrome ou firefox). Padrão é "chrome".
+        tempo_stun (float): O tempo de stun das sessões (ver Navegador). Padrão é 0.
+        intervalo_verificacao (float): De quanto em quanto tempo a saúde dos nós é verificada de novo (em segundos). Padrão é 30.
+        timeout_status (float): Tempo máximo de cada verificação de saúde (em segundos). Padrão é 5.
+        max_falhas (int): Quantas falhas seguidas ao abrir sessões tiram o nó do pool até a próxima verificação. Padrão é 2.
+        reaproveitar (bool): Se True, as sessões devolvidas são limpas e reaproveitadas. A limpeza apaga os cookies do
+            domínio aberto no momento da devolução; para isolamento total entre tarefas use False. Padrão é True.
+        **opcoes: Os argumentos do abrir_driver_remoto de cada sessão (headless, tempo_wait, perfil, capacidades...).
+    '''
+    def __init__(self, nos: list, navegador: str = "chrome", tempo_stun: float = 0, intervalo_verificacao: float = 30,
+                 timeout_status: float = 5, max_falhas: int = 2, reaproveitar: bool = True, **opcoes):
+
+        self.nos = [
+            no if isinstance(no, NoGrid) else NoGrid(*no) if isinstance(no, (list, tuple)) else NoGrid(no) for no in nos
+        ]
+        if not self.nos:
+            raise ValueError("Informe pelo menos um nó.")
+        self.navegador = navegador
+        self.tempo_stun = tempo_stun
+        self.intervalo_verificacao = intervalo_verificacao
+        self.timeout_status = timeout_status
+        self.max_falhas = max_falhas
+        self.reaproveitar = reaproveitar
+        self.opcoes = opcoes
+        self._emprestados = {} #navegador emprestado -> nó em que a sessão está aberta
+        self._condicao = threading.Condition()
+        self._verificando = False
+        self._fechado = False
+        self.verificar_nos()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, *excecao):
+
+        self.fechar()
+
+    def verificar_nos(self):
+
+        '''
+        Verifica a saúde de todos os nós ao mesmo tempo (GET /status).
+
+        Returns:
+            list: O estado de cada nó (ver estado).
+        '''
+        threads = [threading.Thread(target=no.verificar, args=(self.timeout_status,), daemon=True) for no in self.nos]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        with self._condicao:
+            self._condicao.notify_all() #um nó que voltou libera quem estava esperando
+        return self.estado()
+
+    def _verificar_se_preciso(self):
+
+        '''função interna que refaz a verificação de saúde quando a última ficou velha (uma thread por vez)'''
+        agora = time.monotonic()
+        with self._condicao:
+            if self._verificando or all(
+                no.ultima_verificacao is not None and agora - no.ultima_verificacao < self.intervalo_verificacao for no in self.nos
+            ):
+                return
+            self._verificando = True
+        try:
+            self.verificar_nos()
+        finally:
+            with self._condicao:
+                self._verificando = False
+
+    def _reservar(self):
+
+        '''função interna que escolhe (com a trava) uma sessão ociosa ou o nó saudável menos ocupado com vaga'''
+        saudaveis = [no for no in self.nos if no.saudavel and no.falhas < self.max_falhas]
+        for no in saudaveis:
+            if no.ociosos:
+                return no, no.ociosos.pop()
+        com_vaga = [no for no in saudaveis if no.livre > 0]
+        if not com_vaga:
+            return None, None
+        no = min(com_vaga, key=lambda no: no.em_uso / (no.capacidade or 1))
+        no.em_uso += 1
+        return no, None
+
+    def adquirir(self, timeout: float = None):
+
+        '''
+        Empresta uma sessão aberta: reaproveita uma sessão ociosa ou abre uma nova no nó saudável menos ocupado.
+        Se todos os nós estiverem cheios, aguarda até uma sessão ser devolvida.
+
+        Args:
+            timeout (float, opcional): Tempo máximo de espera por uma vaga (em segundos). Padrão é esperar sem limite.
+
+        Returns:
+            Navegador: A sessão, já aberta no nó (devolva com devolver()).
+        '''
+        from .main import Navegador #importado aqui: o main importa este módulo
+        limite = None if timeout is None else time.monotonic() + timeout
+        while True:
+            self._verificar_se_preciso()
+            with self._condicao:
+                if self._fechado:
+                    raise RuntimeError("O pool já foi fechado.")
+                no, navegador = self._reservar()
+                if no is None:
+                    restante = None if limite is None else limite - time.monotonic()
+                    if restante is not None and restante <= 0:
+                        raise TimeoutError(f"Nenhum nó com vaga em {timeout} segundos.")
+                    #acorda de tempos em tempos para refazer a verificação dos nós fora do ar
+                    self._condicao.wait(self.intervalo_verificacao if restante is None else min(restante, self.intervalo_verificacao))
+                    continue
+
+            if navegador is not None:
+                if self._sessao_viva(navegador):
+                    break
+                #a sessão ociosa expirou no grid: descarta e tenta de novo
+                self._descartar(no, navegador)
+                continue
+
+            navegador = Navegador(self.tempo_stun, self.navegador)
+            try:
+                navegador.abrir_driver_remoto(no.url, **self.opcoes)
+                with self._condicao:
+                    no.falhas = 0
+                break
+            except Exception as e:
+                print(f"Não foi possível abrir uma sessão no nó {no.url}: {e}")
+                with self._condicao:
+                    no.em_uso -= 1
+                    no.falhas += 1
+                    self._condicao.notify_all()
+                if limite is not None and time.monotonic() >= limite:
+                    raise
+
+        with self._condicao:
+            self._emprestados[navegador] = no
+        return navegador
+
+    def devolver(self, navegador, descartar: bool = False):
+
+        '''
+        Devolve uma sessão ao pool. Ela é limpa (cookies, armazenamento e abas extras) e fica ociosa
+        para ser reaproveitada; se a limpeza falhar (ou com descartar=True), a sessão é fechada.
+
+        Args:
+            navegador (Navegador): A sessão emprestada por adquirir().
+            descartar (bool): Se True, fecha a sessão em vez de guardá-la. Padrão é False.
+        '''
+        with self._condicao:
+            no = self._emprestados.pop(navegador, None)
+        if no is None:
+            raise ValueError("Esta sessão não foi emprestada por este pool.")
+        descartar = descartar or not self.reaproveitar
+        if not descartar and not self._fechado:
+            try:
+                self._limpar_sessao(navegador)
+            except Exception as e:
+                print(f"Não foi possível limpar a sessão devolvida ({e}). Ela será fechada.")
+                descartar = True
+        if descartar or self._fechado:
+            self._descartar(no, navegador)
+            return
+        with self._condicao:
+            no.ociosos.append(navegador)
+            self._condicao.notify()
+
+    @contextmanager
+    def sessao(self, timeout: float = None):
+
+        '''
+        Empresta uma sessão dentro de um bloco with e a devolve no final. Se o bloco levantar
+        uma exceção, a sessão é fechada em vez de reaproveitada (o navegador pode ter ficado num estado ruim).
+
+        Args:
+            timeout (float, opcional): Tempo máximo de espera por uma vaga (em segundos). Padrão é esperar sem limite.
+        '''
+        navegador = self.adquirir(timeout)
+        try:
+            yield navegador
+        except BaseException:
+            self.devolver(navegador, descartar=True)
+            raise
+        self.devolver(navegador)
+
+    def estado(self):
+
+        '''
+        Devolve o estado de cada nó.
+
+        Returns:
+            list: Um dicionário por nó (url, capacidade, em_uso, ociosos, saudavel, latencia_ms, falhas).
+        '''
+        with self._condicao:
+            return [{
+                "url": no.url,
+                "capacidade": no.capacidade,
+                "em_uso": no.em_uso,
+                "ociosos": len(no.ociosos),
+                "saudavel": no.saudavel,
+                "latencia_ms": None if no.latencia is None else round(no.latencia * 1000, 1),
+                "falhas": no.falhas,
+            } for no in self.nos]
+
+    def fechar(self):
+
+        '''
+        Fecha as sessões ociosas e impede novos empréstimos. As sessões emprestadas são fechadas ao serem devolvidas.
+        '''
+        with self._condicao:
+            self._fechado = True
+            ociosos = [(no, navegador) for no in self.nos for navegador in no.ociosos]
+            for no in self.nos:
+                no.ociosos = []
+            self._condicao.notify_all()
+        for no, navegador in ociosos:
+            self._descartar(no, navegador)
+
+    def _descartar(self, no: NoGrid, navegador):
+
+        '''função interna que fecha a sessão e libera a vaga dela no nó'''
+        try:
+            navegador.fechar_driver()
+        except Exception as e:
+            print(f"Erro ao fechar a sessão remota em {no.url}: {e}")
+        with self._condicao:
+            no.em_uso -= 1
+            self._condicao.notify()
+
+    @staticmethod
+    def _sessao_viva(navegador):
+
+        '''função interna que confere se uma sessão ociosa ainda existe no grid (ele encerra as sessões paradas por muito tempo)'''
+        try:
+            navegador.driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _limpar_sessao(navegador):
+
+        '''função interna que deixa a sessão como nova: uma aba só, sem cookies nem armazenamento, em about:blank'''
+        driver = navegador.driver
+        abas = driver.window_handles
+        for handle in abas[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(abas[0])
+        driver.switch_to.default_content()
+        driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        navegador._registrar_aba_inicial()
+        navegador._esquecer_frames()
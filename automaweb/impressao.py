@@ -0,0 +1,156 @@
+"""
+impressão de páginas em PDF via CDP (Page.printToPDF), gravada direto no disco
+
+o PDF é pedido com transferMode "ReturnAsStream": o navegador devolve um stream
+que é lido em blocos (IO.read) e gravado no arquivo bloco a bloco, sem nunca
+manter o PDF inteiro (em base64) na memória. cada aba usa a sua própria conexão
+CDP (SessaoCDP), então várias abas carregam e imprimem ao mesmo tempo.
+
+sem CDP (Firefox), salvar_pdf_webdriver usa o comando de impressão do próprio
+WebDriver (Print Page), que devolve o PDF inteiro de uma vez.
+"""
+
+#bibliotecas para a gravação em disco e as esperas
+import threading
+import base64
+import os
+
+from selenium.webdriver.common.print_page_options import PrintOptions
+
+from .cdp import ErroCDP
+
+#tamanho do papel (largura, altura) em polegadas, como o Page.printToPDF espera
+FORMATOS_PAPEL = {
+    "A3": (11.69, 16.54),
+    "A4": (8.27, 11.69),
+    "A5": (5.83, 8.27),
+    "Carta": (8.5, 11),
+    "Oficio": (8.5, 14),
+}
+TAMANHO_BLOCO = 1024 * 1024 #bytes lidos do stream por IO.read
+
+def opcoes_pdf(formato: str = "A4", paisagem: bool = False, imprimir_fundo: bool = True, margem_cm: float = 1.0, escala: float = 1.0):
+
+    '''
+    Monta os parâmetros do Page.printToPDF.
+
+    Args:
+        formato (str): O papel (A3, A4, A5, Carta ou Oficio). Padrão é "A4".
+        paisagem (bool): Se True, imprime na horizontal. Padrão é False.
+        imprimir_fundo (bool): Se True, inclui cores e imagens de fundo. Padrão é True.
+        margem_cm (float): As margens (em centímetros). Padrão é 1.
+        escala (float): A escala da página (de 0.1 a 2). Padrão é 1.
+
+    Returns:
+        dict: Os parâmetros do comando.
+    '''
+    if formato not in FORMATOS_PAPEL:
+        raise ValueError(f"Formato '{formato}' não suportado. Escolha entre: {', '.join(FORMATOS_PAPEL)}.")
+    largura, altura = FORMATOS_PAPEL[formato]
+    margem = margem_cm / 2.54
+    return {
+        "landscape": paisagem,
+        "printBackground": imprimir_fundo,
+        "paperWidth": largura,
+        "paperHeight": altura,
+        "marginTop": margem,
+        "marginBottom": margem,
+        "marginLeft": margem,
+        "marginRight": margem,
+        "scale": escala,
+    }
+
+def salvar_pdf_webdriver(driver, caminho: str, parametros: dict = None):
+
+    '''
+    Imprime a página da aba em foco em PDF pelo comando Print Page do WebDriver (para navegadores sem CDP, como o Firefox).
+
+    Args:
+        driver: O driver do selenium.
+        caminho (str): O arquivo .pdf a criar.
+        parametros (dict, opcional): Os parâmetros no formato do Page.printToPDF (ver opcoes_pdf). Padrão é A4 com fundo.
+
+    Returns:
+        str: O caminho do arquivo.
+    '''
+    parametros = parametros or opcoes_pdf()
+    opcoes = PrintOptions()
+    opcoes.orientation = "landscape" if parametros["landscape"] else "portrait"
+    opcoes.background = parametros["printBackground"]
+    opcoes.scale = parametros["scale"]
+    #o WebDriver mede o papel e as margens em centímetros, o CDP em polegadas
+    opcoes.page_width = parametros["paperWidth"] * 2.54
+    opcoes.page_height = parametros["paperHeight"] * 2.54
+    opcoes.margin_top = parametros["marginTop"] * 2.54
+    opcoes.margin_bottom = parametros["marginBottom"] * 2.54
+    opcoes.margin_left = parametros["marginLeft"] * 2.54
+    opcoes.margin_right = parametros["marginRight"] * 2.54
+    dados = base64.b64decode(driver.print_page(opcoes))
+    temporario = f"{caminho}.tmp"
+    try:
+        with open(temporario, "wb") as arquivo:
+            arquivo.write(dados)
+        os.replace(temporario, caminho)
+        return caminho
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def carregar_pagina(sessao, url: str, timeout: float = 60):
+
+    '''
+    Abre a URL na aba da sessão e aguarda o evento de carregamento (load).
+    A sessão precisa ter o domínio Page ativo (Page.enable).
+
+    Args:
+        sessao (SessaoCDP): A sessão CDP da aba.
+        url (str): A URL.
+        timeout (float): Tempo máximo de carregamento (em segundos). Padrão é 60.
+    '''
+    carregada = threading.Event()
+    ouvinte = lambda _: carregada.set()
+    sessao.ao_receber("Page.loadEventFired", ouvinte)
+    try:
+        resposta = sessao.executar("Page.navigate", {"url": url}, timeout)
+        if resposta.get("errorText"):
+            raise ErroCDP(f"Não foi possível abrir {url}: {resposta['errorText']}")
+        if not carregada.wait(timeout):
+            raise TimeoutError(f"A página não carregou em {timeout} segundos: {url}")
+    finally:
+        sessao.remover_ouvinte("Page.loadEventFired", ouvinte)
+
+def salvar_pdf(sessao, caminho: str, parametros: dict = None, timeout: float = 60):
+
+    '''
+    Imprime a página atual da aba em PDF, gravando o stream do navegador direto no arquivo.
+
+    Args:
+        sessao (SessaoCDP): A sessão CDP da aba.
+        caminho (str): O arquivo .pdf a criar.
+        parametros (dict, opcional): Os parâmetros do Page.printToPDF (ver opcoes_pdf). Padrão é A4 com fundo.
+        timeout (float): Tempo máximo de cada comando (em segundos). Padrão é 60.
+
+    Returns:
+        str: O caminho do arquivo.
+    '''
+    parametros = {**(parametros or opcoes_pdf()), "transferMode": "ReturnAsStream"}
+    stream = sessao.executar("Page.printToPDF", parametros, timeout)["stream"]
+    temporario = f"{caminho}.tmp"
+    try:
+        #grava num arquivo temporário e renomeia, para nunca deixar um PDF pela metade
+        with open(temporario, "wb") as arquivo:
+            while True:
+                bloco = sessao.executar("IO.read", {"handle": stream, "size": TAMANHO_BLOCO}, timeout)
+                dados = bloco.get("data", "")
+                arquivo.write(base64.b64decode(dados) if bloco.get("base64Encoded") else dados.encode("utf-8"))
+                if bloco.get("eof"):
+                    break
+        os.replace(temporario, caminho)
+        return caminho
+    finally:
+        try:
+            sessao.executar("IO.close", {"handle": stream}, 5)
+        except Exception:
+            pass
+        if os.path.exists(temporario):
+            os.remove(temporario)
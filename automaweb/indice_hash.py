@@ -0,0 +1,329 @@
+"""
+índice de conteúdo (hash) dos arquivos, guardado em SQLite, para encontrar arquivos duplicados
+
+cada arquivo é identificado pelo caminho + tamanho + data de modificação: enquanto
+esses três não mudam o hash guardado é reaproveitado e o arquivo nunca é lido de
+novo. os hashes são calculados em paralelo (o hashlib libera o GIL) lendo o arquivo
+mapeado em memória (mmap) ou em blocos, sem carregá-lo inteiro na memória.
+
+para saber se um conteúdo já está guardado, primeiro o tamanho é comparado: o
+arquivo novo só é lido se houver algum arquivo indexado com o mesmo tamanho.
+
+exemplo:
+    indice = IndiceHash()
+    indice.indexar("/dados/relatorios")
+    mover_arquivo(baixado, "/dados/relatorios", indice=indice, duplicado="excluir")
+"""
+
+#bibliotecas para o banco de dados e o cálculo dos hashes
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import hashlib
+import sqlite3
+import mmap
+import time
+import os
+
+from .binarios import PASTA_CACHE_PADRAO
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS arquivos (
+    caminho TEXT PRIMARY KEY,
+    tamanho INTEGER NOT NULL,
+    mtime INTEGER NOT NULL,
+    algoritmo TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    indexado_em REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS arquivos_hash ON arquivos (hash);
+CREATE INDEX IF NOT EXISTS arquivos_tamanho ON arquivos (tamanho);
+"""
+
+TAMANHO_BLOCO = 1024 * 1024 #leitura em blocos de 1 MB (arquivos pequenos ou sem suporte a mmap)
+LIMITE_MMAP = 4 * 1024 * 1024 #a partir deste tamanho o arquivo é mapeado em memória
+
+def calcular_hash(caminho: str, algoritmo: str = "sha256"):
+
+    '''
+    Calcula o hash do conteúdo de um arquivo sem carregá-lo inteiro na memória.
+
+    Args:
+        caminho (str): O caminho do arquivo.
+        algoritmo (str): Qualquer algoritmo do hashlib (sha256, sha1, md5, blake2b...). Padrão é "sha256".
+
+    Returns:
+        str: O hash em hexadecimal.
+    '''
+    resumo = hashlib.new(algoritmo)
+    with open(caminho, "rb") as arquivo:
+        tamanho = os.fstat(arquivo.fileno()).st_size
+        if tamanho >= LIMITE_MMAP:
+            try:
+                with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+                    visao = memoryview(mapa)
+                    try:
+                        for inicio in range(0, tamanho, 64 * TAMANHO_BLOCO):
+                            resumo.update(visao[inicio:inicio + 64 * TAMANHO_BLOCO])
+                    finally:
+                        visao.release()
+                return resumo.hexdigest()
+            except (OSError, ValueError):
+                arquivo.seek(0)
+                resumo = hashlib.new(algoritmo)
+        bloco = bytearray(TAMANHO_BLOCO)
+        visao = memoryview(bloco)
+        while True:
+            lidos = arquivo.readinto(bloco)
+            if not lidos:
+                break
+            resumo.update(visao[:lidos])
+    return resumo.hexdigest()
+
+class IndiceHash:
+    '''
+    Índice (SQLite) com o hash do conteúdo de cada arquivo, para encontrar e evitar arquivos duplicados.
+
+    Args:
+        caminho (str, opcional): O arquivo do banco. Padrão é ~/.cache/automaweb/hashes.db (ou AUTOMAWEB_CACHE/hashes.db).
+        algoritmo (str): O algoritmo do hashlib. Padrão é "sha256".
+        trabalhadores (int): Quantos arquivos calcular ao mesmo tempo em indexar(). Padrão é 4.
+    '''
+    def __init__(self, caminho: str = None, algoritmo: str = "sha256", trabalhadores: int = 4):
+
+        pasta = os.environ.get("AUTOMAWEB_CACHE") or PASTA_CACHE_PADRAO
+        if caminho is None:
+            os.makedirs(pasta, exist_ok=True)
+        self.caminho = caminho or os.path.join(pasta, "hashes.db")
+        self.algoritmo = algoritmo
+        self.trabalhadores = trabalhadores
+        self._local = threading.local() #uma conexão por thread (o sqlite3 não compartilha conexões entre threads)
+        self._conexao().executescript(ESQUEMA)
+
+    def _conexao(self):
+
+        '''função interna que devolve a conexão da thread atual'''
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is None:
+            conexao = sqlite3.connect(self.caminho, timeout=30, isolation_level=None)
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexao = conexao
+        return conexao
+
+    @staticmethod
+    def _identificar(caminho: str):
+
+        '''função interna que devolve (caminho absoluto, tamanho, mtime) de um arquivo, ou None se ele não existir'''
+        caminho = os.path.abspath(caminho)
+        try:
+            informacoes = os.stat(caminho)
+        except OSError:
+            return None
+        return caminho, informacoes.st_size, informacoes.st_mtime_ns
+
+    def _em_cache(self, caminho: str, tamanho: int, mtime: int):
+
+        '''função interna que devolve o hash guardado se o arquivo não mudou desde a indexação'''
+        linha = self._conexao().execute(
+            "SELECT hash FROM arquivos WHERE caminho = ? AND tamanho = ? AND mtime = ? AND algoritmo = ?",
+            (caminho, tamanho, mtime, self.algoritmo),
+        ).fetchone()
+        return linha[0] if linha else None
+
+    def registrar(self, caminho: str, valor_hash: str = None):
+
+        '''
+        Guarda o hash de um arquivo (calculando-o se não for informado).
+
+        Args:
+            caminho (str): O caminho do arquivo.
+            valor_hash (str, opcional): O hash já conhecido (ex: o mesmo conteúdo acabou de ser copiado).
+
+        Returns:
+            str: O hash do arquivo.
+        '''
+        identificacao = self._identificar(caminho)
+        if identificacao is None:
+            raise FileNotFoundError(f"O arquivo '{caminho}' não existe.")
+        caminho, tamanho, mtime = identificacao
+        valor_hash = valor_hash or calcular_hash(caminho, self.algoritmo)
+        self._conexao().execute(
+            "INSERT OR REPLACE INTO arquivos (caminho, tamanho, mtime, algoritmo, hash, indexado_em) VALUES (?, ?, ?, ?, ?, ?)",
+            (caminho, tamanho, mtime, self.algoritmo, valor_hash, time.time()),
+        )
+        return valor_hash
+
+    def hash(self, caminho: str):
+
+        '''
+        Devolve o hash do arquivo, lendo-o apenas se ele mudou (ou nunca foi indexado).
+
+        Args:
+            caminho (str): O caminho do arquivo.
+
+        Returns:
+            str: O hash do arquivo.
+        '''
+        identificacao = self._identificar(caminho)
+        if identificacao is None:
+            raise FileNotFoundError(f"O arquivo '{caminho}' não existe.")
+        return self._em_cache(*identificacao) or self.registrar(identificacao[0])
+
+    def indexar(self, caminhos, recursivo: bool = True):
+
+        '''
+        Indexa arquivos em paralelo. Os que não mudaram desde a última indexação não são lidos de novo.
+
+        Args:
+            caminhos (str | iterable): Uma pasta, um arquivo ou uma lista de arquivos.
+            recursivo (bool): Se True, inclui as subpastas quando for uma pasta. Padrão é True.
+
+        Returns:
+            dict: {caminho: hash} de todos os arquivos indexados.
+        '''
+        if isinstance(caminhos, str):
+            if os.path.isdir(caminhos):
+                if recursivo:
+                    caminhos = [os.path.join(raiz, nome) for raiz, _, nomes in os.walk(caminhos) for nome in nomes]
+                else:
+                    caminhos = [entrada.path for entrada in os.scandir(caminhos) if entrada.is_file()]
+            else:
+                caminhos = [caminhos]
+
+        resultados = {}
+        novos = []
+        for caminho in caminhos:
+            identificacao = self._identificar(caminho)
+            if identificacao is None or not os.path.isfile(identificacao[0]):
+                continue
+            guardado = self._em_cache(*identificacao)
+            if guardado:
+                resultados[identificacao[0]] = guardado
+            else:
+                novos.append(identificacao[0])
+
+        def calcular(caminho):
+            try:
+                return caminho, calcular_hash(caminho, self.algoritmo)
+            except OSError as e:
+                print(f"Erro ao calcular o hash de '{caminho}': {e}")
+                return caminho, None
+
+        if novos:
+            with ThreadPoolExecutor(max_workers=max(self.trabalhadores, 1), thread_name_prefix="automaweb-hash") as executor:
+                calculados = [(caminho, valor) for caminho, valor in executor.map(calcular, novos) if valor]
+            #as gravações ficam numa única transação (bem mais rápido do que uma por arquivo)
+            conexao = self._conexao()
+            conexao.execute("BEGIN IMMEDIATE")
+            try:
+                for caminho, valor in calculados:
+                    identificacao = self._identificar(caminho)
+                    if identificacao is None:
+                        continue
+                    conexao.execute(
+                        "INSERT OR REPLACE INTO arquivos (caminho, tamanho, mtime, algoritmo, hash, indexado_em) VALUES (?, ?, ?, ?, ?, ?)",
+                        (*identificacao, self.algoritmo, valor, time.time()),
+                    )
+                    resultados[caminho] = valor
+                conexao.execute("COMMIT")
+            except BaseException:
+                conexao.execute("ROLLBACK")
+                raise
+        return resultados
+
+    def procurar(self, valor_hash: str):
+
+        '''
+        Lista os arquivos indexados com este conteúdo (apenas os que ainda existem e não mudaram).
+
+        Args:
+            valor_hash (str): O hash procurado.
+
+        Returns:
+            list: Os caminhos dos arquivos.
+        '''
+        encontrados = []
+        for caminho, tamanho, mtime in self._conexao().execute(
+            "SELECT caminho, tamanho, mtime FROM arquivos WHERE hash = ? AND algoritmo = ?", (valor_hash, self.algoritmo)
+        ).fetchall():
+            if self._identificar(caminho) == (caminho, tamanho, mtime):
+                encontrados.append(caminho)
+            else:
+                self.remover(caminho) #o arquivo foi apagado ou alterado: a entrada não vale mais
+        return encontrados
+
+    def duplicado(self, caminho: str):
+
+        '''
+        Informa se o conteúdo do arquivo já está guardado em outro arquivo indexado.
+        O arquivo só é lido se existir algum arquivo indexado com o mesmo tamanho.
+
+        Args:
+            caminho (str): O caminho do arquivo.
+
+        Returns:
+            str: O caminho do arquivo indexado com o mesmo conteúdo, ou None se não houver.
+        '''
+        identificacao = self._identificar(caminho)
+        if identificacao is None:
+            raise FileNotFoundError(f"O arquivo '{caminho}' não existe.")
+        caminho, tamanho, _ = identificacao
+        if self._conexao().execute(
+            "SELECT 1 FROM arquivos WHERE tamanho = ? AND algoritmo = ? AND caminho != ? LIMIT 1", (tamanho, self.algoritmo, caminho)
+        ).fetchone() is None:
+            return None
+        valor_hash = self.hash(caminho)
+        for encontrado in self.procurar(valor_hash):
+            if encontrado != caminho:
+                return encontrado
+        return None
+
+    def duplicatas(self):
+
+        '''
+        Agrupa os arquivos indexados com o mesmo conteúdo.
+
+        Returns:
+            list: Listas de caminhos (cada lista com dois ou mais arquivos iguais).
+        '''
+        grupos = []
+        for (valor_hash,) in self._conexao().execute(
+            "SELECT hash FROM arquivos WHERE algoritmo = ? GROUP BY hash HAVING COUNT(*) > 1", (self.algoritmo,)
+        ).fetchall():
+            caminhos = self.procurar(valor_hash)
+            if len(caminhos) > 1:
+                grupos.append(caminhos)
+        return grupos
+
+    def remover(self, caminho: str):
+
+        '''
+        Remove um arquivo do índice.
+
+        Args:
+            caminho (str): O caminho do arquivo.
+        '''
+        self._conexao().execute("DELETE FROM arquivos WHERE caminho = ?", (os.path.abspath(caminho),))
+
+    def limpar(self):
+
+        '''
+        Remove do índice os arquivos que não existem mais.
+
+        Returns:
+            int: Quantas entradas foram removidas.
+        '''
+        ausentes = [
+            (caminho,) for (caminho,) in self._conexao().execute("SELECT caminho FROM arquivos").fetchall()
+            if not os.path.isfile(caminho)
+        ]
+        self._conexao().executemany("DELETE FROM arquivos WHERE caminho = ?", ausentes)
+        return len(ausentes)
+
+    def fechar(self):
+
+        '''fecha a conexão da thread atual'''
+        conexao = getattr(self._local, "conexao", None)
+        if conexao is not None:
+            conexao.close()
+            self._local.conexao = None
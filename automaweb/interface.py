@@ -0,0 +1,147 @@
+"""
+avisos ao usuário (janelas do tkinter) e modo autônomo
+
+no modo autônomo nenhuma janela é aberta e o tkinter nunca é importado:
+os avisos viram eventos de log (logger "automaweb") e as situações de erro
+levantam as exceções de erros.py. indicado para workers em servidores e
+containers sem interface gráfica.
+
+o modo pode ser ativado por definir_modo_autonomo() ou pela variável de
+ambiente AUTOMAWEB_AUTONOMO=1.
+"""
+
+#bibliotecas para os eventos de log
+import logging
+import json
+import os
+
+from .erros import InteracaoIndisponivelErro
+
+registro = logging.getLogger("automaweb")
+registro.addHandler(logging.NullHandler()) #sem configuração, a biblioteca não imprime os eventos
+
+_autonomo = os.environ.get("AUTOMAWEB_AUTONOMO", "").strip().lower() in ("1", "true", "sim")
+
+#nível do log -> função da messagebox usada no modo interativo
+_JANELAS = {
+    logging.INFO: "showinfo",
+    logging.WARNING: "showwarning",
+    logging.ERROR: "showerror",
+}
+
+def definir_modo_autonomo(ativo: bool = True):
+
+    '''
+    Ativa (ou desativa) o modo autônomo: nenhuma janela é aberta e o tkinter não é importado.
+    Os avisos viram eventos de log e os erros levantam exceções (ver erros.py).
+
+    Args:
+        ativo (bool): True para ativar, False para voltar ao modo interativo. Padrão é True.
+    '''
+    global _autonomo
+    _autonomo = bool(ativo)
+
+def modo_autonomo():
+
+    '''
+    Informa se o modo autônomo está ativo.
+
+    Returns:
+        bool: True se estiver ativo.
+    '''
+    return _autonomo
+
+class FormatadorJSON(logging.Formatter):
+    '''
+    Formata cada evento de log como uma linha JSON (momento, nível, evento, mensagem e dados).
+    '''
+    def format(self, record):
+
+        evento = {
+            "momento": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "nivel": record.levelname,
+            "evento": getattr(record, "evento", None),
+            "mensagem": record.getMessage(),
+            **getattr(record, "dados", {}),
+        }
+        if record.exc_info:
+            evento["excecao"] = self.formatException(record.exc_info)
+        return json.dumps(evento, ensure_ascii=False, default=str)
+
+def configurar_log(nivel: int = logging.INFO, formato_json: bool = True, arquivo: str = None):
+
+    '''
+    Envia os eventos do logger "automaweb" para o terminal (stderr) ou para um arquivo.
+
+    Args:
+        nivel (int): O nível mínimo dos eventos. Padrão é logging.INFO.
+        formato_json (bool): Se True, cada evento é uma linha JSON. Padrão é True.
+        arquivo (str, opcional): Se fornecido, grava os eventos neste arquivo em vez do terminal.
+
+    Returns:
+        logging.Handler: O handler adicionado (pode ser removido com registro.removeHandler).
+    '''
+    manipulador = logging.FileHandler(arquivo, encoding="utf-8") if arquivo else logging.StreamHandler()
+    manipulador.setFormatter(FormatadorJSON() if formato_json else logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+    registro.addHandler(manipulador)
+    registro.setLevel(nivel)
+    return manipulador
+
+def notificar(nivel: int, titulo: str, mensagem: str, evento: str, **dados):
+
+    '''
+    Registra um evento de log e, fora do modo autônomo, mostra também a janela de aviso.
+
+    Args:
+        nivel (int): O nível do evento (logging.INFO, logging.WARNING ou logging.ERROR).
+        titulo (str): O título da janela.
+        mensagem (str): O texto do aviso.
+        evento (str): O nome do evento no log (ex: "pasta_removida").
+        **dados: Campos extras do evento (ex: caminho).
+    '''
+    registro.log(nivel, mensagem, extra={"evento": evento, "dados": dados})
+    if _autonomo:
+        return
+    try:
+        from tkinter import messagebox
+        getattr(messagebox, _JANELAS.get(nivel, "showinfo"))(titulo, mensagem)
+    except Exception as e:
+        #sem interface gráfica (ex: servidor sem display): o evento já foi registrado no log
+        registro.debug(f"Não foi possível exibir a janela de aviso: {e}")
+
+def confirmar(titulo: str, mensagem: str, evento: str):
+
+    '''
+    Mostra uma janela (sempre no topo) e só continua quando o usuário clicar em "OK".
+    No modo autônomo apenas registra o evento e continua.
+
+    Args:
+        titulo (str): O título da janela.
+        mensagem (str): O texto da janela.
+        evento (str): O nome do evento no log.
+    '''
+    registro.info(mensagem, extra={"evento": evento, "dados": {}})
+    if _autonomo:
+        return
+    import tkinter as tk
+    from tkinter import messagebox
+    root = tk.Tk()
+    root.attributes('-topmost', True) #deixa a janela sempre no topo
+    root.withdraw()
+    messagebox.showwarning(titulo, mensagem, parent=root)
+    root.destroy()
+
+def dialogo_arquivos(nome_funcao: str, **opcoes):
+
+    '''
+    Abre uma janela de seleção do tkinter (filedialog).
+    No modo autônomo levanta InteracaoIndisponivelErro.
+
+    Args:
+        nome_funcao (str): A função do filedialog (askopenfilename, askopenfilenames ou askdirectory).
+        **opcoes: As opções da janela (title, filetypes...).
+    '''
+    if _autonomo:
+        raise InteracaoIndisponivelErro(f"'{nome_funcao}' precisa de um usuário e o modo autônomo está ativo.")
+    from tkinter import filedialog
+    return getattr(filedialog, nome_funcao)(**opcoes)
@@ -0,0 +1,488 @@
+"""
+camada de localizadores: lê os XPaths passados para o Navegador e escolhe a busca mais rápida
+
+o XPath é analisado (tokens + gramática do XPath 1.0) sem ir ao navegador. o subconjunto
+simples, que é a maioria dos XPaths de automação, é traduzido para um seletor CSS ou
+uma busca por id, resolvidos pelo navegador bem mais rápido do que o document.evaluate:
+
+    //*[@id='email']                          ->  id      email
+    //input[@id='email']                      ->  css     input[id='email']
+    //form[@name='login']//button[1]          ->  css     form[name='login'] button:nth-of-type(1)
+    //div[contains(@class, 'card') and @role] ->  css     div[class*='card'][role]
+
+o resto (text(), eixos como following-sibling::, posições depois de filtros, uniões, valores
+de atributos que o CSS compara sem diferenciar maiúsculas, como @type...)
+continua sendo buscado como XPath. as análises ficam em cache (o mesmo XPath costuma
+ser usado milhares de vezes num lote) e XPaths malformados são recusados antes de
+qualquer ida ao navegador (ver validar_xpath).
+"""
+
+#bibliotecas para a análise dos XPaths
+from functools import lru_cache
+from collections import namedtuple
+import re
+
+from .erros import XPathInvalidoErro
+
+_TOKENS = re.compile(r"""
+    (?P<espaco>\s+)
+  | (?P<numero>\d+(?:\.\d*)?|\.\d+)
+  | (?P<literal>"[^"]*"|'[^']*')
+  | (?P<simbolo>//|::|\.\.|!=|<=|>=|[/()\[\].@,|=<>+\-*$])
+  | (?P<nome>[^\W\d](?:[\w.\-·]*)(?::(?:\*|[^\W\d][\w.\-·]*))?)
+""", re.VERBOSE)
+
+EIXOS = {
+    "ancestor", "ancestor-or-self", "attribute", "child", "descendant", "descendant-or-self",
+    "following", "following-sibling", "namespace", "parent", "preceding", "preceding-sibling", "self",
+}
+TIPOS_NO = {"comment", "text", "processing-instruction", "node"}
+FUNCOES = {
+    "last", "position", "count", "id", "local-name", "namespace-uri", "name",
+    "string", "concat", "starts-with", "contains", "substring-before", "substring-after", "substring",
+    "string-length", "normalize-space", "translate", "boolean", "not", "true", "false", "lang",
+    "number", "sum", "floor", "ceiling", "round",
+}
+OPERADORES = {"and", "or", "mod", "div", "*", "/", "//", "|", "+", "-", "=", "!=", "<", "<=", ">", ">="}
+
+#tags que não são do HTML (o XPath do navegador não as encontra sem namespace, o CSS sim)
+_TAGS_ESTRANGEIRAS = {"svg", "math", "g", "path", "circle", "rect", "line", "polyline", "polygon", "ellipse", "use", "defs", "symbol", "tspan"}
+_NOME_CSS = re.compile(r"^[a-z][a-z0-9-]*$")
+#atributos cujos valores o CSS compara sem diferenciar maiúsculas nos documentos HTML (o XPath diferencia)
+_ATRIBUTOS_SEM_CAIXA = {
+    "accept", "accept-charset", "align", "alink", "axis", "bgcolor", "charset", "checked", "clear", "codetype",
+    "color", "compact", "declare", "defer", "dir", "direction", "disabled", "enctype", "face", "frame", "hreflang",
+    "http-equiv", "lang", "language", "link", "media", "method", "multiple", "nohref", "noresize", "noshade",
+    "nowrap", "readonly", "rel", "rev", "rules", "scope", "scrolling", "selected", "shape", "target", "text",
+    "type", "valign", "valuetype", "vlink",
+}
+_ATRIBUTO_CSS = re.compile(r"^[A-Za-z_][A-Za-z0-9_-]*$")
+
+Localizador = namedtuple("Localizador", ["estrategia", "valor", "xpath"])
+Localizador.__doc__ = '''
+Como um XPath será buscado no navegador.
+
+Atributos:
+    estrategia (str): "id", "css" ou "xpath".
+    valor (str): O id, o seletor CSS ou o próprio XPath.
+    xpath (str): O XPath original.
+'''
+
+def _tokenizar(xpath: str):
+
+    '''função interna que quebra o XPath em tokens (tipo, valor, posição), aplicando as regras de desambiguação do XPath 1.0'''
+    tokens = []
+    posicao = 0
+    while posicao < len(xpath):
+        encontrado = _TOKENS.match(xpath, posicao)
+        if encontrado is None:
+            if xpath[posicao] in "'\"":
+                raise XPathInvalidoErro("aspas não fechadas", xpath, posicao)
+            raise XPathInvalidoErro(f"caractere inesperado '{xpath[posicao]}'", xpath, posicao)
+        tipo, valor = encontrado.lastgroup, encontrado.group()
+        if tipo != "espaco":
+            #"*" e os nomes and/or/div/mod são operadores quando vêm depois de algo que não seja @ :: ( [ , ou outro operador
+            anterior = tokens[-1] if tokens else None
+            depois_de_operando = anterior is not None and anterior[1] not in ("@", "::", "(", "[", ",") and anterior[0] != "operador"
+            if depois_de_operando and (valor == "*" or (tipo == "nome" and valor in ("and", "or", "div", "mod"))):
+                tipo = "operador"
+            elif tipo == "simbolo" and valor in OPERADORES and valor != "*":
+                tipo = "operador"
+            elif valor == "*":
+                tipo = "nome"
+            tokens.append((tipo, valor, posicao))
+        posicao = encontrado.end()
+    return tokens
+
+class _Analisador:
+    '''
+    Analisador (descendente recursivo) da gramática do XPath 1.0. Produz uma árvore de tuplas:
+
+        ("caminho", inicio, passos)       inicio: None (relativo), "/" ou "//"; passos: (separador, eixo, teste, predicados)
+        ("filtro", primaria, predicados, passos)
+        ("binario", operador, esquerda, direita)
+        ("negativo", expressao)
+        ("literal", texto) / ("numero", valor) / ("variavel", nome) / ("funcao", nome, argumentos)
+    '''
+    def __init__(self, xpath: str):
+
+        self.xpath = xpath
+        self.tokens = _tokenizar(xpath)
+        self.indice = 0
+
+    def _atual(self, deslocamento: int = 0):
+        indice = self.indice + deslocamento
+        return self.tokens[indice] if indice < len(self.tokens) else (None, None, len(self.xpath))
+
+    def _erro(self, mensagem: str):
+        raise XPathInvalidoErro(mensagem, self.xpath, self._atual()[2])
+
+    def _consumir(self, valor: str = None):
+        token = self._atual()
+        if token[0] is None:
+            self._erro(f"esperava '{valor}' e o XPath terminou" if valor else "o XPath terminou antes do esperado")
+        if valor is not None and token[1] != valor:
+            self._erro(f"esperava '{valor}' e encontrou '{token[1]}'")
+        self.indice += 1
+        return token
+
+    def analisar(self):
+
+        if not self.tokens:
+            self._erro("XPath vazio")
+        arvore = self._ou()
+        if self._atual()[0] is not None:
+            self._erro(f"'{self._atual()[1]}' inesperado")
+        return arvore
+
+    def _binarios(self, proximo, operadores):
+
+        esquerda = proximo()
+        while self._atual()[0] == "operador" and self._atual()[1] in operadores:
+            operador = self._consumir()[1]
+            esquerda = ("binario", operador, esquerda, proximo())
+        return esquerda
+
+    def _ou(self):
+        return self._binarios(self._e, ("or",))
+
+    def _e(self):
+        return self._binarios(self._igualdade, ("and",))
+
+    def _igualdade(self):
+        return self._binarios(self._relacional, ("=", "!="))
+
+    def _relacional(self):
+        return self._binarios(self._aditivo, ("<", "<=", ">", ">="))
+
+    def _aditivo(self):
+        return self._binarios(self._multiplicativo, ("+", "-"))
+
+    def _multiplicativo(self):
+        return self._binarios(self._unario, ("*", "div", "mod"))
+
+    def _unario(self):
+
+        if self._atual()[1] == "-" and self._atual()[0] == "operador":
+            self._consumir()
+            return ("negativo", self._unario())
+        return self._binarios(self._caminho_ou_filtro, ("|",))
+
+    def _inicia_passo(self):
+
+        '''função interna que informa se o token atual começa um passo de caminho (e não uma expressão primária)'''
+        tipo, valor, _ = self._atual()
+        proximo = self._atual(1)[1]
+        if valor in (".", "..", "@"):
+            return True
+        if tipo != "nome":
+            return False
+        if proximo == "::":
+            return True
+        if proximo == "(":
+            return valor in TIPOS_NO
+        return True
+
+    def _caminho_ou_filtro(self):
+
+        tipo, valor, _ = self._atual()
+        if tipo == "operador" and valor in ("/", "//"):
+            self._consumir()
+            if valor == "/" and not self._inicia_passo():
+                return ("caminho", "/", []) #apenas a raiz do documento
+            return ("caminho", valor, self._passos(None))
+        if self._inicia_passo():
+            return ("caminho", None, self._passos(None))
+        primaria = self._primaria()
+        predicados = self._predicados()
+        passos = []
+        if self._atual()[0] == "operador" and self._atual()[1] in ("/", "//"):
+            passos = self._passos(self._consumir()[1])
+        if not predicados and not passos:
+            return primaria
+        return ("filtro", primaria, predicados, passos)
+
+    def _passos(self, separador):
+
+        passos = [(separador, *self._passo())]
+        while self._atual()[0] == "operador" and self._atual()[1] in ("/", "//"):
+            separador = self._consumir()[1]
+            passos.append((separador, *self._passo()))
+        return passos
+
+    def _passo(self):
+
+        tipo, valor, _ = self._atual()
+        if valor == ".":
+            self._consumir()
+            return ("self", ("tipo", "node", None), [])
+        if valor == "..":
+            self._consumir()
+            return ("parent", ("tipo", "node", None), [])
+        eixo = "child"
+        if valor == "@":
+            self._consumir()
+            eixo = "attribute"
+        elif tipo == "nome" and self._atual(1)[1] == "::":
+            if valor not in EIXOS:
+                self._erro(f"eixo desconhecido '{valor}'")
+            eixo = self._consumir()[1]
+            self._consumir("::")
+        tipo, valor, _ = self._atual()
+        if tipo != "nome":
+            self._erro(f"esperava o nome de um elemento ou atributo e encontrou '{valor}'" if valor else "o XPath terminou no meio de um passo")
+        self._consumir()
+        if self._atual()[1] == "(":
+            if valor not in TIPOS_NO:
+                self._erro(f"'{valor}()' não pode ser usado como passo")
+            self._consumir("(")
+            argumento = None
+            if valor == "processing-instruction" and self._atual()[0] == "literal":
+                argumento = self._consumir()[1][1:-1]
+            self._consumir(")")
+            teste = ("tipo", valor, argumento)
+        else:
+            teste = ("nome", valor)
+        return (eixo, teste, self._predicados())
+
+    def _predicados(self):
+
+        predicados = []
+        while self._atual()[1] == "[":
+            self._consumir("[")
+            if self._atual()[1] == "]":
+                self._erro("predicado vazio '[]'")
+            predicados.append(self._ou())
+            self._consumir("]")
+        return predicados
+
+    def _primaria(self):
+
+        tipo, valor, _ = self._atual()
+        if tipo == "literal":
+            self._consumir()
+            return ("literal", valor[1:-1])
+        if tipo == "numero":
+            self._consumir()
+            return ("numero", float(valor))
+        if valor == "$":
+            self._consumir()
+            if self._atual()[0] != "nome":
+                self._erro("esperava o nome da variável depois de '$'")
+            return ("variavel", self._consumir()[1])
+        if valor == "(":
+            self._consumir()
+            expressao = self._ou()
+            self._consumir(")")
+            return expressao
+        if tipo == "nome" and self._atual(1)[1] == "(":
+            if valor not in FUNCOES:
+                self._erro(f"função desconhecida '{valor}()' (o navegador só entende o XPath 1.0)")
+            self._consumir()
+            self._consumir("(")
+            argumentos = []
+            if self._atual()[1] != ")":
+                argumentos.append(self._ou())
+                while self._atual()[1] == ",":
+                    self._consumir(",")
+                    argumentos.append(self._ou())
+            self._consumir(")")
+            return ("funcao", valor, argumentos)
+        if tipo is None:
+            self._erro("o XPath terminou antes do esperado")
+        self._erro(f"'{valor}' inesperado")
+
+@lru_cache(maxsize=2048)
+def analisar_xpath(xpath: str):
+
+    '''
+    Analisa um XPath (sem navegador) e devolve a sua árvore sintática. O resultado fica em cache.
+
+    Args:
+        xpath (str): O XPath.
+
+    Returns:
+        tuple: A árvore (ver _Analisador).
+
+    Raises:
+        XPathInvalidoErro: Se o XPath estiver malformado (com a posição do problema).
+    '''
+    if not isinstance(xpath, str):
+        raise XPathInvalidoErro(f"o XPath deve ser um texto, não {type(xpath).__name__}", str(xpath), 0)
+    return _Analisador(xpath).analisar()
+
+def validar_xpath(xpath: str):
+
+    '''
+    Verifica a sintaxe de um XPath sem ir ao navegador (parênteses, aspas, eixos, funções do XPath 1.0...).
+
+    Args:
+        xpath (str): O XPath que deseja verificar.
+
+    Returns:
+        str: O próprio XPath, se for válido.
+
+    Raises:
+        XPathInvalidoErro: Se o XPath estiver malformado (com a posição do problema).
+    '''
+    analisar_xpath(xpath)
+    return xpath
+
+def _texto_css(texto: str):
+
+    '''função interna que escreve um texto entre aspas para um seletor CSS'''
+    texto = texto.replace("\\", "\\\\").replace("'", "\\'")
+    #quebras de linha não podem aparecer cruas numa string CSS: viram escapes hexadecimais (\a, \d, \c)
+    return "'" + re.sub(r"[\n\r\f]", lambda quebra: f"\\{ord(quebra.group()):x} ", texto) + "'"
+
+def _atributo(expressao):
+
+    '''função interna que devolve o nome do atributo se a expressão for só "@nome" (traduzível para CSS)'''
+    if expressao[0] == "caminho" and expressao[1] is None and len(expressao[2]) == 1:
+        _, eixo, teste, predicados = expressao[2][0]
+        if eixo == "attribute" and teste[0] == "nome" and not predicados and _ATRIBUTO_CSS.match(teste[1]):
+            return teste[1]
+    return None
+
+def _comparacao(expressao):
+
+    '''função interna que traduz @nome = 'valor' (em qualquer ordem) para (nome, valor)'''
+    _, _, esquerda, direita = expressao
+    if esquerda[0] == "literal":
+        esquerda, direita = direita, esquerda
+    nome = _atributo(esquerda)
+    if nome is None or direita[0] != "literal":
+        return None
+    return nome, direita[1]
+
+def _predicado_css(expressao):
+
+    '''função interna que traduz um predicado de atributos para CSS (ou None se não houver equivalente exato)'''
+    tipo = expressao[0]
+    if tipo == "binario" and expressao[1] == "and":
+        esquerda, direita = _predicado_css(expressao[2]), _predicado_css(expressao[3])
+        return esquerda + direita if esquerda is not None and direita is not None else None
+    if tipo == "binario" and expressao[1] in ("=", "!="):
+        comparacao = _comparacao(expressao)
+        if comparacao is None:
+            return None
+        nome, valor = comparacao
+        if nome.lower() in _ATRIBUTOS_SEM_CAIXA:
+            return None
+        if expressao[1] == "=":
+            return f"[{nome}={_texto_css(valor)}]"
+        #@a != 'v' exige que o atributo exista
+        return f"[{nome}]:not([{nome}={_texto_css(valor)}])"
+    if tipo == "caminho":
+        nome = _atributo(expressao)
+        return f"[{nome}]" if nome else None
+    if tipo == "funcao":
+        nome_funcao, argumentos = expressao[1], expressao[2]
+        if nome_funcao in ("contains", "starts-with") and len(argumentos) == 2:
+            nome = _atributo(argumentos[0])
+            #com texto vazio o XPath é sempre verdadeiro e o CSS nunca: não traduz
+            if nome is None or argumentos[1][0] != "literal" or not argumentos[1][1] or nome.lower() in _ATRIBUTOS_SEM_CAIXA:
+                return None
+            operador = "*=" if nome_funcao == "contains" else "^="
+            return f"[{nome}{operador}{_texto_css(argumentos[1][1])}]"
+        if nome_funcao == "not" and len(argumentos) == 1:
+            interno = _predicado_css(argumentos[0])
+            #:not() só com um seletor simples de atributo
+            if interno is None or interno.count("[") != 1 or ":" in interno.replace(":not", ""):
+                return None
+            return f":not({interno})"
+    return None
+
+def _passo_css(eixo: str, teste, predicados: list):
+
+    '''função interna que traduz um passo (elemento + predicados) para CSS'''
+    if teste[0] != "nome":
+        return None
+    tag = teste[1]
+    if tag != "*" and (not _NOME_CSS.match(tag) or tag in _TAGS_ESTRANGEIRAS):
+        return None
+    seletor = tag
+    for posicao, predicado in enumerate(predicados):
+        #a posição só equivale ao nth-of-type quando é o primeiro predicado de um passo no eixo child
+        if posicao == 0 and eixo == "child" and predicado[0] == "numero":
+            numero = predicado[1]
+            if numero != int(numero) or numero < 1:
+                return None
+            seletor += f":nth-{'child' if tag == '*' else 'of-type'}({int(numero)})"
+            continue
+        if posicao == 0 and eixo == "child" and predicado == ("funcao", "last", []):
+            seletor += ":last-child" if tag == "*" else ":last-of-type"
+            continue
+        traduzido = _predicado_css(predicado)
+        if traduzido is None:
+            return None
+        seletor += traduzido
+    return seletor
+
+def _traduzir(arvore):
+
+    '''função interna que traduz a árvore de um XPath para (estrategia, valor), ou None se ela não tiver equivalente exato em CSS'''
+    if arvore[0] != "caminho" or arvore[1] != "//" or not arvore[2]:
+        return None
+    partes = []
+    for separador, eixo, teste, predicados in arvore[2]:
+        if eixo == "descendant" and separador == "/":
+            separador = "//"
+        elif eixo != "child":
+            return None
+        seletor = _passo_css(eixo, teste, predicados)
+        if seletor is None:
+            return None
+        if partes:
+            partes.append(" > " if separador == "/" else " ")
+        partes.append(seletor)
+
+    #//*[@id='x'] vira uma busca por id
+    passos = arvore[2]
+    if len(passos) == 1 and passos[0][2] == ("nome", "*") and len(passos[0][3]) == 1:
+        predicado = passos[0][3][0]
+        if predicado[0] == "binario" and predicado[1] == "=":
+            comparacao = _comparacao(predicado)
+            if comparacao is not None and comparacao[0] == "id" and comparacao[1] and not re.search(r"\s", comparacao[1]):
+                return ("id", comparacao[1])
+    return ("css", "".join(partes))
+
+@lru_cache(maxsize=2048)
+def compilar_localizador(xpath: str, traduzir: bool = True):
+
+    '''
+    Escolhe a forma mais rápida de buscar um XPath: por id, por seletor CSS ou, se não houver
+    equivalente exato, pelo próprio XPath. O resultado fica em cache.
+
+    Args:
+        xpath (str): O XPath.
+        traduzir (bool): Se False, apenas valida e mantém a busca por XPath. Padrão é True.
+
+    Returns:
+        Localizador: A estratégia ("id", "css" ou "xpath") e o valor a buscar.
+
+    Raises:
+        XPathInvalidoErro: Se o XPath estiver malformado.
+    '''
+    arvore = analisar_xpath(xpath)
+    traducao = _traduzir(arvore) if traduzir else None
+    if traducao is None:
+        return Localizador("xpath", xpath, xpath)
+    return Localizador(traducao[0], traducao[1], xpath)
+
+def seletor_css(localizador: Localizador):
+
+    '''
+    Devolve o localizador como seletor CSS (para uso em scripts na página), ou None se ele for um XPath.
+
+    Args:
+        localizador (Localizador): O localizador compilado.
+
+    Returns:
+        str: O seletor CSS ou None.
+    '''
+    if localizador.estrategia == "id":
+        return f"[id={_texto_css(localizador.valor)}]"
+    if localizador.estrategia == "css":
+        return localizador.valor
+    return None
@@ -5,32 +5,82 @@ bem como interações com o gerenciamento de arquivos no computador
 
 #bibliotecas do Selenium para controle do navegador e interações com a página
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
-from selenium.common.exceptions import ElementClickInterceptedException
-from selenium.common.exceptions import ElementNotInteractableException
 from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.common.exceptions import NoSuchFrameException
+from selenium.common.exceptions import NoSuchWindowException
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support.ui import Select
-from selenium.webdriver.common.by import By
 from selenium import webdriver
 
+#cache dos binários de driver e navegador já resolvidos
+from .binarios import CacheBinarios, resolver_com_selenium_manager
+
 #biblioteca para o driver undetected
 import undetected_chromedriver as uc
 from DrissionPage import ChromiumPage
 from DrissionPage import ChromiumOptions
 import platform
 
+#backends que traduzem as ações para as chamadas nativas de cada biblioteca
+from .backends import BackendSelenium, BackendUndetected, BackendDrission, EXCECOES_REPETIVEIS
+
+#métricas de latência das ações e rastreamento dos comandos
+from .rastreamento import RastreadorComandos
+from .metricas import RegistroMetricas
+
+#sessão HTTP que reaproveita a autenticação do navegador
+from .sessao_http import SessaoHTTP
+
+#conexão CDP direta com as abas e gravação de tela
+from .gravacao import GravadorTela
+from .cdp import SessaoCDP
+from .impressao import opcoes_pdf, carregar_pagina, salvar_pdf, salvar_pdf_webdriver
+
+#captura das respostas XHR/fetch das páginas
+from .rede import CapturaRede, RespostaCapturada
+
+#diário de tarefas (SQLite) para retomar lotes longos
+from .diario import DiarioTarefas, Tarefa
+
+#índice de conteúdo (hash) para evitar arquivos duplicados
+from .indice_hash import IndiceHash, calcular_hash
+
+#observação de pastas (inotify) com regras
+from .observador import ObservadorPasta
+
+#tradução dos XPaths para buscas por id/CSS
+from .localizadores import Localizador, compilar_localizador, validar_xpath, seletor_css
+
+#conexões HTTP do WebDriver compartilhadas entre as sessões e latência dos comandos
+from .conexoes import LatenciaComandos, configurar_conexoes, instalar_conexao, latencia_global
+
+#pool de sessões em WebDriver remotos (Selenium Grid)
+from .grid import PoolGrid, NoGrid
+
+#planos de ações executados em lotes
+from .plano import PlanoAcoes, ResultadoPlano, executar_plano as _executar_plano
+
 #biblioteca para criar decoradores e 
 from functools import wraps
+import inspect
 from typing import Literal
 
-#biblioteca para interface gráfica
-from tkinter import messagebox
-from tkinter import filedialog
-import tkinter as tk
+#avisos ao usuário (tkinter importado só quando necessário) e modo autônomo
+from .interface import definir_modo_autonomo, modo_autonomo, configurar_log, notificar, confirmar, dialogo_arquivos, registro
+from .erros import *
+import logging
+
+#bibliotecas para o controle dos processos do navegador
+from .processos import _arvore_processos, _memoria_processos, POPEN_NOVA_SESSAO, encerrar_processos, registro_processos, limpar_processos_orfaos
+import weakref
+import atexit
 
 #bibliotecas para manipulação de arquivos e pastas
 import datetime
@@ -39,6 +89,219 @@ import time
 import json
 import os
 
+#bibliotecas para tarefas em segundo plano
+import threading
+import base64
+import queue
+
+class _GravadorArquivos:
+    '''
+    Fila de gravação em segundo plano.
+    Decodifica (base64) e escreve os arquivos numa thread própria, sem travar o fluxo principal.
+    '''
+    def __init__(self):
+
+        self._fila = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def enviar(self, caminho: str, dados, em_base64: bool = False):
+
+        '''enfileira um arquivo para ser gravado (inicia a thread na primeira chamada)'''
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._executar, name="automaweb-gravador", daemon=True)
+                self._thread.start()
+        self._fila.put((caminho, dados, em_base64))
+
+    def aguardar(self):
+
+        '''bloqueia até que todos os arquivos enfileirados tenham sido gravados'''
+        self._fila.join()
+
+    def _executar(self):
+
+        while True:
+            caminho, dados, em_base64 = self._fila.get()
+            try:
+                if em_base64:
+                    dados = base64.b64decode(dados)
+                #grava num arquivo temporário e renomeia, para nunca deixar um arquivo pela metade
+                temporario = f"{caminho}.tmp"
+                with open(temporario, 'wb') as arquivo:
+                    arquivo.write(dados)
+                os.replace(temporario, caminho)
+            except Exception as e:
+                print(f"Erro ao gravar '{caminho}' em segundo plano: {e}")
+            finally:
+                self._fila.task_done()
+
+#navegadores com driver aberto neste processo (fechados em paralelo por fechar_todos_drivers e ao sair do Python)
+_navegadores_abertos = weakref.WeakSet()
+_orfaos_verificados = False
+
+#argumentos do perfil "servidor" (Chrome/Edge): desliga tudo que não é necessário para automação sem tela
+ARGUMENTOS_SERVIDOR_CHROMIUM = [
+    "--disable-gpu",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-extensions",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-breakpad", #relatórios de falha
+    "--disable-crash-reporter",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--metrics-recording-only",
+    "--mute-audio",
+    "--no-sandbox", #necessário para Linux
+    "--disable-dev-shm-usage", #evita erros de memória no Docker/Linux
+]
+
+#preferências do perfil "servidor" (Firefox): o equivalente às opções acima
+PREFERENCIAS_SERVIDOR_FIREFOX = {
+    "layers.acceleration.disabled": True,
+    "gfx.webrender.software": True,
+    "app.update.auto": False,
+    "app.update.checkInstallTime": False,
+    "app.normandy.enabled": False,
+    "extensions.update.enabled": False,
+    "extensions.getAddons.cache.enabled": False,
+    "browser.shell.checkDefaultBrowser": False,
+    "browser.startup.homepage_override.mstone": "ignore",
+    "browser.newtabpage.enabled": False,
+    "browser.safebrowsing.downloads.remote.enabled": False,
+    "browser.safebrowsing.malware.enabled": False,
+    "browser.safebrowsing.phishing.enabled": False,
+    "browser.crashReports.unsubmittedCheck.autoSubmit2": False,
+    "datareporting.healthreport.uploadEnabled": False,
+    "datareporting.policy.dataSubmissionEnabled": False,
+    "toolkit.telemetry.enabled": False,
+    "services.sync.engine.addons": False,
+    "media.autoplay.default": 5,
+}
+
+class _EsperaMedida(WebDriverWait):
+    '''
+    WebDriverWait que soma o tempo gasto em cada espera nas métricas da ação em andamento.
+    '''
+    def __init__(self, driver, timeout: float, navegador, **kwargs):
+
+        super().__init__(driver, timeout, **kwargs)
+        self._navegador = navegador
+
+    def until(self, method, message: str = ""):
+
+        inicio = time.perf_counter()
+        try:
+            return super().until(method, message)
+        finally:
+            self._navegador._acumular("espera", time.perf_counter() - inicio)
+
+    def until_not(self, method, message: str = ""):
+
+        inicio = time.perf_counter()
+        try:
+            return super().until_not(method, message)
+        finally:
+            self._navegador._acumular("espera", time.perf_counter() - inicio)
+
+class _AcaoGeradora:
+    '''
+    Iterador que envolve as ações que são geradores (ex: processar_em_abas, paginar). Desde a chamada até o gerador
+    terminar (ou ser fechado), a reciclagem fica suspensa. A trava do modo seguro_threads é obtida a cada passo
+    (entre um item e outro, outras threads podem usar a sessão).
+    As métricas somam o tempo de todos os passos do gerador (o código de quem consome os itens não conta).
+    '''
+    def __init__(self, navegador, func, args, kwargs):
+
+        self._navegador = navegador
+        self._nome = func.__name__
+        self._alvo = args[0] if args and isinstance(args[0], str) else kwargs.get("xpath")
+        self._totais = {"espera": 0.0, "stun": 0.0, "tentativas": 0, "comandos": 0}
+        self._duracao = 0.0
+        self._inicio_rastreamento = RastreadorComandos._agora()
+        self._encerrada = False
+        navegador._reciclagem_suspensa += 1 #reciclar no meio do gerador fecharia as abas de trabalho
+        self._gerador = func(navegador, *args, **kwargs)
+
+    def __iter__(self):
+
+        return self
+
+    def __next__(self):
+
+        if self._encerrada:
+            raise StopIteration
+        try:
+            return self._passo(lambda: next(self._gerador))
+        except StopIteration:
+            self._encerrar("ok")
+            raise
+        except Exception as e:
+            self._encerrar(type(e).__name__)
+            if not self._navegador._pilha_acoes():
+                self._navegador._exportar_gravacao_em_falha(self._nome)
+            raise
+
+    def close(self):
+
+        '''interrompe o gerador (fecha as abas de trabalho) e libera a reciclagem'''
+        if self._encerrada:
+            return
+        try:
+            self._passo(self._gerador.close)
+        finally:
+            self._encerrar("ok")
+
+    def __del__(self):
+
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _passo(self, funcao):
+
+        '''função interna que executa um passo do gerador como uma ação em andamento (esperas e comandos contam para ela)'''
+        navegador = self._navegador
+        pilha = navegador._pilha_acoes()
+        contexto = {"acao": self._nome, "espera": 0.0, "stun": 0.0, "tentativas": 0, "comandos": 0}
+        travada = navegador._travar()
+        pilha.append(contexto)
+        inicio = time.perf_counter()
+        try:
+            return funcao()
+        finally:
+            self._duracao += time.perf_counter() - inicio
+            pilha.pop()
+            if travada:
+                navegador._trava.release()
+            for campo in self._totais:
+                self._totais[campo] += contexto[campo]
+                if pilha:
+                    pilha[-1][campo] += contexto[campo]
+
+    def _encerrar(self, resultado: str):
+
+        '''função interna que libera a reciclagem e registra as métricas do gerador inteiro'''
+        if self._encerrada:
+            return
+        self._encerrada = True
+        navegador = self._navegador
+        navegador._reciclagem_suspensa -= 1
+        totais = self._totais
+        navegador.metricas.registrar(self._nome, self._duracao, totais["espera"], totais["stun"], totais["tentativas"], resultado)
+        rastreador = navegador._rastreador
+        if rastreador is not None:
+            rastreador.registrar_acao(self._nome, self._inicio_rastreamento, RastreadorComandos._agora(), {
+                "resultado": resultado,
+                "comandos": totais["comandos"],
+                "tentativas": totais["tentativas"],
+                "alvo": self._alvo,
+            })
+
 class Navegador:
     '''
     Classe principal para controle do navegador e interações com a página.
@@ -46,39 +309,247 @@ class Navegador:
     Args:
         tempo_stun (float): Tempo de espera entre as ações (em segundos). Padrão é 0.
         navegador (str): Tipo do navegador (edge, chrome ou firefox). Padrão é "edge".
+        seguro_threads (bool): Se True, as ações de várias threads na mesma sessão são executadas uma por vez
+            (sem comandos intercalados nem troca de aba/iframe no meio de uma ação). Nas ações que são geradores
+            (processar_em_abas, paginar), cada item é produzido sem interrupções. Padrão é False.
     '''
-    def __init__(self, tempo_stun: float = 0, navegador: Literal["edge", "chrome", "firefox" ] = "edge"):
+    def __init__(self, tempo_stun: float = 0, navegador: Literal["edge", "chrome", "firefox" ] = "edge", seguro_threads: bool = False):
         
         self.driver = None #driver do navegador
         self.wait = None #espera do driver
+        self._tempo_wait = 10 #tempo máximo padrão das esperas (em segundos)
+        self._backend = None #backend que executa as ações no driver atual (selenium, undetected ou DrissionPage)
         self.stun = tempo_stun #tempo de stun entre as ações (em segundos)
         self.navegador = navegador.lower() #tipo do navegador (edge, chrome ou firefox)
         self.undetected_edge = False #indica se o modo undetected do edge foi ativado (inicialmente False)
+        self._gravador = None #fila de gravação de screenshots em segundo plano (criada sob demanda)
+        self._gravador_tela = None #gravação contínua da aba via screencast (ver iniciar_gravacao)
+        self._pasta_falhas = None #pasta onde a gravação é exportada quando uma ação falha
+        self._segundos_falha = 30 #quantos segundos finais da gravação são exportados numa falha
+        self.metricas = RegistroMetricas({"navegador": self.navegador}) #latência de cada ação (ver exportar_metricas)
+        self._local = threading.local() #pilha de ações em andamento (por thread), usada nas métricas
+        self._rastreador = None #rastreamento dos comandos WebDriver (ver iniciar_rastreamento)
+        self._intervalo_poll = 0.5 #intervalo entre as verificações das esperas (em segundos)
+        self.tempo_inicializacao = None #tempo (em segundos) que a última abertura do driver levou até ficar pronta
+        self._sessao_http = None #sessão HTTP com os cookies do navegador (ver sessao_http)
+        self._capturas = [] #capturas de rede ainda ativas (ver capturar_respostas)
+        self._caminho_frame = [] #XPaths dos iframes em que o foco está, do mais externo ao mais interno
+        self._cache_frames = {} #caminho (tupla de XPaths) -> referência do iframe já localizado
+        self._abas = {} #nome da aba -> handle
+        self._ordem_abas = [] #handles das abas na ordem de abertura (evita consultar window_handles a cada troca)
+        self._aba_atual = None #handle da aba em foco
+        self.compilar_xpath = True #traduz os XPaths simples para buscas por id/CSS (False para buscar sempre por XPath)
+        self._parametros_abertura = None #método e argumentos da última abertura do driver (usados para reciclar)
+        self._reciclagem = None #limites da reciclagem automática (ver configurar_reciclagem)
+        self._reciclagem_suspensa = 0 #maior que zero enquanto a reciclagem não pode acontecer (ex: processar_em_abas)
+        self._reciclando = False #evita reciclar de novo durante a própria reciclagem
+        self._acoes_desde_abertura = 0 #ações executadas desde a última abertura do driver
+        self.reciclagens = 0 #quantas vezes o driver foi reciclado
+        self.url_remota = None #endereço do WebDriver remoto em uso (ver abrir_driver_remoto), None para um navegador local
+        self._trava = threading.RLock() if seguro_threads else None #uma ação por vez na sessão (ver seguro_threads)
+        self.latencia = LatenciaComandos() #ida e volta de cada comando WebDriver (ver latencia_comandos)
+        self.limite_teclas = 200 #a partir de quantos caracteres o digitar(modo="auto") insere o texto de uma vez
 
     def _aplicar_stun(self):
 
         '''função interna que espera tempo_stun segundos'''
+        inicio = time.perf_counter()
         time.sleep(self.stun)
+        self._acumular("stun", time.perf_counter() - inicio)
+
+    def _criar_espera(self, timeout: float):
+
+        '''função interna que cria um WebDriverWait com medição do tempo de espera'''
+        return _EsperaMedida(self.driver, timeout, self, poll_frequency=self._intervalo_poll)
+
+    def _pilha_acoes(self):
+
+        '''função interna que devolve a pilha de ações em andamento na thread atual'''
+        pilha = getattr(self._local, "pilha", None)
+        if pilha is None:
+            pilha = self._local.pilha = []
+        return pilha
+
+    def _acumular(self, campo: str, valor: float):
+
+        '''função interna que soma um valor (espera, stun, tentativas) na ação em andamento'''
+        pilha = self._pilha_acoes()
+        if pilha:
+            pilha[-1][campo] += valor
+
+    def _executar_acao(self, func, args, kwargs):
+
+        '''função interna que executa uma ação pública registrando suas métricas'''
+        pilha = self._pilha_acoes()
+        contexto = {"acao": func.__name__, "espera": 0.0, "stun": 0.0, "tentativas": 0, "comandos": 0}
+        pilha.append(contexto)
+        resultado = "ok"
+        rastreador = self._rastreador
+        inicio_rastreamento = RastreadorComandos._agora()
+        inicio = time.perf_counter()
+        try:
+            return func(self, *args, **kwargs)
+        except Exception as e:
+            resultado = type(e).__name__
+            if len(pilha) == 1: #só a ação mais externa (a chamada pelo usuário) exporta a gravação
+                self._exportar_gravacao_em_falha(contexto["acao"])
+            raise
+        finally:
+            duracao = time.perf_counter() - inicio
+            pilha.pop()
+            #ações chamadas por outras ações também contam no tempo da ação externa
+            if pilha:
+                for campo in ("espera", "stun", "tentativas", "comandos"):
+                    pilha[-1][campo] += contexto[campo]
+            self.metricas.registrar(
+                contexto["acao"], duracao, contexto["espera"], contexto["stun"], contexto["tentativas"], resultado
+            )
+            if rastreador is not None:
+                rastreador.registrar_acao(contexto["acao"], inicio_rastreamento, RastreadorComandos._agora(), {
+                    "resultado": resultado,
+                    "comandos": contexto["comandos"],
+                    "tentativas": contexto["tentativas"],
+                    "alvo": args[0] if args and isinstance(args[0], str) else kwargs.get("xpath"),
+                })
+
+    def _executar_cdp(self, comando: str, parametros: dict = None):
+
+        '''função interna que envia um comando CDP (Chrome DevTools Protocol) para o driver atual'''
+        parametros = parametros or {}
+        if hasattr(self.driver, "execute_cdp_cmd"): #selenium (chrome/edge) e undetected-chromedriver
+            return self.driver.execute_cdp_cmd(comando, parametros)
+        if hasattr(self.driver, "run_cdp"): #DrissionPage (edge undetected), na aba em foco
+            return getattr(self._backend, "pagina", self.driver).run_cdp(comando, **parametros)
+        raise NotImplementedError(f"O navegador {self.navegador} não suporta comandos CDP.")
+
+    def _executar_script(self, script: str, *args):
+
+        '''função interna que executa um JavaScript na página, independente do tipo de driver'''
+        if self._backend is not None:
+            return self._backend.executar_script(script, *args)
+        if hasattr(self.driver, "execute_script"):
+            return self.driver.execute_script(script, *args)
+        return self.driver.run_js(script, *args)
+
+    def _instalar_rastreador(self):
+
+        '''função interna que liga o rastreador (se houver) ao driver atual e passa a medir as idas e voltas dos comandos'''
+        if self.driver is not None:
+            try:
+                instalar_conexao(self.driver, self.latencia)
+            except Exception as e:
+                print(f"Não foi possível usar as conexões compartilhadas: {e}")
+        if self._rastreador is not None and self.driver is not None:
+            self._rastreador.instalar(self.driver, ao_comando=lambda: self._acumular("comandos", 1))
+
+    def _abrir_sessao_cdp(self):
+
+        '''função interna que abre uma conexão CDP própria (websocket) com a aba atual'''
+        if self.navegador == "firefox":
+            raise NotImplementedError("O Firefox não suporta conexões CDP.")
+        endereco = SessaoCDP.endereco_depuracao(self.driver)
+        if hasattr(self.driver, "tab_id"): #DrissionPage
+            id_aba = self._backend.aba_atual()
+        else:
+            id_aba = self._executar_cdp("Target.getTargetInfo")["targetInfo"]["targetId"]
+        return SessaoCDP(f"ws://{endereco}/devtools/page/{id_aba}")
+
+    def _exportar_gravacao_em_falha(self, nome_acao: str):
+
+        '''função interna que salva os últimos segundos da gravação quando uma ação falha'''
+        if self._gravador_tela is None or self._pasta_falhas is None:
+            return
+        try:
+            destino = os.path.join(self._pasta_falhas, datetime.datetime.now().strftime(f"{nome_acao}_%Y%m%d_%H%M%S_%f"))
+            self._gravador_tela.exportar(destino, self._segundos_falha)
+            print(f"Gravação da falha em '{nome_acao}' salva em: {destino}")
+        except Exception as e:
+            print(f"Erro ao exportar a gravação da falha: {e}")
+
+    def _travar(self, tempo_limite: float = None):
+
+        '''função interna que obtém a trava da sessão (modo seguro_threads); devolve False se não obteve dentro do tempo limite'''
+        if self._trava is None:
+            return False
+        return self._trava.acquire(timeout=-1 if tempo_limite is None else tempo_limite)
 
     @staticmethod
     def _verifica_driver(func):
 
+        assinatura = inspect.signature(func) if func.__name__ == "fechar_driver" else None
+
         @wraps(func)
         def wrapper(self, *args, **kwargs):
+
+            #no modo seguro_threads, uma ação por vez (as ações chamadas dentro de outra reentram na mesma trava).
+            #o fechamento não espera para sempre: uma ação travada em outra thread não pode impedir o quit()
+            tempo_limite = None
+            if assinatura is not None: #o tempo_limite pode vir por posição (ex: fechar_todos_drivers)
+                argumentos = assinatura.bind(self, *args, **kwargs)
+                argumentos.apply_defaults()
+                tempo_limite = argumentos.arguments["tempo_limite"]
+            travada = self._travar(tempo_limite)
+            try:
+                return verificar_e_executar(self, *args, **kwargs)
+            finally:
+                if travada:
+                    self._trava.release()
+
+        def verificar_e_executar(self, *args, **kwargs):
             
             #criando um decorador para verificar se o driver foi inicializado antes de executar a função decorada.
             if self.driver is None or self.wait is None:
-                messagebox.showerror(
-                    "Erro Crítico", 
-                    f"Tentativa de executar '{func.__name__}' sem driver.\nUse abrir_driver() primeiro."
-                )
+                mensagem = f"Tentativa de executar '{func.__name__}' sem driver.\nUse abrir_driver() primeiro."
+                if modo_autonomo():
+                    raise DriverNaoIniciadoErro(mensagem)
+                notificar(logging.ERROR, "Erro Crítico", mensagem, "driver_nao_iniciado", acao=func.__name__)
                 return None  #cancela a ação original aqui
             
-            #se passou no if acima, executamos a função original passando os argumentos
-            return func(self, *args, **kwargs)
+            #entre uma ação e outra (nunca no meio de uma), recicla o navegador se os limites foram ultrapassados
+            if not self._pilha_acoes() and func.__name__ != "fechar_driver":
+                self._verificar_reciclagem()
+
+            #frame=[...] em qualquer ação: entra no iframe de destino (trocando o mínimo de níveis) antes de executar
+            if "frame" in kwargs:
+                self.ir_para_frame(kwargs.pop("frame"))
+
+            #geradores (ex: paginar) rodam aos poucos: as métricas e a suspensão da reciclagem acompanham o gerador (e a trava, cada passo)
+            if inspect.isgeneratorfunction(func):
+                return _AcaoGeradora(self, func, args, kwargs)
+
+            #se passou no if acima, executamos a função original passando os argumentos (registrando as métricas)
+            return self._executar_acao(func, args, kwargs)
         
         #o decorador devolve o wrapper para substituir a função original
         return wrapper
+
+    @staticmethod
+    def _sincronizado(func):
+
+        #decorador para os métodos públicos que mexem na sessão sem serem ações (ex: reciclar_driver): só obtém a trava
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            travada = self._travar()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                if travada:
+                    self._trava.release()
+        return wrapper
+
+    @staticmethod
+    def _instrumentar(func):
+
+        #decorador para as ações que não dependem de um driver aberto (ex: abrir_driver), apenas registra as métricas
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            travada = self._travar()
+            try:
+                return self._executar_acao(func, args, kwargs)
+            finally:
+                if travada:
+                    self._trava.release()
+        return wrapper
  
     @staticmethod
     def _repetir_por_interceptacao(limite=3, delay=1):
@@ -86,12 +557,8 @@ class Navegador:
             @wraps(func)
             def wrapper(*args, **kwargs):
                 tentativas = 0
-                #lista de exceções de "impedimento"
-                excecoes_ignordas = (
-                    ElementClickInterceptedException, 
-                    ElementNotInteractableException,
-                    StaleElementReferenceException
-                ) #sempre que uma dessas exceções ocorrer, ele tenta novamente
+                #lista de exceções de "impedimento" (do selenium e equivalentes do DrissionPage)
+                excecoes_ignordas = EXCECOES_REPETIVEIS #sempre que uma dessas exceções ocorrer, ele tenta novamente
                 
                 while tentativas < limite:
                     try:
@@ -101,6 +568,7 @@ class Navegador:
                         if tentativas == limite:
                             print(f"Limite de tentativas excedido ao tentar executar '{func.__name__}': {e}")
                             raise
+                        args[0]._acumular("tentativas", 1)
                         time.sleep(delay)
                     except Exception as e:
                         print(f"Erro ao tentar executar '{func.__name__}': {e}")
@@ -111,72 +579,210 @@ class Navegador:
 
 ### NAVEGAÇÕES DENTRO DO DRIVER
 
-    def abrir_driver(self, headless: bool = False, tempo_wait: int = 10):
+    @_instrumentar
+    def abrir_driver(self, headless: bool = False, tempo_wait: int = 10, intervalo_poll: float = 0.5, usar_cache_binarios: bool = True,
+                     perfil: Literal["padrao", "servidor"] = "padrao", tamanho_janela: tuple = (1920, 1080)):
         '''
         Inicializa o driver baseado na escolha feita no __init__ (Edge, Chrome ou Firefox).
 
         Args:
             headless (bool): Se True, o navegador será iniciado em modo headless. Padrão é False.
             tempo_wait (int): Tempo de espera do driver (em segundos). Padrão é 10.
-        '''
+            intervalo_poll (float): Intervalo entre as verificações das esperas (em segundos). Padrão é 0.5.
+            usar_cache_binarios (bool): Se True, reaproveita os caminhos de driver e navegador já resolvidos
+                (em ~/.cache/automaweb), evitando consultar o Selenium Manager a cada abertura. Padrão é True.
+            perfil (str): "padrao" ou "servidor". O perfil servidor desliga GPU, rede em segundo plano, atualizações,
+                extensões, sincronização, primeira execução e relatórios de falha, e usa uma janela de tamanho fixo
+                em vez de maximizar. Indicado para workers em containers. Padrão é "padrao".
+            tamanho_janela (tuple): Largura e altura da janela no perfil servidor. Padrão é (1920, 1080).
+
+        Returns:
+            float: O tempo entre o início da abertura e o driver pronto para uso (em segundos), também guardado em self.tempo_inicializacao.
+        '''
+        inicio = time.perf_counter()
+        self._verificar_orfaos()
+        self._parametros_abertura = ("abrir_driver", {
+            "headless": headless, "tempo_wait": tempo_wait, "intervalo_poll": intervalo_poll,
+            "usar_cache_binarios": usar_cache_binarios, "perfil": perfil, "tamanho_janela": tamanho_janela,
+        })
+        self._acoes_desde_abertura = 0
+        self._intervalo_poll = intervalo_poll
+        self._tempo_wait = tempo_wait
+        servidor = perfil == "servidor"
+        largura, altura = tamanho_janela
         try:
-            if self.navegador == "chrome" or self.navegador == "edge":
-                
-                if self.navegador == "chrome":
-                    options = ChromeOptions()
-                if self.navegador == "edge":
-                    options = EdgeOptions()
-                #configurações anti-detecção e log
-                options.add_experimental_option("excludeSwitches", ["enable-automation"])
-                options.add_experimental_option('excludeSwitches', ['enable-logging'])
-                options.add_experimental_option('useAutomationExtension', False)
-                options.add_argument("--log-level=3")
+            if self.navegador not in ("chrome", "edge", "firefox"):
+                raise ValueError(f"Navegador '{self.navegador}' não suportado. Escolha entre: edge, chrome, firefox.")
+            options = self._criar_opcoes(headless, servidor, largura, altura)
+            self.driver = self._iniciar_driver_selenium(options, usar_cache_binarios)
+            self.url_remota = None
+
+            #configurações globais após iniciar o driver
+            self._backend = BackendSelenium(self)
+            self._registrar_aba_inicial()
+            self._instalar_rastreador()
+            if not servidor:
+                self.driver.maximize_window()
+            self.wait = self._criar_espera(tempo_wait)
+            self._registrar_processos()
+            self.tempo_inicializacao = time.perf_counter() - inicio
+            return self.tempo_inicializacao
+
+        except Exception as e:
+            print(f"Erro ao iniciar o driver ({self.navegador}): {e}")
+            raise
+
+    def _criar_opcoes(self, headless: bool, servidor: bool, largura: int, altura: int):
+
+        '''função interna que monta as opções do selenium (anti-detecção, perfil servidor e headless) do navegador escolhido'''
+        if self.navegador == "chrome" or self.navegador == "edge":
+            
+            if self.navegador == "chrome":
+                options = ChromeOptions()
+            if self.navegador == "edge":
+                options = EdgeOptions()
+            #configurações anti-detecção e log
+            options.add_experimental_option("excludeSwitches", ["enable-automation"])
+            options.add_experimental_option('excludeSwitches', ['enable-logging'])
+            options.add_experimental_option('useAutomationExtension', False)
+            options.add_argument("--log-level=3")
+            if servidor:
+                for argumento in ARGUMENTOS_SERVIDOR_CHROMIUM:
+                    options.add_argument(argumento)
+                options.add_argument(f"--window-size={largura},{altura}")
+            else:
                 options.add_argument("--start-maximized")
-                if headless:
-                    options.add_argument("--headless=new")
-                    options.add_argument("--headless=new")
+            if headless:
+                options.add_argument("--headless=new")
+                if not servidor:
                     options.add_argument("--no-sandbox") #necessário para Linux
                     options.add_argument("--disable-dev-shm-usage") #evita erros de memória no Docker/Linux
-                if self.navegador == "chrome":
-                    self.driver = webdriver.Chrome(options=options)
-                if self.navegador == "edge":
-                    self.driver = webdriver.Edge(options=options)
+            return options
+
+        options = FirefoxOptions()
+        #configurações anti-detecção e log
+        options.set_preference("dom.webdriver.enabled", False)
+        options.set_preference("useAutomationExtension", False)
+        options.log.level = "fatal" #reduz o nível de log do Geckodriver para evitar poluição no terminal                
+        if servidor:
+            for preferencia, valor in PREFERENCIAS_SERVIDOR_FIREFOX.items():
+                options.set_preference(preferencia, valor)
+            options.add_argument(f"--width={largura}")
+            options.add_argument(f"--height={altura}")
+        if headless:
+            options.add_argument("-headless")
+        return options
+
+    @_instrumentar
+    def abrir_driver_remoto(self, url: str, headless: bool = False, tempo_wait: int = 10, intervalo_poll: float = 0.5,
+                            perfil: Literal["padrao", "servidor"] = "padrao", tamanho_janela: tuple = (1920, 1080), capacidades: dict = None):
+        '''
+        Inicializa o driver num WebDriver remoto (Selenium Grid ou selenium-server standalone), com as mesmas
+        opções do abrir_driver. Todas as ações funcionam igual; as que dependem do CDP ou dos processos locais
+        (salvar_pdfs, gravação, memoria_navegador) não estão disponíveis. Para muitas sessões, veja PoolGrid.
 
-            elif self.navegador == "firefox":
-                
-                options = FirefoxOptions()
-                #configurações anti-detecção e log
-                options.set_preference("dom.webdriver.enabled", False)
-                options.set_preference("useAutomationExtension", False)
-                options.log.level = "fatal" #reduz o nível de log do Geckodriver para evitar poluição no terminal                
-                if headless:
-                    options.add_argument("-headless")
-                self.driver = webdriver.Firefox(options=options)
-            
-            else:
-                raise ValueError(f"Navegador '{self.navegador}' não suportado. Escolha entre: edge, chrome, firefox.")
+        Args:
+            url (str): O endereço do WebDriver remoto (ex: "http://maquina:4444" ou "http://maquina:4444/wd/hub").
+            headless (bool): Se True, o navegador será iniciado em modo headless. Padrão é False.
+            tempo_wait (int): Tempo de espera do driver (em segundos). Padrão é 10.
+            intervalo_poll (float): Intervalo entre as verificações das esperas (em segundos). Padrão é 0.5.
+            perfil (str): "padrao" ou "servidor" (ver abrir_driver). Padrão é "padrao".
+            tamanho_janela (tuple): Largura e altura da janela no perfil servidor. Padrão é (1920, 1080).
+            capacidades (dict, opcional): Capacidades extras pedidas ao grid (ex: {"platformName": "linux", "se:name": "lote 1"}).
 
-            #configurações globais após iniciar o driver
-            self.driver.maximize_window()
-            self.wait = WebDriverWait(self.driver, tempo_wait)
+        Returns:
+            float: O tempo entre o início da abertura e o driver pronto para uso (em segundos), também guardado em self.tempo_inicializacao.
+        '''
+        inicio = time.perf_counter()
+        self._parametros_abertura = ("abrir_driver_remoto", {
+            "url": url, "headless": headless, "tempo_wait": tempo_wait, "intervalo_poll": intervalo_poll,
+            "perfil": perfil, "tamanho_janela": tamanho_janela, "capacidades": capacidades,
+        })
+        self._acoes_desde_abertura = 0
+        self._intervalo_poll = intervalo_poll
+        self._tempo_wait = tempo_wait
+        servidor = perfil == "servidor"
+        largura, altura = tamanho_janela
+        try:
+            if self.navegador not in ("chrome", "edge", "firefox"):
+                raise ValueError(f"Navegador '{self.navegador}' não suportado. Escolha entre: edge, chrome, firefox.")
+            options = self._criar_opcoes(headless, servidor, largura, altura)
+            for nome, valor in (capacidades or {}).items():
+                options.set_capability(nome, valor)
+            self.driver = webdriver.Remote(command_executor=url, options=options)
+            self.url_remota = url
+
+            self._backend = BackendSelenium(self)
+            self._registrar_aba_inicial()
+            self._instalar_rastreador()
+            if not servidor:
+                self.driver.maximize_window()
+            self.wait = self._criar_espera(tempo_wait)
+            _navegadores_abertos.add(self) #sem processos locais para registrar, mas fechado ao sair
+            self.tempo_inicializacao = time.perf_counter() - inicio
+            return self.tempo_inicializacao
 
         except Exception as e:
-            print(f"Erro ao iniciar o driver ({self.navegador}): {e}")
+            print(f"Erro ao iniciar o driver remoto ({self.navegador} em {url}): {e}")
             raise
 
-    def abrir_driver_undetected(self, headless: bool = False, tempo_wait: int = 10, caminho_edge_linux: str = '/usr/bin/microsoft-edge'):
+    @_instrumentar
+    def abrir_driver_undetected(self, headless: bool = False, tempo_wait: int = 10, caminho_edge_linux: str = '/usr/bin/microsoft-edge',
+                                intervalo_poll: float = 0.5, usar_cache_binarios: bool = True, perfil: Literal["padrao", "servidor"] = "padrao",
+                                tamanho_janela: tuple = (1920, 1080)):
+        '''
+        Inicializa o driver no modo undetected (Chrome via undetected-chromedriver, Edge via DrissionPage).
+
+        Args:
+            headless (bool): Se True, o navegador será iniciado em modo headless. Padrão é False.
+            tempo_wait (int): Tempo de espera do driver (em segundos). Padrão é 10.
+            caminho_edge_linux (str): Caminho do executável do Edge no Linux. Padrão é '/usr/bin/microsoft-edge'.
+            intervalo_poll (float): Intervalo entre as verificações das esperas (em segundos). Padrão é 0.5.
+            usar_cache_binarios (bool): Se True, reaproveita o chromedriver já corrigido (em ~/.cache/automaweb)
+                em vez de baixá-lo e corrigi-lo a cada abertura. Padrão é True.
+            perfil (str): "padrao" ou "servidor" (ver abrir_driver). Padrão é "padrao".
+            tamanho_janela (tuple): Largura e altura da janela no perfil servidor. Padrão é (1920, 1080).
+
+        Returns:
+            float: O tempo entre o início da abertura e o driver pronto para uso (em segundos), também guardado em self.tempo_inicializacao.
+        '''
+        inicio = time.perf_counter()
+        self._verificar_orfaos()
+        self._parametros_abertura = ("abrir_driver_undetected", {
+            "headless": headless, "tempo_wait": tempo_wait, "caminho_edge_linux": caminho_edge_linux,
+            "intervalo_poll": intervalo_poll, "usar_cache_binarios": usar_cache_binarios, "perfil": perfil,
+            "tamanho_janela": tamanho_janela,
+        })
+        self._acoes_desde_abertura = 0
+        self._intervalo_poll = intervalo_poll
+        self._tempo_wait = tempo_wait
+        servidor = perfil == "servidor"
+        largura, altura = tamanho_janela
         try:
             if self.navegador == "chrome":
-                options = uc.ChromeOptions()
-                
-                #configurações para o Chrome (Undetected)
-                if headless:
-                    options.add_argument('--headless')
-                    options.add_argument("--disable-popup-blocking")
-                options.add_argument("--start-maximized")
-                options.add_argument("--disable-extensions")
+
+                def criar_opcoes():
+                    #o undetected-chromedriver não aceita reaproveitar o mesmo objeto de opções
+                    options = uc.ChromeOptions()
+                    
+                    #configurações para o Chrome (Undetected)
+                    if headless:
+                        options.add_argument('--headless=new')
+                        options.add_argument("--disable-popup-blocking")
+                    if servidor:
+                        for argumento in ARGUMENTOS_SERVIDOR_CHROMIUM:
+                            if argumento not in options.arguments:
+                                options.add_argument(argumento)
+                        options.add_argument(f"--window-size={largura},{altura}")
+                    else:
+                        options.add_argument("--start-maximized")
+                        options.add_argument("--disable-extensions")
+                    return options
                 
-                self.driver = uc.Chrome(options=options)
+                self.driver = self._iniciar_driver_undetected(criar_opcoes, usar_cache_binarios)
+                self.url_remota = None
+                self._backend = BackendUndetected(self)
+                self._registrar_aba_inicial()
             
             elif self.navegador == "edge":
                 options = ChromiumOptions()
@@ -191,22 +797,116 @@ class Navegador:
                 if headless:
                     options.headless()
                     options.set_argument("--disable-popup-blocking")
-                options.set_argument('--start-maximized')
+                if servidor:
+                    for argumento in ARGUMENTOS_SERVIDOR_CHROMIUM:
+                        options.set_argument(argumento)
+                    options.set_argument(f"--window-size={largura},{altura}")
+                else:
+                    options.set_argument('--start-maximized')
                 options.set_argument('--no-first-run')
                 self.driver = ChromiumPage(options)
+                self.url_remota = None
                 self.driver.get_cookies = lambda: self.driver.cookies()
+                #as ações usam a busca, a espera e o clique nativos do DrissionPage (via CDP)
+                self._backend = BackendDrission(self)
+                self._registrar_aba_inicial()
             
+            if self.navegador == "chrome":
+                self._instalar_rastreador()
             if self.navegador in ["chrome", "edge"]:
-                self.wait = WebDriverWait(self.driver, tempo_wait)
+                self.wait = self._criar_espera(tempo_wait)
+                self._registrar_processos()
+                self.tempo_inicializacao = time.perf_counter() - inicio
 
             else:
-                messagebox.showwarning("Aviso", f"O navegador {self.navegador} ainda não tem suporte para o modo undetected.\nAbrindo o modo padrão...")
-                self.abrir_driver()
+                notificar(
+                    logging.WARNING, "Aviso",
+                    f"O navegador {self.navegador} ainda não tem suporte para o modo undetected.\nAbrindo o modo padrão...",
+                    "undetected_nao_suportado", navegador=self.navegador,
+                )
+                self.abrir_driver(headless, tempo_wait, intervalo_poll, usar_cache_binarios, perfil, tamanho_janela)
+            return self.tempo_inicializacao
 
         except Exception as e:
             print(f"Erro ao iniciar o driver: {e}")
             raise
 
+    def _iniciar_driver_selenium(self, options, usar_cache: bool = True):
+
+        '''função interna que inicia o driver do selenium reaproveitando os binários guardados no cache'''
+        classe_driver, classe_servico = {
+            "chrome": (webdriver.Chrome, ChromeService),
+            "edge": (webdriver.Edge, EdgeService),
+            "firefox": (webdriver.Firefox, FirefoxService),
+        }[self.navegador]
+        #o driver roda no seu próprio grupo de processos (encerrado de uma vez em fechar_driver)
+        if not usar_cache:
+            return classe_driver(options=options, service=classe_servico(popen_kw=dict(POPEN_NOVA_SESSAO)))
+
+        cache = CacheBinarios()
+        localizacao_original = options.binary_location
+        chave = f"{self.navegador}:{localizacao_original or 'padrao'}"
+        for tentativa in range(2):
+            entrada = cache.obter(chave)
+            if entrada is None:
+                try:
+                    caminhos = resolver_com_selenium_manager(options)
+                except Exception as e:
+                    print(f"Não foi possível resolver os binários para o cache ({e}). Usando a resolução padrão do selenium.")
+                    return classe_driver(options=options, service=classe_servico(popen_kw=dict(POPEN_NOVA_SESSAO)))
+                entrada = cache.salvar(chave, caminhos["driver_path"], caminhos.get("browser_path") or None)
+
+            options.binary_location = entrada["navegador"] or localizacao_original
+            try:
+                servico = classe_servico(executable_path=entrada["driver"], popen_kw=dict(POPEN_NOVA_SESSAO))
+                driver = classe_driver(options=options, service=servico)
+            except SessionNotCreatedException:
+                #driver e navegador de versões diferentes: descarta a entrada e resolve de novo
+                cache.invalidar(chave)
+                options.binary_location = localizacao_original
+                if tentativa:
+                    raise
+                continue
+
+            versao = driver.capabilities.get("browserVersion")
+            if versao != entrada.get("versao"):
+                cache.atualizar(chave, versao=versao)
+            return driver
+
+    def _iniciar_driver_undetected(self, criar_opcoes, usar_cache: bool = True):
+
+        '''função interna que inicia o undetected-chromedriver reaproveitando o chromedriver já corrigido'''
+        if not usar_cache:
+            return uc.Chrome(options=criar_opcoes())
+
+        cache = CacheBinarios()
+        entrada = cache.obter("undetected-chrome")
+        if entrada is not None:
+            try:
+                return uc.Chrome(
+                    options=criar_opcoes(),
+                    driver_executable_path=entrada["driver"],
+                    browser_executable_path=entrada["navegador"],
+                    version_main=entrada.get("versao_principal"),
+                )
+            except SessionNotCreatedException:
+                cache.invalidar("undetected-chrome")
+
+        #primeira abertura (ou navegador atualizado): deixa o undetected-chromedriver baixar e corrigir o driver
+        driver = uc.Chrome(options=criar_opcoes())
+        try:
+            corrigido = cache.guardar_driver_corrigido(
+                driver.patcher.executable_path, f"automaweb_{os.path.basename(driver.patcher.executable_path)}"
+            )
+            versao = driver.capabilities.get("browserVersion", "")
+            cache.salvar(
+                "undetected-chrome", corrigido, driver.options.binary_location,
+                versao=versao, versao_principal=int(versao.split(".")[0]) if versao else None,
+            )
+        except Exception as e:
+            print(f"Não foi possível guardar o chromedriver corrigido no cache: {e}")
+        return driver
+
     @_verifica_driver
     def abrir_url(self, url: str):
 
@@ -217,61 +917,377 @@ class Navegador:
             url (str): A URL que deseja abrir no navegador.
         '''
         try:
-            self.driver.get(url)
+            self._backend.abrir(url)
+            self._esquecer_frames()
         except Exception as e:
             print(f"Erro ao abrir URL: {e}")
             raise
     
+    def _registrar_aba_inicial(self):
+
+        '''função interna que inicia o registro de abas com a aba aberta junto com o driver (nome "principal")'''
+        self._aba_atual = self._backend.aba_atual()
+        self._ordem_abas = [self._aba_atual]
+        self._abas = {"principal": self._aba_atual}
+
+    def _sincronizar_abas(self):
+
+        '''função interna que atualiza o registro com as abas que realmente existem (ex: abas abertas pela página ou fechadas)'''
+        existentes = self._backend.abas()
+        self._ordem_abas = [handle for handle in self._ordem_abas if handle in existentes]
+        self._ordem_abas += [handle for handle in existentes if handle not in self._ordem_abas]
+        self._abas = {nome: handle for nome, handle in self._abas.items() if handle in existentes}
+        if self._aba_atual not in existentes:
+            self._aba_atual = None
+
+    def _handle_aba(self, aba):
+
+        '''função interna que converte um nome, índice ou handle no handle da aba'''
+        if isinstance(aba, int):
+            if not -len(self._ordem_abas) <= aba < len(self._ordem_abas):
+                self._sincronizar_abas() #pode haver abas abertas pela própria página
+            return self._ordem_abas[aba]
+        if aba in self._abas:
+            return self._abas[aba]
+        if aba in self._ordem_abas:
+            return aba
+        raise KeyError(f"Aba '{aba}' não encontrada. Abas com nome: {', '.join(self._abas) or 'nenhuma'}.")
+
+    def _focar_aba(self, handle: str):
+
+        '''função interna que troca para a aba (sem comando algum se ela já estiver em foco)'''
+        if handle == self._aba_atual:
+            return
+        self._backend.focar_aba(handle)
+        self._aba_atual = handle
+        self._esquecer_frames()
+
+    def _nova_aba(self, nome: str = None):
+
+        '''função interna que abre uma aba em branco, registra e foca nela, devolvendo o handle'''
+        handle = self._backend.nova_aba()
+        self._ordem_abas.append(handle)
+        if nome is not None:
+            self._abas[nome] = handle
+        self._focar_aba(handle)
+        return handle
+
     @_verifica_driver
-    def abrir_nova_aba(self, url: str):
+    def abrir_nova_aba(self, url: str, nome: str = None, aguardar_carregamento: bool = True):
 
         '''
         Abre uma nova aba e foca nela automaticamente.
         
         Args:
             url (str): A URL que deseja abrir na nova aba.
+            nome (str, opcional): Um nome para voltar à aba depois (alternar_aba("nome"), fechar_aba("nome")).
+            aguardar_carregamento (bool): Se False, inicia o carregamento e retorna na hora (a página continua
+                carregando enquanto o robô trabalha em outra aba). Padrão é True.
+
+        Returns:
+            str: O handle da nova aba.
         '''
         try:
-            # 'tab' abre uma aba. 'window' abriria uma nova janela separada.
-            self.driver.switch_to.new_window('tab') 
-            self.driver.get(url)
+            handle = self._nova_aba(nome)
+            if aguardar_carregamento:
+                self._backend.abrir(url)
+            else:
+                self._executar_script("window.location.href = arguments[0];", url)
+            return handle
         except Exception as e:
             print(f"Erro ao abrir nova aba: {e}")
             raise
     
     @_verifica_driver
-    def alternar_aba(self, indice: int):
+    def alternar_aba(self, aba):
 
         '''
-        Muda o foco para a aba especificada pelo índice (0 é a primeira, 1 é a segunda...).
+        Muda o foco para a aba especificada pelo nome ou pelo índice (0 é a primeira, 1 é a segunda...).
+        Os handles ficam guardados, então a troca custa um único comando (ou nenhum, se a aba já estiver em foco).
         
         Args:
-            indice (int): O índice da aba para a qual deseja alternar.
+            aba (str | int): O nome dado em abrir_nova_aba ou o índice da aba na ordem de abertura.
         '''
         try:
-            abas = self.driver.window_handles
-            self.driver.switch_to.window(abas[indice])
+            handle = self._handle_aba(aba)
+            try:
+                self._focar_aba(handle)
+            except NoSuchWindowException:
+                #a aba foi fechada por fora (ex: pela própria página): atualiza o registro e tenta de novo
+                self._sincronizar_abas()
+                self._focar_aba(self._handle_aba(aba))
         except Exception as e:
-            print(f"Erro ao mudar para a aba {indice}: {e}")
+            print(f"Erro ao mudar para a aba {aba}: {e}")
             raise
 
     @_verifica_driver  
-    def fechar_aba(self):
+    def fechar_aba(self, aba=None):
     
         '''
-        Fecha a aba atual e volta o foco para a aba anterior (se houver).
+        Fecha uma aba. Se for a aba atual, o foco volta para a última aba aberta (se houver);
+        se for outra aba, o foco continua na aba atual.
+        
+        Args:
+            aba (str | int, opcional): O nome ou o índice da aba. Padrão é a aba atual.
         '''  
         try:
-            # .close() fecha SÓ a aba atual (diferente de .quit() que fecha tudo)
-            self.driver.close()
+            atual = self._aba_atual
+            handle = atual if aba is None else self._handle_aba(aba)
+            self._focar_aba(handle)
+            self._backend.fechar_aba(handle)
+            self._aba_atual = None
+            self._ordem_abas = [h for h in self._ordem_abas if h != handle]
+            self._abas = {nome: h for nome, h in self._abas.items() if h != handle}
             
-            #boa prática: voltar o foco para a última aba aberta para não ficar "sem foco"
-            if len(self.driver.window_handles) > 0:
-                self.driver.switch_to.window(self.driver.window_handles[-1])
+            #boa prática: voltar o foco para uma aba aberta para não ficar "sem foco"
+            if atual is not None and atual != handle:
+                self._focar_aba(atual)
+            elif self._ordem_abas:
+                self._focar_aba(self._ordem_abas[-1])
+            self._esquecer_frames()
         except Exception as e:
             print(f"Erro ao fechar aba: {e}")
             raise
 
+    @property
+    def abas(self):
+
+        '''as abas com nome ({nome: handle})'''
+        return dict(self._abas)
+
+    @_verifica_driver
+    def processar_em_abas(self, urls, funcao, quantidade_abas: int = 4, timeout: float = 60, parar_em_erro: bool = True):
+
+        '''
+        Abre as URLs em várias abas ao mesmo tempo e executa a função em cada página assim que ela termina de carregar.
+        Enquanto o robô trabalha numa aba, as outras continuam carregando em paralelo.
+        É um gerador: devolve (url, resultado) na ordem em que as páginas ficam prontas.
+        
+        Args:
+            urls (iterable): As URLs a processar.
+            funcao (callable): Função chamada com (navegador, url) com o foco na aba já carregada. Ex: lambda nav, url: nav.obter_texto("//h1").
+            quantidade_abas (int): Quantas abas carregar ao mesmo tempo. Padrão é 4.
+            timeout (float): Tempo máximo de carregamento de cada URL (em segundos). Padrão é 60.
+            parar_em_erro (bool): Se False, um erro (na função ou no carregamento) é devolvido como resultado
+                em vez de interromper o lote. Padrão é True.
+        '''
+        pendentes = iter(urls)
+        original = self._aba_atual
+        trabalhadoras = {} #handle -> (url, início do carregamento)
+
+        def carregar(handle):
+            #inicia o carregamento da próxima URL nesta aba sem esperar (marca o documento antigo para saber quando o novo chegou)
+            url = next(pendentes, None)
+            if url is None:
+                trabalhadoras.pop(handle, None)
+                self._focar_aba(handle)
+                self._backend.fechar_aba(handle)
+                self._aba_atual = None
+                self._ordem_abas.remove(handle)
+                return
+            self._focar_aba(handle)
+            self._iniciar_carregamento(url)
+            trabalhadoras[handle] = (url, time.monotonic())
+
+        try:
+            for _ in range(max(quantidade_abas, 1)):
+                handle = self._nova_aba()
+                trabalhadoras[handle] = None
+                carregar(handle)
+                if handle not in trabalhadoras:
+                    break
+
+            while trabalhadoras:
+                alguma_pronta = False
+                for handle, (url, inicio) in list(trabalhadoras.items()):
+                    self._focar_aba(handle)
+                    pronta = self._pagina_carregada()
+                    if not pronta and time.monotonic() - inicio < timeout:
+                        continue
+                    alguma_pronta = True
+                    try:
+                        if not pronta:
+                            raise TimeoutException(f"A página não carregou em {timeout} segundos: {url}")
+                        resultado = funcao(self, url)
+                    except Exception as e:
+                        if parar_em_erro:
+                            raise
+                        resultado = e
+                    yield url, resultado
+                    carregar(handle)
+                if not alguma_pronta:
+                    time.sleep(self._intervalo_poll)
+        finally:
+            #fecha as abas de trabalho que sobraram e volta para a aba de origem
+            for handle in list(trabalhadoras):
+                try:
+                    self._focar_aba(handle)
+                    self._backend.fechar_aba(handle)
+                except Exception:
+                    pass
+                self._aba_atual = None
+                self._ordem_abas = [h for h in self._ordem_abas if h != handle]
+            if original is not None:
+                self._focar_aba(original)
+
+    def _iniciar_carregamento(self, url: str):
+
+        '''função interna que inicia o carregamento da URL na aba atual sem esperar (marca o documento antigo para saber quando o novo chegou)'''
+        self._executar_script("window.__automaweb_antigo = true; window.location.href = arguments[0];", url)
+
+    def _pagina_carregada(self):
+
+        '''função interna que informa se o documento iniciado por _iniciar_carregamento já substituiu o antigo e terminou de carregar'''
+        return self._executar_script("return !window.__automaweb_antigo && document.readyState === 'complete';")
+
+    def _estado_proxima(self, xpath: str):
+
+        '''função interna que informa se o botão/link de próxima página está disponível e devolve o seu href (se for um link para outra página)'''
+        try:
+            elemento = self._backend.encontrar(xpath)
+        except NoSuchElementException:
+            return False, None
+        classes = (self._backend.atributo(elemento, "class") or "").split()
+        if (not self._backend.visivel(elemento) or not self._backend.habilitado(elemento) or "disabled" in classes
+                or self._backend.atributo(elemento, "aria-disabled") == "true"):
+            return False, None
+        href = self._backend.atributo(elemento, "href") or ""
+        atual = self._executar_script("return location.href;")
+        #links "#" ou "javascript:" não levam a outra página: a próxima página só é obtida clicando
+        if not href.startswith(("http://", "https://")) or href.split("#")[0] == atual.split("#")[0]:
+            return True, None
+        return True, href
+
+    def paginar(self, extrair, proxima: str = None, url_modelo: str = None, primeira_pagina: int = 1, max_paginas: int = None,
+                aguardar_sumir: str = None, pre_carregar: bool = True, timeout: float = 60, **opcoes):
+
+        '''
+        Percorre uma listagem paginada e devolve as linhas de todas as páginas, uma a uma (é um gerador).
+        Enquanto a página atual é extraída, a próxima já carrega numa segunda aba, então o robô não fica parado esperando.
+        
+        A próxima página é obtida pela url_modelo ou pelo botão/link "próxima". Se o botão for um link para outra página (href),
+        ela é pré-carregada na segunda aba; se for um botão de script, ele é clicado e a função aguarda as linhas mudarem.
+        A última página é detectada quando o botão some ou fica desabilitado, quando a página não tem linhas,
+        quando ela repete as linhas da anterior ou ao atingir max_paginas.
+        Ao final, a aba em que a última página foi carregada fica em foco (no lugar e com o nome da aba original).
+        
+        Args:
+            extrair (callable): Função chamada com o navegador (com o foco na página carregada) que devolve as linhas da página.
+                Ex: lambda nav: [el.text for el in nav.encontrar_elementos("//table//tr")].
+            proxima (str, opcional): O XPath do botão/link de próxima página (a primeira página é a que já está aberta).
+            url_modelo (str, opcional): O modelo da URL de cada página, com {pagina} no lugar do número.
+                Ex: "https://site.com/busca?pagina={pagina}". Use proxima ou url_modelo, não os dois.
+            primeira_pagina (int): O número da primeira página na url_modelo. Padrão é 1.
+            max_paginas (int, opcional): Quantas páginas ler no máximo.
+            aguardar_sumir (str, opcional): O XPath de um indicador de carregamento (spinner) que deve sumir antes de extrair.
+            pre_carregar (bool): Se False, carrega as páginas uma a uma na mesma aba. Padrão é True.
+            timeout (float): Tempo máximo de carregamento de cada página (em segundos). Padrão é 60.
+            **opcoes: As opções aceitas por todas as ações (ex: frame=[...]).
+
+        Raises:
+            ValueError: Se nenhum ou os dois entre proxima e url_modelo forem informados (na chamada, antes de percorrer).
+        '''
+        if (proxima is None) == (url_modelo is None):
+            raise ValueError("Informe proxima (XPath do botão) ou url_modelo (ex: '...?pagina={pagina}'), apenas um dos dois.")
+        #validado aqui, fora do gerador: o erro aparece na chamada, antes de a ação obter a trava e suspender a reciclagem
+        return self._paginar(extrair, proxima, url_modelo, primeira_pagina, max_paginas, aguardar_sumir, pre_carregar, timeout, **opcoes)
+
+    def _gerar_paginas(self, extrair, proxima, url_modelo, primeira_pagina, max_paginas, aguardar_sumir, pre_carregar, timeout):
+
+        '''função interna que percorre as páginas (o gerador de paginar, com os argumentos já validados)'''
+        original = atual = self._aba_atual
+        auxiliar = None #segunda aba, onde a próxima página é pré-carregada
+        espera = self._criar_espera(timeout)
+
+        def aguardar_pagina(url):
+            if url is not None:
+                espera.until(lambda _: self._pagina_carregada(), f"A página não carregou em {timeout} segundos: {url}")
+            if aguardar_sumir is not None:
+                self._backend.aguardar(aguardar_sumir, "invisivel", timeout)
+
+        try:
+            pagina = primeira_pagina
+            if url_modelo is not None:
+                url = url_modelo.format(pagina=pagina)
+                self._iniciar_carregamento(url)
+                aguardar_pagina(url)
+            else:
+                aguardar_pagina(None)
+            anteriores = None
+            linhas = None
+            lidas = 0
+            while True:
+                #descobre a próxima página e começa a carregá-la antes de extrair a atual
+                ultima = max_paginas is not None and lidas + 1 >= max_paginas
+                existe_proxima, url_seguinte = True, None
+                if url_modelo is not None:
+                    url_seguinte = url_modelo.format(pagina=pagina + 1)
+                else:
+                    existe_proxima, url_seguinte = self._estado_proxima(proxima)
+                pre_carregada = pre_carregar and not ultima and existe_proxima and url_seguinte is not None
+                if pre_carregada:
+                    if auxiliar is None:
+                        auxiliar = self._nova_aba()
+                    self._focar_aba(auxiliar)
+                    self._iniciar_carregamento(url_seguinte)
+                    self._focar_aba(atual)
+
+                if linhas is None:
+                    linhas = list(extrair(self))
+                if not linhas or linhas == anteriores:
+                    return #página vazia ou repetida (sites que devolvem a última página para números maiores)
+                yield from linhas
+                lidas += 1
+                if ultima or not existe_proxima:
+                    return
+
+                anteriores, linhas = linhas, None
+                pagina += 1
+                if pre_carregada:
+                    atual, auxiliar = auxiliar, atual
+                    self._focar_aba(atual)
+                    aguardar_pagina(url_seguinte)
+                elif url_seguinte is not None:
+                    self._iniciar_carregamento(url_seguinte)
+                    aguardar_pagina(url_seguinte)
+                else:
+                    #botão de script: clica e espera as linhas mudarem (se não mudarem, era a última página)
+                    self._backend.clicar(self._backend.aguardar(proxima, "clicavel", timeout))
+                    aguardar_pagina(None)
+                    limite = time.monotonic() + timeout
+                    while True:
+                        try:
+                            novas = list(extrair(self))
+                        except Exception:
+                            novas = anteriores #a página ainda está trocando o conteúdo
+                        if novas != anteriores or time.monotonic() >= limite:
+                            linhas = novas
+                            break
+                        time.sleep(self._intervalo_poll)
+        finally:
+            #fecha a segunda aba; se a última página ficou nela, ela assume o lugar (e o nome) da aba original
+            if auxiliar is not None:
+                try:
+                    self._focar_aba(auxiliar)
+                    self._backend.fechar_aba(auxiliar)
+                except Exception:
+                    pass
+                self._aba_atual = None
+                if auxiliar == original:
+                    self._ordem_abas = [atual if h == original else h for h in self._ordem_abas if h != atual]
+                    self._abas = {nome: (atual if h == original else h) for nome, h in self._abas.items()}
+                else:
+                    self._ordem_abas = [h for h in self._ordem_abas if h != auxiliar]
+                try:
+                    self._focar_aba(atual)
+                except Exception:
+                    pass
+
+    #a ação é registrada (métricas, rastreamento e mensagens) com o nome público
+    _gerar_paginas.__name__ = "paginar"
+    _paginar = _verifica_driver(_gerar_paginas)
+    del _gerar_paginas
+
     @_verifica_driver
     def recarregar_driver(self):
         
@@ -279,25 +1295,98 @@ class Navegador:
         Recarrega (atualiza) a página atual (F5).
         '''
         try:
-            self.driver.refresh()
+            self._backend.recarregar()
+            self._esquecer_frames()
         except Exception as e:
             print(f"Erro ao recarregar a página: {e}")
             raise
 
     @_verifica_driver
-    def fechar_driver(self):
+    def fechar_driver(self, tempo_limite: float = 10):
 
         '''
         Fecha o navegador e encerra a sessão do driver.
+        Se o navegador travar e o quit() não terminar dentro do tempo limite, o driver e o navegador
+        (o grupo de processos inteiro) são encerrados com SIGTERM e, se preciso, SIGKILL.
+        
+        Args:
+            tempo_limite (float): Quanto tempo aguardar o quit() (em segundos). Padrão é 10.
         ''' 
         try:
-            self.driver.quit()
+            self.aguardar_screenshots() #não perde screenshots ainda na fila de gravação
+            if self._gravador_tela is not None:
+                self._gravador_tela.parar()
+                self._gravador_tela.sessao.fechar()
+            if self._sessao_http is not None:
+                self._sessao_http.fechar()
+            for captura in self._capturas:
+                captura.parar()
+            self._capturas = []
+            self._encerrar_driver(tempo_limite)
         except Exception as e:
             print(f"Erro ao fechar o driver: {e}")
             raise
 
+    def _encerrar_driver(self, tempo_limite: float):
+
+        '''função interna que chama o quit() com tempo limite e encerra os processos que sobraram (inclusive os de um quit() travado)'''
+        chave = str(id(self))
+        #a árvore é lida antes do quit(): depois dele os processos órfãos perdem o vínculo com o driver
+        pids = registro_processos.pids(chave)
+        conhecidos = {pid for pid, _ in pids}
+        pids += [(pid, None) for pid in _arvore_processos(self._pids_raiz()) if pid not in conhecidos]
+        erros = []
+
+        def sair():
+            try:
+                self.driver.quit()
+            except Exception as e:
+                erros.append(e)
+
+        inicio = time.perf_counter()
+        encerramento = threading.Thread(target=sair, name="automaweb-quit", daemon=True)
+        encerramento.start()
+        encerramento.join(tempo_limite)
+        travado = encerramento.is_alive()
+        forcados = encerrar_processos(pids, espera=3 if travado else 1)
+        if travado or forcados:
+            registro.warning(
+                f"O navegador não fechou normalmente e foi encerrado à força ({forcados} processos com SIGKILL).",
+                extra={"evento": "fechamento_forcado", "dados": {"quit_travado": travado, "processos_sigkill": forcados,
+                                                                  "duracao_s": time.perf_counter() - inicio}},
+            )
+        registro_processos.remover(chave)
+        _navegadores_abertos.discard(self)
+        if erros and not travado:
+            raise erros[0]
+
+    def _registrar_processos(self):
+
+        '''função interna que registra (em memória e em disco) os processos do driver e do navegador recém-abertos'''
+        try:
+            registro_processos.registrar(str(id(self)), _arvore_processos(self._pids_raiz()) or self._pids_raiz())
+        except Exception as e:
+            print(f"Não foi possível registrar os processos do navegador: {e}")
+        _navegadores_abertos.add(self)
+
+    @staticmethod
+    def _verificar_orfaos():
+
+        '''função interna que, na primeira abertura do processo, encerra os navegadores órfãos de execuções anteriores'''
+        global _orfaos_verificados
+        if _orfaos_verificados:
+            return
+        _orfaos_verificados = True
+        encerrados = limpar_processos_orfaos()
+        if encerrados:
+            registro.info(
+                f"{encerrados} processos órfãos de execuções anteriores foram encerrados.",
+                extra={"evento": "orfaos_encerrados", "dados": {"processos": encerrados}},
+            )
+
 ### INTERAÇÕES COM A PÁGINA
 
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def clicar(self, xpath: str):
     
@@ -309,11 +1398,12 @@ class Navegador:
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath))) #aguardar ser clicável
-            elemento.click()
+            elemento = self._backend.aguardar(xpath, "clicavel") #aguardar ser clicável
+            self._backend.clicar(elemento)
         except:
             raise
 
+    @_verifica_driver
     def clicar_forcado(self, xpath: str):
         '''
         Clica em um elemento identificado pelo xpath sem verificar se ele é clicável.
@@ -324,13 +1414,14 @@ class Navegador:
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.presence_of_element_located(By.XPATH, xpath))
-            elemento.click()
+            elemento = self._backend.aguardar(xpath, "presente")
+            self._backend.clicar(elemento)
         except:
             raise
 
+    @_verifica_driver
     @_repetir_por_interceptacao()
-    def digitar(self, xpath: str, texto: str):
+    def digitar(self, xpath: str, texto: str, modo: Literal["auto", "teclas", "inserir", "script"] = "auto", verificar: bool = False):
         
         '''
         Digita um texto em um elemento identificado pelo xpath.
@@ -338,15 +1429,25 @@ class Navegador:
         Args:
             xpath (str): O XPath do elemento que deseja digitar.
             texto (str): O texto que deseja digitar no elemento.
+            modo (str): Como o texto é digitado. Padrão é "auto".
+                "teclas": um evento de tecla por caractere (send_keys), como um usuário digitando.
+                "inserir": o texto inteiro de uma vez (Input.insertText no Chrome/Edge, script no Firefox),
+                    bem mais rápido em textos longos e sem perder caracteres.
+                "script": altera o valor pelo setter nativo e dispara os eventos input e change.
+                "auto": "teclas" até limite_teclas caracteres (ou se o texto tiver teclas especiais, ex: Keys.ENTER),
+                    "inserir" acima disso (ou se o texto tiver caracteres fora do BMP, como emojis).
+            verificar (bool): Se True, confere o valor do campo depois de digitar. Se estiver diferente, o valor é
+                corrigido via script e, se ainda assim não bater, levanta TextoDigitadoErro. Padrão é False.
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath))) #aguardar ser clicável
-            elemento.send_keys(texto)
+            elemento = self._backend.aguardar(xpath, "clicavel") #aguardar ser clicável
+            self._digitar_elemento(elemento, texto, modo, verificar, xpath)
         except:
             raise
 
-    def digitar_forcado(self, xpath: str, texto: str):
+    @_verifica_driver
+    def digitar_forcado(self, xpath: str, texto: str, modo: Literal["auto", "teclas", "inserir", "script"] = "auto", verificar: bool = False):
 
         '''
         Digita um texto em um elemento identificado pelo xpath sem verificar se ele é clicável.
@@ -355,14 +1456,60 @@ class Navegador:
         Args:
             xpath (str): O XPath do elemento que deseja digitar.
             texto (str): O texto que deseja digitar no elemento.
+            modo (str): "auto", "teclas", "inserir" ou "script" (ver digitar). Padrão é "auto".
+            verificar (bool): Se True, confere (e corrige) o valor do campo depois de digitar (ver digitar). Padrão é False.
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            elemento.send_keys(texto)
+            elemento = self._backend.aguardar(xpath, "presente")
+            self._digitar_elemento(elemento, texto, modo, verificar, xpath)
         except:
             raise
+
+    def _escolher_modo_digitacao(self, texto: str):
+
+        '''função interna que escolhe entre digitar tecla a tecla ou inserir o texto de uma vez (modo "auto")'''
+        if any("\ue000" <= caractere <= "\uf8ff" for caractere in texto): #teclas especiais do selenium (Keys)
+            return "teclas"
+        if len(texto) >= self.limite_teclas or any(ord(caractere) > 0xFFFF for caractere in texto):
+            return "inserir" #o chromedriver não envia caracteres fora do BMP por send_keys
+        return "teclas"
+
+    def _digitar_elemento(self, elemento, texto: str, modo: str = "auto", verificar: bool = False, xpath: str = None):
+
+        '''função interna que digita o texto no elemento já localizado, no modo pedido, e opcionalmente confere o resultado'''
+        if modo not in ("auto", "teclas", "inserir", "script"):
+            raise ValueError(f"Modo de digitação '{modo}' inválido. Use 'auto', 'teclas', 'inserir' ou 'script'.")
+        if modo == "auto":
+            modo = self._escolher_modo_digitacao(texto)
+        anterior = self._backend.atributo(elemento, "value") if verificar else None
+
+        inicio = time.perf_counter()
+        if modo == "teclas":
+            self._backend.digitar(elemento, texto)
+        elif modo == "inserir":
+            self._backend.inserir(elemento, texto)
+        else:
+            self._backend.preencher(elemento, texto)
+        registro.debug(
+            f"Texto de {len(texto)} caracteres digitado (modo {modo}).",
+            extra={"evento": "digitacao", "dados": {"modo": modo, "caracteres": len(texto), "duracao_s": time.perf_counter() - inicio}},
+        )
+
+        if not verificar or anterior is None: #campos sem value (ex: contenteditable) não são conferidos
+            return
+        esperado = anterior + texto
+        obtido = self._backend.atributo(elemento, "value")
+        if obtido == esperado:
+            return
+        #caracteres perdidos (ou o campo reformatou o texto): tenta gravar o valor completo de uma vez
+        print(f"O campo ficou com {len(obtido or '')} de {len(esperado)} caracteres. Corrigindo o valor via script...")
+        self._backend.preencher(elemento, esperado, substituir=True)
+        obtido = self._backend.atributo(elemento, "value")
+        if obtido != esperado:
+            raise TextoDigitadoErro(esperado, obtido, xpath)
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def limpar(self, xpath: str):
 
@@ -374,11 +1521,12 @@ class Navegador:
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath))) #aguardar ser clicável
-            elemento.clear()
+            elemento = self._backend.aguardar(xpath, "clicavel") #aguardar ser clicável
+            self._backend.limpar(elemento)
         except:
             raise
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def passar_mouse(self, xpath: str):
         
@@ -390,12 +1538,12 @@ class Navegador:
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath))) #aguardar ser clicável
-            actions = ActionChains(self.driver)
-            actions.move_to_element(elemento).perform()
+            elemento = self._backend.aguardar(xpath, "clicavel") #aguardar ser clicável
+            self._backend.passar_mouse(elemento)
         except:
             raise
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def selecionar_texto(self, xpath: str, texto: str):
 
@@ -408,12 +1556,12 @@ class Navegador:
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-
-            Select(elemento).select_by_visible_text(texto)
+            elemento = self._backend.aguardar(xpath, "clicavel")
+            self._backend.selecionar_texto(elemento, texto)
         except:
             raise
 
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def selecionar_valor(self, xpath: str, valor: int):
 
@@ -426,11 +1574,12 @@ class Navegador:
         '''
         self._aplicar_stun()
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-            Select(elemento).select_by_value(valor)
+            elemento = self._backend.aguardar(xpath, "clicavel")
+            self._backend.selecionar_valor(elemento, valor)
         except:
             raise
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def obter_texto(self, xpath: str):
 
@@ -444,11 +1593,12 @@ class Navegador:
             str: O texto do elemento.
         '''
         try:
-            elemento = self.wait.until(EC.visibility_of_element_located((By.XPATH, xpath)))
-            return elemento.text
+            elemento = self._backend.aguardar(xpath, "visivel")
+            return self._backend.texto(elemento)
         except:
             raise
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def obter_atributo(self, xpath: str, atributo: str):
 
@@ -463,11 +1613,12 @@ class Navegador:
             str: O valor do atributo do elemento.
         '''
         try:
-            elemento = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            return elemento.get_attribute(atributo)
+            elemento = self._backend.aguardar(xpath, "presente")
+            return self._backend.atributo(elemento, atributo)
         except:
             raise
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def rolar_ate_elemento(self, xpath: str):
         
@@ -478,11 +1629,12 @@ class Navegador:
             xpath (str): O XPath do elemento até o qual deseja rolar a tela.
         '''
         try:
-            elemento = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", elemento)
+            elemento = self._backend.aguardar(xpath, "presente")
+            self._backend.rolar_ate(elemento)
         except:
             raise
 
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def aguardar_elemento_sumir(self, xpath: str):
         
@@ -493,10 +1645,11 @@ class Navegador:
             xpath (str): O XPath do elemento que deseja aguardar sumir.
         '''
         try:
-            self.wait.until(EC.invisibility_of_element_located((By.XPATH, xpath)))
+            self._backend.aguardar(xpath, "invisivel")
         except:
             raise
     
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def encontrar_elemento(self, xpath: str):
         
@@ -510,10 +1663,11 @@ class Navegador:
             WebElement: O primeiro elemento encontrado.
         '''
         try:
-            return self.driver.find_element(By.XPATH, xpath)
+            return self._backend.encontrar(xpath)
         except:
             raise
 
+    @_verifica_driver
     @_repetir_por_interceptacao()
     def encontrar_elementos(self, xpath: str):
         
@@ -527,25 +1681,359 @@ class Navegador:
             list: Uma lista com todos os elementos encontrados.
         '''
         try:
-            return self.wait.until(EC.presence_of_all_elements_located((By.XPATH, xpath)))
+            return self._backend.aguardar(xpath, "todos")
         except:
             raise
 
-    def tirar_screenshot(self, nome_arquivo: str = datetime.datetime.now().strftime("screenshot_%Y%m%d_%H%M%S")):
-        
+    @_verifica_driver
+    def capturar_screenshot(self, formato: Literal["png", "jpeg", "webp"] = "png", qualidade: int = None, xpath: str = None, pagina_inteira: bool = False):
+
+        '''
+        Captura a tela atual e devolve a imagem em memória, sem gravar nada em disco.
+        No Chrome/Edge usa o CDP (Page.captureScreenshot), que aceita JPEG/WebP com compressão.
+        
+        Args:
+            formato (str): Formato da imagem (png, jpeg ou webp). Padrão é "png". O Firefox só aceita png.
+            qualidade (int, opcional): Qualidade de 0 a 100 (apenas para jpeg e webp).
+            xpath (str, opcional): Se fornecido, recorta apenas a área do elemento.
+            pagina_inteira (bool): Se True, captura a página inteira (além da área visível). Padrão é False.
+
+        Returns:
+            bytes: O conteúdo da imagem.
+        '''
+        try:
+            return base64.b64decode(self._capturar_screenshot_base64(formato, qualidade, xpath, pagina_inteira))
+        except Exception as e:
+            print(f"Erro ao capturar screenshot: {e}")
+            raise
+
+    def _capturar_screenshot_base64(self, formato, qualidade, xpath, pagina_inteira):
+
+        '''função interna que captura a tela e devolve a imagem ainda codificada em base64'''
+        if formato not in ("png", "jpeg", "webp"):
+            raise ValueError(f"Formato '{formato}' não suportado. Escolha entre: png, jpeg, webp.")
+
+        #firefox não tem CDP: usa os métodos nativos do selenium (apenas png)
+        if self.navegador == "firefox":
+            if formato != "png":
+                raise ValueError("O Firefox só suporta screenshots no formato png.")
+            if xpath:
+                elemento = self._backend.aguardar(xpath, "presente")
+                return elemento.screenshot_as_base64
+            if pagina_inteira:
+                return self.driver.get_full_page_screenshot_as_base64()
+            return self.driver.get_screenshot_as_base64()
+
+        parametros = {"format": formato, "fromSurface": True}
+        if qualidade is not None and formato != "png":
+            parametros["quality"] = int(qualidade)
+
+        if xpath:
+            #rola até o elemento e obtém sua posição absoluta na página
+            script = """
+                const el = arguments[1] ? document.querySelector(arguments[1])
+                    : document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                if (!el) return null;
+                el.scrollIntoView({block: 'nearest', inline: 'nearest'});
+                const r = el.getBoundingClientRect();
+                return [r.left + window.scrollX, r.top + window.scrollY, r.width, r.height];
+            """
+            css = seletor_css(compilar_localizador(xpath, self.compilar_xpath))
+            x, y, largura, altura = self.wait.until(lambda _: self._executar_script(script, xpath, css))
+            parametros["clip"] = {"x": x, "y": y, "width": largura, "height": altura, "scale": 1}
+            parametros["captureBeyondViewport"] = True
+
+        elif pagina_inteira:
+            metricas = self._executar_cdp("Page.getLayoutMetrics")
+            tamanho = metricas.get("cssContentSize") or metricas["contentSize"]
+            parametros["clip"] = {"x": 0, "y": 0, "width": tamanho["width"], "height": tamanho["height"], "scale": 1}
+            parametros["captureBeyondViewport"] = True
+
+        return self._executar_cdp("Page.captureScreenshot", parametros)["data"]
+
+    @_verifica_driver
+    def tirar_screenshot(self, nome_arquivo: str = None, pasta: str = None, formato: Literal["png", "jpeg", "webp"] = "png", qualidade: int = None,
+                         xpath: str = None, pagina_inteira: bool = False, segundo_plano: bool = False):
+        
+        '''
+        Salva uma imagem da tela atual na pasta Downloads.
+        
+        Args:
+            nome_arquivo (str, opcional): O nome do arquivo para salvar a screenshot (sem extensão). Padrão é "screenshot_YYYYMMDD_HHMMSS_ffffff", gerado a cada chamada para evitar sobrescritas.
+            pasta (str, opcional): A pasta onde a imagem será salva. Padrão é a pasta Downloads.
+            formato (str): Formato da imagem (png, jpeg ou webp). Padrão é "png".
+            qualidade (int, opcional): Qualidade de 0 a 100 (apenas para jpeg e webp).
+            xpath (str, opcional): Se fornecido, salva apenas a área do elemento.
+            pagina_inteira (bool): Se True, captura a página inteira. Padrão é False.
+            segundo_plano (bool): Se True, a decodificação e a gravação em disco são feitas numa thread separada
+                e o método retorna imediatamente. Use aguardar_screenshots() para garantir que tudo foi gravado.
+
+        Returns:
+            str: O caminho completo do arquivo (que, em segundo plano, pode ainda não ter sido gravado).
+        '''
+        if nome_arquivo is None:
+            nome_arquivo = datetime.datetime.now().strftime("screenshot_%Y%m%d_%H%M%S_%f")
+        if pasta is None:
+            pasta = os.path.join(os.path.expanduser("~"), "Downloads")
+        extensao = "jpg" if formato == "jpeg" else formato
+        caminho = os.path.join(pasta, f"{nome_arquivo}.{extensao}")
+
+        try:
+            dados = self._capturar_screenshot_base64(formato, qualidade, xpath, pagina_inteira)
+            if segundo_plano:
+                if self._gravador is None:
+                    self._gravador = _GravadorArquivos()
+                self._gravador.enviar(caminho, dados, em_base64=True)
+            else:
+                with open(caminho, 'wb') as arquivo:
+                    arquivo.write(base64.b64decode(dados))
+            return caminho
+        except Exception as e:
+            print(f"Erro ao tirar screenshot: {e}")
+            raise
+
+    def aguardar_screenshots(self):
+
+        '''
+        Aguarda até que todas as screenshots enviadas em segundo plano tenham sido gravadas em disco.
+        '''
+        if self._gravador is not None:
+            self._gravador.aguardar()
+
+    @_verifica_driver
+    def salvar_pdfs(self, urls: list = None, pasta: str = None, nomes: list = None, quantidade_abas: int = 4, formato: str = "A4",
+                    paisagem: bool = False, imprimir_fundo: bool = True, margem_cm: float = 1.0, escala: float = 1.0,
+                    timeout: float = 60, parar_em_erro: bool = True):
+
+        '''
+        Salva várias páginas em PDF (Page.printToPDF), carregando e imprimindo em várias abas ao mesmo tempo.
+        Bem mais rápido e leve do que abrir cada página e tirar uma screenshot: o PDF vem em partes
+        direto do navegador para o disco, sem passar inteiro pela memória. No Firefox (sem CDP) as páginas
+        são impressas uma por vez, numa aba de trabalho, pelo comando de impressão do WebDriver.
+
+        Args:
+            urls (list, opcional): As URLs a salvar. Se não for fornecido, salva as abas já abertas (sem recarregá-las).
+            pasta (str, opcional): A pasta onde os PDFs serão salvos. Padrão é a pasta Downloads.
+            nomes (list, opcional): O nome de cada PDF (sem extensão), na mesma ordem das URLs. Padrão é "pagina_0001", "pagina_0002"...
+            quantidade_abas (int): Quantas abas carregar e imprimir ao mesmo tempo. Padrão é 4.
+            formato (str): O papel (A3, A4, A5, Carta ou Oficio). Padrão é "A4".
+            paisagem (bool): Se True, imprime na horizontal. Padrão é False.
+            imprimir_fundo (bool): Se True, inclui cores e imagens de fundo. Padrão é True.
+            margem_cm (float): As margens (em centímetros). Padrão é 1.
+            escala (float): A escala da página (de 0.1 a 2). Padrão é 1.
+            timeout (float): Tempo máximo de carregamento e de impressão de cada página (em segundos). Padrão é 60.
+            parar_em_erro (bool): Se False, uma página com erro não interrompe as outras e o erro fica no lugar do caminho. Padrão é True.
+
+        Returns:
+            list: Os caminhos dos PDFs, na ordem das URLs (ou das abas).
+
+        Raises:
+            ValueError: Se a quantidade de nomes for diferente da quantidade de páginas.
+        '''
+        parametros = opcoes_pdf(formato, paisagem, imprimir_fundo, margem_cm, escala)
+
+        #sem URLs, cada aba aberta é impressa como está (o handle da aba é o targetId do CDP)
+        if urls is None:
+            self._sincronizar_abas()
+            alvos = list(self._ordem_abas)
+            tarefas = [(indice, None) for indice in range(len(alvos))]
+        else:
+            tarefas = list(enumerate(urls))
+            alvos = []
+        if nomes is not None and len(nomes) != len(tarefas):
+            raise ValueError(f"Foram fornecidos {len(nomes)} nomes para {len(tarefas)} páginas.")
+        pasta = pasta or os.path.join(os.path.expanduser("~"), "Downloads")
+        os.makedirs(pasta, exist_ok=True)
+        caminhos = [
+            os.path.join(pasta, f"{nomes[indice] if nomes else f'pagina_{indice + 1:04d}'}.pdf") for indice in range(len(tarefas))
+        ]
+        if self.navegador == "firefox":
+            return self._salvar_pdfs_webdriver([url for _, url in tarefas], alvos, caminhos, parametros, timeout, parar_em_erro)
+        endereco = SessaoCDP.endereco_depuracao(self.driver)
+        resultados = [None] * len(tarefas)
+        fila = queue.Queue()
+        for tarefa in tarefas:
+            fila.put(tarefa)
+        parar = threading.Event()
+        falhas_conexao = []
+
+        def trabalhar(alvo, fixo):
+            #cada thread tem a sua própria conexão CDP com a sua aba
+            sessao = None
+            try:
+                sessao = SessaoCDP(f"ws://{endereco}/devtools/page/{alvo}")
+                sessao.executar("Page.enable")
+                while not parar.is_set():
+                    try:
+                        indice, url = fixo if fixo is not None else fila.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        if url is not None:
+                            carregar_pagina(sessao, url, timeout)
+                        resultados[indice] = salvar_pdf(sessao, caminhos[indice], parametros, timeout)
+                    except Exception as e:
+                        print(f"Erro ao salvar o PDF de {url or alvo}: {e}")
+                        resultados[indice] = e
+                        if parar_em_erro:
+                            parar.set()
+                    if fixo is not None:
+                        return
+            except Exception as e:
+                print(f"Erro na conexão com a aba {alvo}: {e}")
+                falhas_conexao.append(e)
+                if parar_em_erro:
+                    parar.set()
+            finally:
+                if sessao is not None:
+                    sessao.fechar()
+
+        try:
+            if urls is None:
+                trabalhos = [(alvo, tarefa) for alvo, tarefa in zip(alvos, tarefas)]
+            else:
+                for _ in range(max(min(quantidade_abas, len(tarefas)), 0)):
+                    #abas novas em segundo plano, fora do registro de abas (fechadas no final)
+                    alvos.append(self._executar_cdp("Target.createTarget", {"url": "about:blank", "background": True})["targetId"])
+                trabalhos = [(alvo, None) for alvo in alvos]
+            threads = [threading.Thread(target=trabalhar, args=trabalho, name="automaweb-pdf", daemon=True) for trabalho in trabalhos]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            if urls is not None:
+                for alvo in alvos:
+                    try:
+                        self._executar_cdp("Target.closeTarget", {"targetId": alvo})
+                    except Exception:
+                        pass
+
+        for indice, resultado in enumerate(resultados):
+            if resultado is None: #página não processada (conexão perdida ou lote interrompido)
+                resultados[indice] = falhas_conexao[0] if falhas_conexao else RuntimeError("O lote foi interrompido por um erro.")
+        if parar_em_erro:
+            erros = [resultado for resultado in resultados if isinstance(resultado, Exception)]
+            if erros:
+                raise erros[0]
+        return resultados
+
+    def _salvar_pdfs_webdriver(self, urls: list, alvos: list, caminhos: list, parametros: dict, timeout: float, parar_em_erro: bool):
+
+        '''função interna que salva os PDFs um por vez pelo comando de impressão do WebDriver (Firefox, sem CDP)'''
+        original, caminho_frame = self._aba_atual, list(self._caminho_frame)
+        limite_anterior = self.driver.timeouts.page_load
+        aba_trabalho = None
+        resultados = [None] * len(caminhos)
+        try:
+            if not alvos and caminhos:
+                #as URLs são abertas numa aba de trabalho, sem mexer nas abas do usuário
+                aba_trabalho = self._nova_aba()
+                self.driver.set_page_load_timeout(timeout)
+            for indice, caminho in enumerate(caminhos):
+                try:
+                    if aba_trabalho is None:
+                        self._focar_aba(alvos[indice])
+                    else:
+                        self._backend.abrir(urls[indice])
+                    resultados[indice] = salvar_pdf_webdriver(self.driver, caminho, parametros)
+                except Exception as e:
+                    print(f"Erro ao salvar o PDF de {urls[indice] or alvos[indice]}: {e}")
+                    resultados[indice] = e
+                    if parar_em_erro:
+                        raise
+        finally:
+            if aba_trabalho is not None:
+                self.driver.set_page_load_timeout(limite_anterior)
+                self._focar_aba(aba_trabalho)
+                self._backend.fechar_aba(aba_trabalho)
+                self._aba_atual = None
+                self._ordem_abas = [handle for handle in self._ordem_abas if handle != aba_trabalho]
+            if original is not None:
+                self._focar_aba(original)
+                if caminho_frame:
+                    self._ir_para_frame(caminho_frame)
+        return resultados
+
+    @_verifica_driver
+    def iniciar_gravacao(self, pasta: str = None, tamanho_maximo_mb: float = 100, qualidade: int = 50, largura_maxima: int = 1280,
+                         altura_maxima: int = 720, a_cada_n_frames: int = 1, pasta_falhas: str = None, segundos_falha: float = 30):
+
+        '''
+        Inicia a gravação contínua da aba atual (screencast CDP, apenas Chrome/Edge).
+        Os frames ficam num buffer circular em disco, limitado por tamanho, e podem ser exportados depois.
+        
+        Args:
+            pasta (str, opcional): A pasta do buffer de frames. Padrão é uma pasta temporária.
+            tamanho_maximo_mb (float): Tamanho máximo do buffer em disco (em MB). Padrão é 100.
+            qualidade (int): Qualidade JPEG dos frames (0 a 100). Padrão é 50.
+            largura_maxima (int): Largura máxima dos frames (em pixels). Padrão é 1280.
+            altura_maxima (int): Altura máxima dos frames (em pixels). Padrão é 720.
+            a_cada_n_frames (int): Grava apenas 1 a cada N frames. Padrão é 1.
+            pasta_falhas (str, opcional): Se fornecida, sempre que uma ação falhar os últimos segundos são exportados para esta pasta.
+            segundos_falha (float): Quantos segundos finais exportar em cada falha. Padrão é 30.
+        '''
+        try:
+            if self._gravador_tela is not None:
+                self.parar_gravacao()
+            self._gravador_tela = GravadorTela(
+                self._abrir_sessao_cdp(), pasta, tamanho_maximo_mb, qualidade, largura_maxima, altura_maxima, a_cada_n_frames
+            )
+            self._gravador_tela.iniciar()
+            self._pasta_falhas = pasta_falhas
+            self._segundos_falha = segundos_falha
+            return self._gravador_tela.pasta
+        except Exception as e:
+            print(f"Erro ao iniciar a gravação: {e}")
+            raise
+
+    @_sincronizado
+    def parar_gravacao(self, apagar_buffer: bool = False):
+
+        '''
+        Para a gravação da aba.
+        
+        Args:
+            apagar_buffer (bool): Se True, apaga também os frames gravados em disco. Padrão é False.
+        '''
+        if self._gravador_tela is None:
+            return
+        try:
+            if apagar_buffer:
+                self._gravador_tela.limpar()
+            else:
+                self._gravador_tela.parar()
+            self._gravador_tela.sessao.fechar()
+        except Exception as e:
+            print(f"Erro ao parar a gravação: {e}")
+            raise
+        finally:
+            if apagar_buffer:
+                self._gravador_tela = None
+
+    @_sincronizado
+    def exportar_gravacao(self, destino: str, ultimos_segundos: float = 30, como_video: bool = False):
+
         '''
-        Salva uma imagem da tela atual na pasta Downloads.
+        Exporta os últimos segundos da gravação como sequência de imagens ou vídeo MP4 (requer ffmpeg).
         
         Args:
-            nome_arquivo (str): O nome do arquivo para salvar a screenshot (sem extensão). Padrão é "screenshot_YYYYMMDD_HHMMSS" para evitar sobrescritas.
-        '''
+            destino (str): A pasta (sequência de imagens) ou o arquivo .mp4 (vídeo) de saída.
+            ultimos_segundos (float): Quantos segundos finais exportar. Padrão é 30.
+            como_video (bool): Se True, gera um vídeo MP4. Padrão é False.
 
+        Returns:
+            str: O caminho da pasta ou do vídeo gerado.
+        '''
+        if self._gravador_tela is None:
+            raise RuntimeError("Nenhuma gravação foi iniciada. Use iniciar_gravacao() primeiro.")
         try:
-            self.driver.save_screenshot(os.path.join(os.path.expanduser("~"), "Downloads", f"{nome_arquivo}.png"))
+            return self._gravador_tela.exportar(destino, ultimos_segundos, como_video)
         except Exception as e:
-            print(f"Erro ao tirar screenshot: {e}")
+            print(f"Erro ao exportar a gravação: {e}")
             raise
     
+    @_verifica_driver
     def entrar_iframe(self, xpath: str):
         
         '''
@@ -555,25 +2043,104 @@ class Navegador:
             xpath (str): O XPath do iframe que deseja entrar.
         '''
         try:
-            self.wait.until(EC.frame_to_be_available_and_switch_to_it((By.XPATH, xpath)))
+            self._ir_para_frame(self._caminho_frame + [xpath])
         except Exception as e:
             print(f"Erro ao entrar no iframe: {e}")
             raise
 
-    def sair_iframe(self):
+    @_verifica_driver
+    def sair_iframe(self, niveis: int = None):
         
         '''
-        Volta o foco para a página principal.
+        Volta o foco para a página principal (ou sobe apenas alguns níveis de iframes).
         
         Args:
-            xpath (str): O XPath do iframe que deseja entrar.
+            niveis (int, opcional): Quantos níveis subir. Padrão é None (volta para a página principal).
         '''
         try:
-            self.driver.switch_to.default_content()
+            if niveis is None:
+                self._ir_para_frame([])
+            else:
+                self._ir_para_frame(self._caminho_frame[:max(len(self._caminho_frame) - niveis, 0)])
         except Exception as e:
             print(f"Erro ao sair do iframe: {e}")
             raise
+
+    @_verifica_driver
+    def ir_para_frame(self, caminho: list = None):
+
+        '''
+        Coloca o foco no iframe indicado pelo caminho completo (a partir da página principal),
+        trocando apenas os níveis necessários a partir do iframe atual.
+        Todas as ações também aceitam frame=[...] (ex: nav.clicar("//button", frame=["//iframe[@id='a']", "//iframe[@id='b']"])).
+        
+        Args:
+            caminho (list | str, opcional): Os XPaths dos iframes, do mais externo ao mais interno.
+                None ou [] para a página principal. Um texto é tratado como um único nível.
+        '''
+        try:
+            self._ir_para_frame(caminho)
+        except Exception as e:
+            print(f"Erro ao mudar de iframe: {e}")
+            raise
+
+    @property
+    def frame_atual(self):
+
+        '''o caminho (XPaths) do iframe em que o foco está; vazio na página principal'''
+        return tuple(self._caminho_frame)
+
+    def _esquecer_frames(self):
+
+        '''função interna chamada ao navegar ou trocar de aba: o foco volta para a página principal e as referências expiram'''
+        self._caminho_frame = []
+        self._cache_frames = {}
+        if self._backend is not None:
+            self._backend.esquecer_iframes()
+
+    def _ir_para_frame(self, caminho):
+
+        '''função interna que troca o mínimo de níveis de iframe até chegar no caminho informado'''
+        if caminho is None:
+            caminho = []
+        elif isinstance(caminho, str):
+            caminho = [caminho]
+        destino = list(caminho)
+        atual = self._caminho_frame
+        comum = 0
+        while comum < min(len(atual), len(destino)) and atual[comum] == destino[comum]:
+            comum += 1
+
+        #sobe até o nível em comum: um comando por nível ou um único para a página principal (mais a volta)
+        if comum < len(atual):
+            if comum and len(atual) - comum <= comum + 1:
+                for _ in range(len(atual) - comum):
+                    self._backend.subir_iframe()
+                    self._caminho_frame.pop()
+            else:
+                self._backend.sair_iframe()
+                self._caminho_frame = []
+                comum = 0
+
+        #desce até o destino, reaproveitando as referências dos iframes já localizados
+        for nivel in range(len(self._caminho_frame), len(destino)):
+            chave = tuple(destino[:nivel + 1])
+            quadro = self._cache_frames.get(chave)
+            if quadro is not None and self._backend.iframe_valido(quadro):
+                try:
+                    self._backend.mudar_para_iframe(quadro)
+                    self._caminho_frame.append(destino[nivel])
+                    continue
+                except (StaleElementReferenceException, NoSuchFrameException):
+                    pass
+            #referência expirada (a página do iframe mudou): descarta este nível e os internos
+            self._cache_frames = {k: v for k, v in self._cache_frames.items() if k[:len(chave)] != chave}
+            quadro = self._backend.localizar_iframe(destino[nivel])
+            self._backend.mudar_para_iframe(quadro)
+            self._cache_frames[chave] = quadro
+            self._caminho_frame.append(destino[nivel])
     
+    @_verifica_driver
     def salvar_cookies(self, nome_arquivo: str = os.path.join(os.path.expanduser("~"), "Downloads", "cookies.json")):
         
         '''
@@ -585,16 +2152,8 @@ class Navegador:
         '''
   
         #exibe uma mensagem de aviso para o usuário
-        #a ideia é que após clicar em ok, o código prossiga
-        root = tk.Tk()
-        root.attributes('-topmost', True) #deixa a janela sempre no topo
-        root.withdraw()
-        messagebox.showwarning(
-            'Atenção',
-            'Clique em "OK" apenas quando estiver pronto para salvar os cookies.',
-            parent=root
-        )
-        root.destroy()
+        #a ideia é que após clicar em ok, o código prossiga (no modo autônomo, salva direto)
+        confirmar('Atenção', 'Clique em "OK" apenas quando estiver pronto para salvar os cookies.', "salvar_cookies")
 
         try:
             #obtém lista de dicionários com os cookies
@@ -605,6 +2164,7 @@ class Navegador:
             print(f"Erro ao salvar cookies: {e}")
             raise
     
+    @_verifica_driver
     def carregar_cookies(self, nome_arquivo: str = os.path.join(os.path.expanduser("~"), "Downloads", "cookies.json")):
 
         '''
@@ -641,16 +2201,184 @@ class Navegador:
                     print(f"Ignorando cookie '{cookie.get('name', 'desconhecido')}': {e_cookie}")
             self.recarregar_driver() 
 
-        except FileNotFoundError:
-            messagebox.showwarning("Aviso", f"Arquivo '{nome_arquivo}' não existe. Faça o login manual primeiro.")
+        except FileNotFoundError as e:
+            mensagem = f"Arquivo '{nome_arquivo}' não existe. Faça o login manual primeiro."
+            if modo_autonomo():
+                raise ArquivoCookiesNaoEncontradoErro(mensagem) from e
+            notificar(logging.WARNING, "Aviso", mensagem, "cookies_nao_encontrados", arquivo=nome_arquivo)
 
         except Exception as e:
             print(f"Erro ao carregar cookies: {e}")
             raise
 
+### REQUISIÇÕES HTTP DIRETAS
+
+    def _obter_todos_cookies(self):
+
+        '''função interna que lê os cookies de todos os domínios (via CDP) ou, no Firefox, os do domínio atual'''
+        if self.navegador != "firefox":
+            try:
+                return self._executar_cdp("Network.getAllCookies")["cookies"]
+            except Exception:
+                pass
+        return self.driver.get_cookies()
+
+    @_verifica_driver
+    def sessao_http(self, nova: bool = False, conexoes_por_host: int = 4, timeout: float = 60):
+
+        '''
+        Devolve uma sessão HTTP (sem navegador) autenticada com os cookies, o User-Agent e o idioma do navegador.
+        Ideal para baixar CSV/JSON/arquivos depois do login, muito mais rápido do que abrir as páginas no navegador.
+        As conexões ficam abertas (keep-alive) e são reaproveitadas entre as requisições.
+        
+        Args:
+            nova (bool): Se True, descarta a sessão anterior e cria outra. Padrão é False (reaproveita e só atualiza os cookies).
+            conexoes_por_host (int): Quantas conexões manter abertas por host. Padrão é 4.
+            timeout (float): Tempo máximo de cada operação de rede (em segundos). Padrão é 60.
+
+        Returns:
+            SessaoHTTP: A sessão, com os métodos get, post, requisitar e baixar.
+        '''
+        try:
+            if self._sessao_http is None or nova:
+                if self._sessao_http is not None:
+                    self._sessao_http.fechar()
+                self._sessao_http = SessaoHTTP(conexoes_por_host=conexoes_por_host, timeout=timeout)
+            sessao = self._sessao_http
+            sessao.carregar_cookies(self._obter_todos_cookies())
+            agente, idiomas, url = self._executar_script(
+                "return [navigator.userAgent, (navigator.languages || [navigator.language]).join(','), location.href];"
+            )
+            sessao.cabecalhos.update({"User-Agent": agente, "Accept-Language": idiomas})
+            if url.startswith("http"):
+                sessao.cabecalhos["Referer"] = url
+            sessao.cookies_alterados = False
+            return sessao
+        except Exception as e:
+            print(f"Erro ao criar a sessão HTTP: {e}")
+            raise
+
+    @_verifica_driver
+    def sincronizar_cookies_http(self, sessao: SessaoHTTP = None):
+
+        '''
+        Devolve ao navegador os cookies recebidos pela sessão HTTP (ex: sessão renovada pelo servidor).
+        No Chrome/Edge todos os domínios são atualizados; no Firefox apenas os do domínio da página atual.
+        
+        Args:
+            sessao (SessaoHTTP, opcional): A sessão de origem. Padrão é a última criada por sessao_http().
+        '''
+        sessao = sessao or self._sessao_http
+        if sessao is None:
+            raise RuntimeError("Nenhuma sessão HTTP foi criada. Use sessao_http() primeiro.")
+        try:
+            cookies = sessao.exportar_cookies()
+            if self.navegador != "firefox":
+                convertidos = []
+                for cookie in cookies:
+                    convertido = {chave: cookie[chave] for chave in ("name", "value", "path", "secure", "httpOnly")}
+                    if cookie["domain"].startswith("."):
+                        convertido["domain"] = cookie["domain"]
+                    else:
+                        #cookie exclusivo do host: informar a URL mantém esse comportamento no navegador
+                        esquema = "https" if cookie["secure"] else "http"
+                        convertido["url"] = f"{esquema}://{cookie['domain']}{cookie['path']}"
+                    if "expiry" in cookie:
+                        convertido["expires"] = cookie["expiry"]
+                    convertidos.append(convertido)
+                self._executar_cdp("Network.setCookies", {"cookies": convertidos})
+            else:
+                for cookie in cookies:
+                    try:
+                        self.driver.add_cookie(cookie)
+                    except Exception:
+                        #cookies de outros domínios não podem ser adicionados pelo selenium
+                        pass
+            sessao.cookies_alterados = False
+        except Exception as e:
+            print(f"Erro ao sincronizar os cookies da sessão HTTP: {e}")
+            raise
+
+### CAPTURA DE REDE
+
+    @_verifica_driver
+    def capturar_respostas(self, padrao_url: str, tipos: tuple = ("XHR", "Fetch"), metodo: str = None):
+
+        '''
+        Começa a capturar as respostas (XHR/fetch) da aba atual cujas URLs combinam com o padrão. Apenas Chrome e Edge.
+        Em vez de esperar a página renderizar os dados, lê direto o JSON que ela recebeu do servidor.
+        
+        Args:
+            padrao_url (str): Expressão regular procurada na URL (ex: r"/api/pedidos").
+            tipos (tuple, opcional): Tipos de recurso aceitos. Padrão é ("XHR", "Fetch"). Use None para aceitar todos.
+            metodo (str, opcional): Se fornecido, aceita apenas este método HTTP (ex: "POST").
+
+        Returns:
+            CapturaRede: A captura, com aguardar(timeout), iterar(timeout) e parar(). Também pode ser usada com "with".
+        '''
+        try:
+            captura = CapturaRede(self._abrir_sessao_cdp(), padrao_url, tipos, metodo, fechar_sessao=True)
+            captura.iniciar()
+            self._capturas = [c for c in self._capturas if c.ativa] + [captura]
+            return captura
+        except Exception as e:
+            print(f"Erro ao iniciar a captura de rede: {e}")
+            raise
+
+    @_verifica_driver
+    def aguardar_resposta(self, padrao_url: str, acao=None, timeout: float = 30, tipos: tuple = ("XHR", "Fetch"), metodo: str = None):
+
+        '''
+        Executa uma ação (opcional) e espera a primeira resposta cuja URL combina com o padrão. Apenas Chrome e Edge.
+        
+        Args:
+            padrao_url (str): Expressão regular procurada na URL (ex: r"/api/pedidos").
+            acao (callable, opcional): Função que dispara a requisição (ex: lambda: nav.clicar("//button[@id='buscar']")).
+            timeout (float): Tempo máximo de espera (em segundos). Padrão é 30.
+            tipos (tuple, opcional): Tipos de recurso aceitos. Padrão é ("XHR", "Fetch").
+            metodo (str, opcional): Se fornecido, aceita apenas este método HTTP.
+
+        Returns:
+            RespostaCapturada: A resposta (use .json() para obter os dados).
+        '''
+        #a captura começa antes da ação para não perder respostas rápidas
+        with self.capturar_respostas(padrao_url, tipos, metodo) as captura:
+            if acao is not None:
+                acao()
+            return captura.aguardar(timeout)
+
+### PLANOS DE AÇÕES
+
+    @_verifica_driver
+    def executar_plano(self, plano, semantica: Literal["nativa", "script"] = "nativa", timeout: float = None):
+
+        '''
+        Executa uma sequência de passos declarada como dados (ver PlanoAcoes).
+        Passos vizinhos que podem rodar dentro da página são enviados num único script,
+        reduzindo as idas e voltas ao driver.
+        
+        Args:
+            plano (PlanoAcoes | list | str): O plano, a lista de passos ou o caminho de um arquivo .json/.yaml.
+            semantica (str): "nativa" ou "script" (usada apenas se o plano não for um PlanoAcoes). Padrão é "nativa".
+            timeout (float, opcional): Tempo máximo de espera de cada passo em lote (usado apenas se o plano não for um PlanoAcoes).
+
+        Returns:
+            ResultadoPlano: Os tempos de cada passo (resultado.tempos()) e os valores lidos (resultado.valores).
+        '''
+        try:
+            if isinstance(plano, str):
+                plano = PlanoAcoes.carregar(plano, semantica=semantica, timeout=timeout)
+            elif not isinstance(plano, PlanoAcoes):
+                plano = PlanoAcoes(plano, semantica, timeout)
+            return _executar_plano(plano, self)
+        except Exception as e:
+            print(f"Erro ao executar o plano de ações: {e}")
+            raise
+
 ### VERIFICAÇÕES
 
 
+    @_verifica_driver
     def verifica_selecionado(self, xpath: str):
         '''
         Verifica se um elemento está selecionado (Retorna True ou False).
@@ -662,12 +2390,13 @@ class Navegador:
             bool: True se o elemento estiver selecionado, False caso contrário.
         '''
         try:
-            elemento = self.wait.until(EC.element_to_be_clickable((By.XPATH, xpath)))
-            return elemento.is_selected()
+            elemento = self._backend.aguardar(xpath, "clicavel")
+            return self._backend.selecionado(elemento)
         except Exception as e:
             print(f"Erro ao verificar se o elemento está selecionado: {e}")
             raise
 
+    @_verifica_driver
     def verifica_habilitado(self, xpath: str):
         '''
         Verifica se um elemento está habilitado (Retorna True ou False).
@@ -679,12 +2408,13 @@ class Navegador:
             bool: True se o elemento estiver habilitado, False caso contrário.
         '''
         try:
-            elemento = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            return elemento.is_enabled()
+            elemento = self._backend.aguardar(xpath, "presente")
+            return self._backend.habilitado(elemento)
         except Exception as e:
             print(f"Erro ao verificar se o elemento está habilitado: {e}")
             raise
 
+    @_verifica_driver
     def verifica_clicavel(self, xpath: str, timeout: float):
         '''
         Verifica se um elemento é clicavel (Retorna True ou False).
@@ -697,11 +2427,12 @@ class Navegador:
             bool: True se o elemento é clicavel, False caso contrário.
         '''
         try:
-            WebDriverWait(self.driver, timeout).until(EC.element_to_be_clickable((By.XPATH, xpath)))
+            self._backend.aguardar(xpath, "clicavel", timeout)
             return True
         except Exception as e:
             return False
 
+    @_verifica_driver
     def verifica_existe(self, xpath: str, timeout: float):
         '''
         Verifica se um elemento existe na página (Retorna True ou False).
@@ -714,11 +2445,12 @@ class Navegador:
             bool: True se o elemento existir, False caso contrário.
         '''
         try:
-            WebDriverWait(self.driver, timeout).until(EC.presence_of_element_located((By.XPATH, xpath)))
+            self._backend.aguardar(xpath, "presente", timeout)
             return True
         except Exception:
             return False
     
+    @_verifica_driver
     def verifica_visivel(self, xpath: str):
         '''
         Verifica se um elemento é visível na página (Retorna True ou False).
@@ -732,10 +2464,11 @@ class Navegador:
         
         try:
             elemento = self.encontrar_elemento(xpath)
-            return elemento.is_displayed()
+            return self._backend.visivel(elemento)
         except:
             raise
 
+    @_verifica_driver
     def verificar_texto_digitado(self, xpath: str, texto_esperado: str ):
         '''
         Verifica se o texto digitado em um campo é igual ao texto esperado.
@@ -754,6 +2487,7 @@ class Navegador:
             print(f"Erro ao verificar o texto digitado: {e}")
             raise
     
+    @_verifica_driver
     def verificar_texto_selecionado(self, xpath: str, texto_esperado: str):
         '''
         Verifica se o texto atualmente selecionado em um select é igual ao texto esperado.
@@ -772,6 +2506,7 @@ class Navegador:
             print(f"Erro ao verificar o select: {e}")
             raise
     
+    @_verifica_driver
     def obter_texto_selecionado(self, xpath: str):
         '''
         Obtém o texto atualmente selecionado em um elemento select.
@@ -783,14 +2518,298 @@ class Navegador:
             str: O texto atualmente selecionado no select.
         '''
         try:
-            elemento = self.wait.until(EC.presence_of_element_located((By.XPATH, xpath)))
-            selecao = Select(elemento)
-            opcao_selecionada = selecao.first_selected_option
-            return opcao_selecionada.text
+            elemento = self._backend.aguardar(xpath, "presente")
+            return self._backend.texto_selecionado(elemento)
         except Exception as e:
             print(f"Erro ao obter o texto do select: {e}")
             raise
 
+### MÉTRICAS E DIAGNÓSTICO
+
+    def _pids_raiz(self):
+
+        '''função interna que devolve os PIDs dos processos iniciados pelo driver (driver e/ou navegador)'''
+        pids = []
+        processo = getattr(getattr(self.driver, "service", None), "process", None)
+        if processo is not None:
+            pids.append(processo.pid)
+        for atributo in ("browser_pid", "process_id"): #undetected-chromedriver e DrissionPage
+            pid = getattr(self.driver, atributo, None)
+            if isinstance(pid, int) and pid not in pids:
+                pids.append(pid)
+        return pids
+
+    @_verifica_driver
+    def memoria_navegador(self):
+
+        '''
+        Soma a memória residente (RSS) do driver e de todos os processos do navegador (abas, GPU, renderizadores).
+        Lê o /proc, portanto só funciona no Linux.
+
+        Returns:
+            float: A memória em MB ou None se não for possível medir (ex: Windows, driver remoto).
+        '''
+        return self._memoria_mb()
+
+    def _memoria_mb(self):
+
+        '''função interna que mede a memória do navegador (MB) sem registrar uma ação'''
+        pids = _arvore_processos(self._pids_raiz())
+        if not pids:
+            return None
+        return _memoria_processos(pids) / (1024 * 1024)
+
+    @_sincronizado
+    def configurar_reciclagem(self, max_memoria_mb: float = None, max_acoes: int = None, verificar_memoria_a_cada: int = 20,
+                              restaurar_armazenamento: bool = True):
+
+        '''
+        Liga a reciclagem automática: entre uma ação e outra, se o navegador passou dos limites, ele é fechado e
+        aberto de novo (com os mesmos parâmetros), voltando para a mesma URL com os cookies, o localStorage e o
+        sessionStorage restaurados. Mantém a memória sob controle em execuções de várias horas.
+        Apenas a aba atual é restaurada. Chame sem argumentos para desligar.
+        
+        Args:
+            max_memoria_mb (float, opcional): Limite da memória (RSS) somada do driver e do navegador, em MB. Lida do /proc (apenas Linux).
+            max_acoes (int, opcional): Limite de ações desde a última abertura.
+            verificar_memoria_a_cada (int): A memória é medida a cada N ações. Padrão é 20.
+            restaurar_armazenamento (bool): Se True, restaura também o localStorage e o sessionStorage da página. Padrão é True.
+        '''
+        if max_memoria_mb is None and max_acoes is None:
+            self._reciclagem = None
+            return
+        self._reciclagem = {
+            "max_memoria_mb": max_memoria_mb,
+            "max_acoes": max_acoes,
+            "verificar_memoria_a_cada": max(int(verificar_memoria_a_cada), 1),
+            "restaurar_armazenamento": restaurar_armazenamento,
+        }
+
+    def _verificar_reciclagem(self):
+
+        '''função interna (chamada antes de cada ação) que conta as ações e recicla o driver se algum limite foi ultrapassado'''
+        self._acoes_desde_abertura += 1
+        limites = self._reciclagem
+        if limites is None or self._reciclando or self._reciclagem_suspensa or self._parametros_abertura is None:
+            return
+        motivo = None
+        if limites["max_acoes"] is not None and self._acoes_desde_abertura > limites["max_acoes"]:
+            motivo = f"{self._acoes_desde_abertura - 1} ações"
+        elif limites["max_memoria_mb"] is not None and self._acoes_desde_abertura % limites["verificar_memoria_a_cada"] == 0:
+            memoria = self._memoria_mb()
+            if memoria is not None and memoria > limites["max_memoria_mb"]:
+                motivo = f"{memoria:.0f} MB de memória"
+        if motivo is not None:
+            self.reciclar_driver(motivo)
+
+    @_sincronizado
+    def reciclar_driver(self, motivo: str = "manual"):
+
+        '''
+        Fecha e abre o navegador de novo (com os mesmos parâmetros da última abertura), restaurando
+        a URL, os cookies, o localStorage, o sessionStorage e o iframe em que o foco estava.
+        A gravação de tela e as capturas de rede ativas continuam no navegador novo (mesmo buffer e mesmos objetos).
+        
+        Args:
+            motivo (str): O motivo, registrado no log. Padrão é "manual".
+
+        Returns:
+            float: O tempo gasto na reciclagem (em segundos).
+        '''
+        if self._parametros_abertura is None:
+            raise RuntimeError("O driver ainda não foi aberto. Use abrir_driver() primeiro.")
+        inicio = time.perf_counter()
+        self._reciclando = True
+        try:
+            #guarda o estado da aba atual
+            url = self._backend.url_atual()
+            cookies = self._obter_todos_cookies()
+            caminho_frame = list(self._caminho_frame)
+            armazenamento = None
+            if self._reciclagem is None or self._reciclagem["restaurar_armazenamento"]:
+                self._ir_para_frame([])
+                armazenamento = self._executar_script(
+                    "return [location.origin, Object.assign({}, localStorage), Object.assign({}, sessionStorage)];"
+                )
+            memoria = self._memoria_mb()
+            #o fechar_driver para a gravação e as capturas: elas são retomadas no navegador novo
+            gravador = self._gravador_tela if self._gravador_tela is not None and self._gravador_tela.gravando else None
+            capturas = [captura for captura in self._capturas if captura.ativa]
+
+            #fecha e abre de novo
+            self.fechar_driver()
+            metodo, parametros = self._parametros_abertura
+            getattr(self, metodo)(**parametros)
+            self._retomar_gravacoes(gravador, capturas)
+
+            #restaura cookies, armazenamento, URL e iframe
+            self._restaurar_estado(url, cookies, armazenamento)
+            if caminho_frame:
+                self._ir_para_frame(caminho_frame)
+
+            self.reciclagens += 1
+            duracao = time.perf_counter() - inicio
+            registro.info(
+                f"Navegador reciclado ({motivo}) em {duracao:.1f}s.",
+                extra={"evento": "driver_reciclado", "dados": {"motivo": motivo, "memoria_mb": memoria, "duracao_s": duracao, "url": url}},
+            )
+            return duracao
+        except Exception as e:
+            print(f"Erro ao reciclar o driver: {e}")
+            raise
+        finally:
+            self._reciclando = False
+
+    def _retomar_gravacoes(self, gravador, capturas: list):
+
+        '''função interna que reconecta a gravação de tela e as capturas de rede ao navegador reaberto'''
+        if gravador is not None:
+            try:
+                gravador.retomar(self._abrir_sessao_cdp())
+            except Exception as e:
+                self._gravador_tela = None
+                self._pasta_falhas = None
+                registro.warning(
+                    f"A gravação não pôde ser retomada depois da reciclagem: {e}",
+                    extra={"evento": "gravacao_nao_retomada", "dados": {"pasta": gravador.pasta, "erro": str(e)}},
+                )
+        for captura in capturas:
+            try:
+                captura.retomar(self._abrir_sessao_cdp())
+                self._capturas.append(captura)
+            except Exception as e:
+                registro.warning(
+                    f"A captura de '{captura.padrao.pattern}' não pôde ser retomada depois da reciclagem: {e}",
+                    extra={"evento": "captura_nao_retomada", "dados": {"padrao_url": captura.padrao.pattern, "erro": str(e)}},
+                )
+
+    def _restaurar_estado(self, url: str, cookies: list, armazenamento):
+
+        '''função interna que devolve ao navegador recém-aberto os cookies, o armazenamento e a URL da sessão anterior'''
+        script_armazenamento = None
+        if armazenamento:
+            origem, local, sessao = armazenamento
+            #roda antes dos scripts da página, para que ela já encontre o armazenamento preenchido
+            script_armazenamento = (
+                "(function (d) { if (location.origin !== d[0]) return;"
+                " for (const k in d[1]) localStorage.setItem(k, d[1][k]);"
+                " for (const k in d[2]) sessionStorage.setItem(k, d[2][k]); })"
+                f"({json.dumps([origem, local, sessao])});"
+            )
+
+        if self.navegador != "firefox":
+            campos = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority")
+            convertidos = []
+            for cookie in cookies:
+                convertido = {chave: cookie[chave] for chave in campos if chave in cookie}
+                if cookie.get("session") or convertido.get("expires", -1) < 0:
+                    convertido.pop("expires", None)
+                convertidos.append(convertido)
+            if convertidos:
+                self._executar_cdp("Network.setCookies", {"cookies": convertidos})
+            identificador = None
+            if script_armazenamento and url.startswith("http"):
+                identificador = self._executar_cdp("Page.addScriptToEvaluateOnNewDocument", {"source": script_armazenamento})["identifier"]
+            self.driver.get(url)
+            if identificador is not None:
+                self._executar_cdp("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identificador})
+        else:
+            #firefox: os cookies só podem ser adicionados com a página do domínio aberta
+            self.driver.get(url)
+            for cookie in cookies:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception:
+                    pass
+            if script_armazenamento and url.startswith("http"):
+                self._executar_script(script_armazenamento)
+            self.driver.refresh()
+        self._esquecer_frames()
+
+    def latencia_comandos(self, todas_sessoes: bool = False):
+
+        '''
+        Devolve as estatísticas do tempo de ida e volta dos comandos WebDriver (requisição HTTP até a resposta completa),
+        separadas do tempo das ações. Útil para ver se a lentidão está no navegador ou na rede até o driver/grid.
+        Não disponível no modo undetected do Edge (DrissionPage).
+
+        Args:
+            todas_sessoes (bool): Se True, soma os comandos de todas as sessões do processo. Padrão é False.
+
+        Returns:
+            dict: Contagem, média, mínimo, máximo, p50, p90 e p99 (em segundos) e os baldes do histograma.
+        '''
+        return (latencia_global if todas_sessoes else self.latencia).resumo()
+
+    def exportar_metricas(self, pasta: str = None, nome_arquivo: str = "metricas_automaweb"):
+
+        '''
+        Salva as métricas de latência de cada ação (tempo total, espera, stun, tentativas e resultado)
+        em JSON e no formato de texto do Prometheus.
+        
+        Args:
+            pasta (str, opcional): A pasta onde os arquivos serão salvos. Padrão é a pasta Downloads.
+            nome_arquivo (str): O nome dos arquivos (sem extensão). Padrão é "metricas_automaweb".
+
+        Returns:
+            tuple: Os caminhos do arquivo .json e do arquivo .prom.
+        '''
+        if pasta is None:
+            pasta = os.path.join(os.path.expanduser("~"), "Downloads")
+        caminho_json = os.path.join(pasta, f"{nome_arquivo}.json")
+        caminho_prometheus = os.path.join(pasta, f"{nome_arquivo}.prom")
+        try:
+            self.metricas.exportar_json(caminho_json)
+            self.metricas.exportar_prometheus(caminho_prometheus)
+            return caminho_json, caminho_prometheus
+        except Exception as e:
+            print(f"Erro ao exportar as métricas: {e}")
+            raise
+
+    @_sincronizado
+    def iniciar_rastreamento(self):
+
+        '''
+        Passa a registrar cada comando WebDriver/CDP enviado ao navegador (início, fim, sessão, aba e localizador)
+        e as ações do Navegador que os originaram. Pode ser chamado antes ou depois de abrir o driver.
+        Não disponível no modo undetected do Edge (DrissionPage).
+        '''
+        try:
+            if self._rastreador is None:
+                self._rastreador = RastreadorComandos(f"automaweb ({self.navegador})")
+            self._instalar_rastreador()
+        except Exception as e:
+            print(f"Erro ao iniciar o rastreamento: {e}")
+            raise
+
+    @_sincronizado
+    def parar_rastreamento(self, nome_arquivo: str = None):
+
+        '''
+        Para o rastreamento e salva os eventos num arquivo JSON que pode ser aberto no
+        chrome://tracing ou em https://ui.perfetto.dev.
+        
+        Args:
+            nome_arquivo (str, opcional): O caminho do arquivo JSON. Padrão é "rastreamento_YYYYMMDD_HHMMSS.json" na pasta Downloads.
+
+        Returns:
+            str: O caminho do arquivo salvo.
+        '''
+        if self._rastreador is None:
+            raise RuntimeError("Nenhum rastreamento foi iniciado. Use iniciar_rastreamento() primeiro.")
+        if nome_arquivo is None:
+            nome_arquivo = os.path.join(
+                os.path.expanduser("~"), "Downloads", datetime.datetime.now().strftime("rastreamento_%Y%m%d_%H%M%S.json")
+            )
+        try:
+            self._rastreador.desinstalar()
+            return self._rastreador.salvar(nome_arquivo)
+        except Exception as e:
+            print(f"Erro ao salvar o rastreamento: {e}")
+            raise
+        finally:
+            self._rastreador = None
+
 ### MANIPULAÇÃO DE ARQUIVOS
 
 def selecionar_arquivo(titulo="Selecione um arquivo", tipos_arquivos=[("Todos os arquivos", "*.*")]):
@@ -806,11 +2825,14 @@ def selecionar_arquivo(titulo="Selecione um arquivo", tipos_arquivos=[("Todos os
         str: O caminho completo do arquivo selecionado ou None (se cancelado).
     '''
     try:
-        caminho = filedialog.askopenfilename(
+        caminho = dialogo_arquivos(
+            "askopenfilename",
             title=titulo,
             filetypes=tipos_arquivos
         )
         return caminho if caminho else None
+    except InteracaoIndisponivelErro:
+        raise
     except Exception as e:
         print("Erro", f"Erro ao selecionar arquivo: {e}")
         return None
@@ -827,8 +2849,10 @@ def selecionar_multiplos_arquivos(titulo="Selecione os arquivos"):
         list: Uma lista de caminhos completos dos arquivos selecionados ou uma lista vazia (se cancelado).
     '''
     try:
-        arquivos = filedialog.askopenfilenames(title=titulo)
+        arquivos = dialogo_arquivos("askopenfilenames", title=titulo)
         return list(arquivos) if arquivos else []
+    except InteracaoIndisponivelErro:
+        raise
     except Exception as e:
         print("Erro", f"Erro ao selecionar arquivos: {e}")
         return []
@@ -855,33 +2879,90 @@ def renomear_arquivo(caminho_atual, novo_nome):
     except Exception as e:
         print(f"Erro ao renomear arquivo {caminho_atual}: {e}")
 
-def mover_arquivo(origem, destino):
+def _tratar_duplicado(origem, destino, indice: IndiceHash, duplicado: str, mover: bool):
+
+    '''função interna que, se o conteúdo de origem já estiver no índice, aplica a opção de duplicado e devolve o caminho resultante (ou None para seguir normalmente)'''
+    if duplicado not in ("manter", "link", "excluir"):
+        raise ValueError(f"Opção de duplicado '{duplicado}' inválida. Escolha entre: manter, link, excluir.")
+    existente = indice.duplicado(origem) if duplicado != "manter" else None
+    if existente is None:
+        return None
+    if duplicado == "excluir":
+        #o conteúdo já está guardado: não grava outra cópia (e, ao mover, descarta a origem)
+        if mover:
+            os.remove(origem)
+            indice.remover(origem)
+        print(f"Conteúdo de {origem} já existe em {existente}. Nenhuma cópia criada.")
+        return existente
+    if os.path.isdir(destino):
+        destino = os.path.join(destino, os.path.basename(origem))
+    try:
+        os.link(existente, destino) #hardlink: mesmo conteúdo no disco, sem ocupar espaço de novo
+    except OSError as e:
+        print(f"Não foi possível criar o link para {existente} ({e}). Gravando o arquivo normalmente.")
+        return None
+    if mover:
+        os.remove(origem)
+        indice.remover(origem)
+    indice.registrar(destino, indice.hash(existente))
+    print(f"Conteúdo de {origem} já existe em {existente}. Criado um link em {destino}.")
+    return destino
+
+def mover_arquivo(origem, destino, indice: IndiceHash = None, duplicado: Literal["manter", "link", "excluir"] = "manter"):
     
     '''
     Move um arquivo de 'origem' para 'destino'.
 
     Args:
         origem (str): O caminho completo do arquivo que deseja mover.
-        destino (str): O caminho completo para onde o arquivo será movido.
+        destino (str): O caminho completo para onde o arquivo será movido (ou a pasta de destino).
+        indice (IndiceHash, opcional): Se fornecido, o arquivo movido é registrado no índice de conteúdo.
+        duplicado (str): O que fazer se o conteúdo já estiver no índice: "manter" (move normalmente), "link" (cria um
+            hardlink para o arquivo existente e apaga a origem) ou "excluir" (apaga a origem). Padrão é "manter".
+
+    Returns:
+        str: O caminho final do arquivo movido (ou do arquivo existente com o mesmo conteúdo; None em caso de erro).
     '''
     try:
-        shutil.move(origem, destino)
+        if indice is not None:
+            resultado = _tratar_duplicado(origem, destino, indice, duplicado, mover=True)
+            if resultado is not None:
+                return resultado
+            valor_hash = indice.hash(origem)
+        destino = shutil.move(origem, destino)
         print(f"Arquivo movido de {origem} para {destino}")
+        if indice is not None:
+            indice.remover(origem)
+            indice.registrar(destino, valor_hash)
+        return destino
     except Exception as e:
         print(f"Erro ao mover arquivo: {e}")
 
-def copiar_arquivo(origem, destino):
+def copiar_arquivo(origem, destino, indice: IndiceHash = None, duplicado: Literal["manter", "link", "excluir"] = "manter"):
     
     '''
     Copia um arquivo mantendo os metadados (datas de criação, etc).
     
     Args:
         origem (str): O caminho completo do arquivo a ser copiado.
-        destino (str): O caminho completo para onde o arquivo será copiado.
+        destino (str): O caminho completo para onde o arquivo será copiado (ou a pasta de destino).
+        indice (IndiceHash, opcional): Se fornecido, a cópia é registrada no índice de conteúdo.
+        duplicado (str): O que fazer se o conteúdo já estiver no índice: "manter" (copia normalmente), "link" (cria um
+            hardlink para o arquivo existente em vez de copiar) ou "excluir" (não copia). Padrão é "manter".
+
+    Returns:
+        str: O caminho da cópia (ou do arquivo existente com o mesmo conteúdo; None em caso de erro).
     '''
     try:
-        shutil.copy2(origem, destino)
+        if indice is not None:
+            resultado = _tratar_duplicado(origem, destino, indice, duplicado, mover=False)
+            if resultado is not None:
+                return resultado
+        destino = shutil.copy2(origem, destino)
         print(f"Arquivo copiado para {destino}")
+        if indice is not None:
+            indice.registrar(destino, indice.hash(origem))
+        return destino
     except Exception as e:
         print(f"Erro ao copiar arquivo: {e}")
 
@@ -929,8 +3010,10 @@ def selecionar_pasta(titulo="Selecione uma pasta"):
         str: O caminho completo da pasta selecionada ou None (se cancelado).
     '''
     try:
-        pasta = filedialog.askdirectory(title=titulo)
+        pasta = dialogo_arquivos("askdirectory", title=titulo)
         return pasta if pasta else None
+    except InteracaoIndisponivelErro:
+        raise
     except Exception as e:
         print("Erro", f"Erro ao selecionar pasta: {e}")
         return None
@@ -1054,13 +3137,17 @@ def excluir_pasta_completa(caminho_pasta: str):
     try:
         if os.path.exists(caminho_pasta):
             shutil.rmtree(caminho_pasta)
-            messagebox.showinfo("Sucesso", f"Pasta removida: {caminho_pasta}")
+            notificar(logging.INFO, "Sucesso", f"Pasta removida: {caminho_pasta}", "pasta_removida", caminho=caminho_pasta)
+        elif modo_autonomo():
+            raise PastaNaoEncontradaErro(f"Pasta não encontrada: {caminho_pasta}")
         else:
-            messagebox.showwarning("Aviso", "Pasta não encontrada.")
+            notificar(logging.WARNING, "Aviso", "Pasta não encontrada.", "pasta_nao_encontrada", caminho=caminho_pasta)
     except Exception as e:
         print("Erro", f"Erro ao excluir pasta: {e}")
+        if modo_autonomo(): #num worker a falha não pode passar despercebida
+            raise
 
-def compactar_para_zip(caminho_origem: str, nome_arquivo: str):
+def compactar_para_zip(caminho_origem: str, nome_arquivo: str, avisar: bool = True):
     
     '''
     Cria um arquivo .zip de uma pasta ou arquivo.
@@ -1068,12 +3155,26 @@ def compactar_para_zip(caminho_origem: str, nome_arquivo: str):
     Args:
         caminho_origem (str): O caminho da pasta ou arquivo que deseja compactar.
         nome_arquivo (str): O nome do arquivo .zip que deseja criar (sem extensão).
+        avisar (bool): Se False, não mostra a janela de sucesso (apenas registra o evento no log). Padrão é True.
+
+    Returns:
+        str: O caminho do arquivo .zip criado.
     '''
     try:
-        shutil.make_archive(nome_arquivo, 'zip', caminho_origem)
-        messagebox.showinfo("Sucesso", f"Arquivo {nome_arquivo}.zip criado!")
+        if os.path.isfile(caminho_origem):
+            #um arquivo solto: compacta só ele, sem as pastas do caminho
+            arquivo_zip = shutil.make_archive(nome_arquivo, 'zip', os.path.dirname(os.path.abspath(caminho_origem)), os.path.basename(caminho_origem))
+        else:
+            arquivo_zip = shutil.make_archive(nome_arquivo, 'zip', caminho_origem)
+        if avisar:
+            notificar(logging.INFO, "Sucesso", f"Arquivo {nome_arquivo}.zip criado!", "zip_criado", arquivo=arquivo_zip)
+        else:
+            registro.info(f"Arquivo {nome_arquivo}.zip criado!", extra={"evento": "zip_criado", "dados": {"arquivo": arquivo_zip}})
+        return arquivo_zip
     except Exception as e:
         print("Erro", f"Erro ao compactar: {e}")
+        if modo_autonomo():
+            raise
 
 def descompactar_zip(arquivo_zip: str, caminho_destino: str):
     
@@ -1086,12 +3187,216 @@ def descompactar_zip(arquivo_zip: str, caminho_destino: str):
     '''
     try:
         shutil.unpack_archive(arquivo_zip, caminho_destino)
-        messagebox.showinfo("Sucesso", f"Extraído em: {caminho_destino}")
+        notificar(logging.INFO, "Sucesso", f"Extraído em: {caminho_destino}", "zip_extraido", arquivo=arquivo_zip, destino=caminho_destino)
     except Exception as e:
         print("Erro", f"Erro ao descompactar: {e}")
+        if modo_autonomo():
+            raise
+
+### OBSERVAÇÃO DE PASTAS
+
+class RegraRenomear:
+    '''
+    Regra de observar_pasta que renomeia o arquivo (na mesma pasta) usando renomear_arquivo.
+
+    Args:
+        modelo (str | callable): O novo nome, com os campos {nome} (sem extensão), {extensao} (com o ponto),
+            {data} (datetime de agora, aceita formato: {data:%Y-%m-%d}) e {contador}.
+            Ex: "{data:%Y%m%d_%H%M%S}_{nome}{extensao}". Também aceita uma função que recebe o caminho e devolve o novo nome.
+    '''
+    def __init__(self, modelo):
+
+        self.modelo = modelo
+        self._contador = 0
+        self._trava = threading.Lock()
+
+    def __call__(self, caminho: str):
+
+        if callable(self.modelo):
+            novo_nome = self.modelo(caminho)
+        else:
+            with self._trava:
+                self._contador += 1
+                contador = self._contador
+            nome, extensao = os.path.splitext(os.path.basename(caminho))
+            novo_nome = self.modelo.format(nome=nome, extensao=extensao, data=datetime.datetime.now(), contador=contador)
+        if os.path.exists(os.path.join(os.path.dirname(caminho), novo_nome)):
+            raise FileExistsError(f"Já existe um arquivo chamado '{novo_nome}'.")
+        novo_caminho = renomear_arquivo(caminho, novo_nome)
+        if novo_caminho is None:
+            raise OSError(f"Não foi possível renomear '{caminho}'.")
+        return novo_caminho
+
+class RegraMover:
+    '''
+    Regra de observar_pasta que move o arquivo para outra pasta usando mover_arquivo.
+
+    Args:
+        pasta (str): A pasta de destino (criada se não existir).
+    '''
+    def __init__(self, pasta: str):
+
+        self.pasta = pasta
+
+    def __call__(self, caminho: str):
+
+        os.makedirs(self.pasta, exist_ok=True)
+        destino = os.path.join(self.pasta, os.path.basename(caminho))
+        if os.path.exists(destino):
+            raise FileExistsError(f"Já existe um arquivo '{destino}'.")
+        novo_caminho = mover_arquivo(caminho, destino)
+        if novo_caminho is None:
+            raise OSError(f"Não foi possível mover '{caminho}'.")
+        return novo_caminho
+
+class RegraCompactar:
+    '''
+    Regra de observar_pasta que compacta o arquivo num .zip (com o mesmo nome) usando compactar_para_zip.
+
+    Args:
+        pasta (str, opcional): A pasta onde o .zip é criado. Padrão é a pasta do arquivo.
+        remover_original (bool): Se True, apaga o arquivo original depois de compactar. Padrão é True.
+    '''
+    def __init__(self, pasta: str = None, remover_original: bool = True):
+
+        self.pasta = pasta
+        self.remover_original = remover_original
+
+    def __call__(self, caminho: str):
+
+        pasta = self.pasta or os.path.dirname(caminho)
+        os.makedirs(pasta, exist_ok=True)
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        arquivo_zip = compactar_para_zip(caminho, os.path.join(pasta, nome), avisar=False)
+        if arquivo_zip is None:
+            raise OSError(f"Não foi possível compactar '{caminho}'.")
+        if self.remover_original:
+            os.remove(caminho)
+        return arquivo_zip
+
+class RegraExcluir:
+    '''
+    Regra de observar_pasta que apaga o arquivo (encerra a sequência de regras).
+    '''
+    def __call__(self, caminho: str):
+
+        os.remove(caminho)
+        registro.info(f"Arquivo excluído: {caminho}", extra={"evento": "arquivo_excluido", "dados": {"arquivo": caminho}})
+        return None
+
+def observar_pasta(pasta: str, regras: list, padroes: tuple = None, trabalhadores: int = 4, estabilidade: float = 1,
+                   incluir_existentes: bool = False, ao_concluir=None, ao_falhar=None, usar_inotify: bool = True):
+
+    '''
+    Observa uma pasta e aplica uma sequência de regras (renomear, mover, compactar, excluir...) em cada arquivo novo,
+    assim que ele termina de ser gravado. Substitui os laços "while True" com listar_arquivos/obter_arquivo_mais_recente:
+    no Linux o sistema avisa os arquivos novos (inotify), sem listar a pasta a cada segundo.
+    Os arquivos são processados em paralelo, numa thread em segundo plano.
+    
+    Args:
+        pasta (str): A pasta observada.
+        regras (list): As regras aplicadas em ordem (RegraRenomear, RegraMover, RegraCompactar, RegraExcluir ou qualquer
+            função que receba o caminho e devolva o novo caminho, ou None para encerrar a sequência).
+        padroes (tuple, opcional): Padrões de nome aceitos (ex: ("*.pdf",)). Padrão é aceitar todos.
+        trabalhadores (int): Quantos arquivos processar ao mesmo tempo. Padrão é 4.
+        estabilidade (float): Por quantos segundos o arquivo deve ficar sem mudanças antes de ser processado. Padrão é 1.
+        incluir_existentes (bool): Se True, também processa os arquivos que já estavam na pasta. Padrão é False.
+        ao_concluir (callable, opcional): Chamada com (caminho original, caminho final) após as regras.
+        ao_falhar (callable, opcional): Chamada com (caminho, erro) quando uma regra falha.
+        usar_inotify (bool): Se False, usa sempre a comparação de listagens (ex: pastas de rede). Padrão é True.
+
+    Returns:
+        ObservadorPasta: O observador já iniciado (use .parar() para encerrar, ou .aguardar() para bloquear).
+    '''
+    observador = None
+
+    def processar(caminho):
+        atual = caminho
+        try:
+            for regra in regras:
+                atual = regra(atual)
+                if atual is None:
+                    break
+                #um arquivo gerado dentro da própria pasta (ex: renomeado) não deve ser processado de novo
+                if os.path.dirname(os.path.abspath(atual)) == observador.pasta:
+                    observador.ignorar_uma_vez(atual)
+        except Exception as e:
+            print(f"Erro ao aplicar as regras em '{caminho}': {e}")
+            registro.error(
+                f"Erro ao aplicar as regras em '{caminho}': {e}",
+                extra={"evento": "regra_falhou", "dados": {"arquivo": caminho, "etapa": atual}},
+            )
+            if ao_falhar is not None:
+                ao_falhar(caminho, e)
+            return
+        registro.info(
+            f"Arquivo processado: {caminho}",
+            extra={"evento": "arquivo_processado", "dados": {"arquivo": caminho, "destino": atual}},
+        )
+        if ao_concluir is not None:
+            ao_concluir(caminho, atual)
+
+    try:
+        observador = ObservadorPasta(
+            pasta, processar, padroes=padroes, estabilidade=estabilidade, trabalhadores=trabalhadores,
+            incluir_existentes=incluir_existentes, usar_inotify=usar_inotify,
+        )
+        return observador.iniciar()
+    except Exception as e:
+        print(f"Erro ao observar a pasta '{pasta}': {e}")
+        raise
 
 ### UTILITÁRIOS E VERIFICAÇÕES
 
+def fechar_todos_drivers(tempo_limite: float = 10):
+
+    '''
+    Fecha em paralelo todos os navegadores abertos neste processo. Chamada também automaticamente ao sair do Python.
+    
+    Args:
+        tempo_limite (float): Quanto tempo aguardar o quit() de cada navegador antes de encerrá-lo à força (em segundos). Padrão é 10.
+
+    Returns:
+        int: Quantos navegadores foram fechados.
+    '''
+    navegadores = list(_navegadores_abertos)
+    if not navegadores:
+        return 0
+
+    def fechar(nav):
+        try:
+            nav.fechar_driver(tempo_limite)
+        except Exception as e:
+            print(f"Erro ao fechar o navegador {nav.navegador}: {e}")
+
+    #threads simples em vez de um ThreadPoolExecutor: ele não aceita tarefas durante o encerramento do Python (atexit)
+    threads = [threading.Thread(target=fechar, args=(nav,), name="automaweb-fechar", daemon=True) for nav in navegadores]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return len(navegadores)
+
+@atexit.register
+def _fechar_ao_sair():
+
+    '''função interna que fecha os navegadores esquecidos abertos quando o Python termina (evita processos órfãos)'''
+    try:
+        fechar_todos_drivers(tempo_limite=5)
+    except Exception:
+        pass
+
+def limpar_cache_binarios():
+
+    '''
+    Apaga o cache de binários (driver, navegador e chromedriver corrigido) usado na abertura dos drivers.
+    Útil para forçar uma nova resolução após atualizar o navegador manualmente.
+    '''
+    try:
+        CacheBinarios().invalidar()
+    except Exception as e:
+        print(f"Erro ao limpar o cache de binários: {e}")
+
 def verifica_existe(caminho):
     
     '''
@@ -0,0 +1,235 @@
+"""
+registro em memória das métricas de latência das ações do Navegador
+"""
+
+#bibliotecas para tarefas em segundo plano
+import threading
+
+#bibliotecas para manipulação de arquivos
+import datetime
+import json
+import math
+import os
+
+#limites (em segundos) dos baldes dos histogramas, do mais rápido ao mais lento
+LIMITES_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class Histograma:
+    '''
+    Histograma de baldes fixos (compatível com o formato do Prometheus).
+
+    Args:
+        limites (tuple): Os limites superiores dos baldes (em segundos).
+    '''
+    def __init__(self, limites: tuple = LIMITES_PADRAO):
+
+        self.limites = tuple(limites)
+        self.baldes = [0] * (len(self.limites) + 1) #o último balde é o +Inf
+        self.contagem = 0
+        self.soma = 0.0
+        self.minimo = None
+        self.maximo = None
+
+    def observar(self, valor: float):
+
+        '''registra uma nova amostra'''
+        indice = len(self.limites)
+        for i, limite in enumerate(self.limites):
+            if valor <= limite:
+                indice = i
+                break
+        self.baldes[indice] += 1
+        self.contagem += 1
+        self.soma += valor
+        self.minimo = valor if self.minimo is None else min(self.minimo, valor)
+        self.maximo = valor if self.maximo is None else max(self.maximo, valor)
+
+    def quantil(self, q: float):
+
+        '''
+        Estima um quantil (ex: 0.95) interpolando dentro do balde correspondente.
+
+        Returns:
+            float: O valor estimado ou None se não houver amostras.
+        '''
+        if self.contagem == 0:
+            return None
+        alvo = q * self.contagem
+        acumulado = 0
+        for i, quantidade in enumerate(self.baldes):
+            if quantidade and acumulado + quantidade >= alvo:
+                inferior = self.limites[i - 1] if i > 0 else 0.0
+                superior = self.limites[i] if i < len(self.limites) else self.maximo
+                inferior = max(inferior, self.minimo)
+                superior = min(superior, self.maximo)
+                return inferior + (superior - inferior) * ((alvo - acumulado) / quantidade)
+            acumulado += quantidade
+        return self.maximo
+
+    def resumo(self):
+
+        '''devolve um dicionário com as estatísticas do histograma'''
+        return {
+            "contagem": self.contagem,
+            "soma": self.soma,
+            "media": self.soma / self.contagem if self.contagem else None,
+            "minimo": self.minimo,
+            "maximo": self.maximo,
+            "p50": self.quantil(0.5),
+            "p90": self.quantil(0.9),
+            "p99": self.quantil(0.99),
+            "baldes": {str(limite): quantidade for limite, quantidade in zip(list(self.limites) + ["+Inf"], self.baldes)},
+        }
+
+class RegistroMetricas:
+    '''
+    Registro (thread-safe) das métricas de cada ação: tempo total, tempo de espera, tempo de stun,
+    número de tentativas extras e resultado (ok ou nome da exceção).
+
+    Args:
+        rotulos (dict, opcional): Rótulos fixos adicionados a todas as métricas exportadas (ex: {"navegador": "chrome"}).
+        limites (tuple): Os limites dos baldes dos histogramas (em segundos).
+    '''
+    #nome da métrica -> descrição (usada no HELP do Prometheus)
+    SERIES = {
+        "duracao": "Tempo total (wall time) de cada ação do Navegador.",
+        "espera": "Tempo gasto aguardando condições (WebDriverWait) dentro de cada ação.",
+        "stun": "Tempo gasto no stun (tempo_stun) dentro de cada ação.",
+    }
+
+    def __init__(self, rotulos: dict = None, limites: tuple = LIMITES_PADRAO):
+
+        self.rotulos = dict(rotulos or {})
+        self.limites = tuple(limites)
+        self._acoes = {} #nome da ação -> dados acumulados
+        self._lock = threading.Lock()
+
+    def registrar(self, acao: str, duracao: float, espera: float = 0, stun: float = 0, tentativas: int = 0, resultado: str = "ok"):
+
+        '''
+        Registra uma execução de ação.
+
+        Args:
+            acao (str): O nome da ação (ex: "clicar").
+            duracao (float): O tempo total da ação (em segundos).
+            espera (float): O tempo gasto em esperas (em segundos).
+            stun (float): O tempo gasto no stun (em segundos).
+            tentativas (int): Quantas vezes a ação precisou ser repetida.
+            resultado (str): "ok" ou o nome da exceção lançada.
+        '''
+        with self._lock:
+            dados = self._acoes.get(acao)
+            if dados is None:
+                dados = self._acoes[acao] = {
+                    "histogramas": {serie: Histograma(self.limites) for serie in self.SERIES},
+                    "tentativas": 0,
+                    "resultados": {},
+                }
+            dados["histogramas"]["duracao"].observar(duracao)
+            dados["histogramas"]["espera"].observar(espera)
+            dados["histogramas"]["stun"].observar(stun)
+            dados["tentativas"] += tentativas
+            dados["resultados"][resultado] = dados["resultados"].get(resultado, 0) + 1
+
+    def resumo(self):
+
+        '''
+        Devolve um dicionário com as estatísticas de todas as ações, ordenadas pelo tempo total gasto.
+
+        Returns:
+            dict: As estatísticas por ação.
+        '''
+        with self._lock:
+            acoes = {
+                acao: {
+                    **{serie: histograma.resumo() for serie, histograma in dados["histogramas"].items()},
+                    "tentativas": dados["tentativas"],
+                    "resultados": dict(dados["resultados"]),
+                }
+                for acao, dados in self._acoes.items()
+            }
+        return dict(sorted(acoes.items(), key=lambda item: item[1]["duracao"]["soma"], reverse=True))
+
+    def limpar(self):
+
+        '''descarta todas as métricas registradas'''
+        with self._lock:
+            self._acoes.clear()
+
+    def exportar_json(self, caminho: str):
+
+        '''
+        Salva as métricas num arquivo JSON (com data e rótulos, para comparar execuções).
+
+        Args:
+            caminho (str): O caminho do arquivo JSON.
+        '''
+        conteudo = {
+            "gerado_em": datetime.datetime.now().isoformat(),
+            "rotulos": self.rotulos,
+            "acoes": self.resumo(),
+        }
+        self._gravar(caminho, json.dumps(conteudo, indent=4, ensure_ascii=False))
+
+    def exportar_prometheus(self, caminho: str):
+
+        '''
+        Salva as métricas no formato de texto do Prometheus (compatível com o textfile collector do node_exporter).
+
+        Args:
+            caminho (str): O caminho do arquivo (geralmente com extensão .prom).
+        '''
+        linhas = []
+        with self._lock:
+            acoes = sorted(self._acoes.items())
+            for serie, descricao in self.SERIES.items():
+                nome = f"automaweb_acao_{serie}_segundos"
+                linhas.append(f"# HELP {nome} {descricao}")
+                linhas.append(f"# TYPE {nome} histogram")
+                for acao, dados in acoes:
+                    histograma = dados["histogramas"][serie]
+                    acumulado = 0
+                    for limite, quantidade in zip(list(histograma.limites) + ["+Inf"], histograma.baldes):
+                        acumulado += quantidade
+                        linhas.append(f"{nome}_bucket{self._rotulos(acao=acao, le=limite)} {acumulado}")
+                    linhas.append(f"{nome}_sum{self._rotulos(acao=acao)} {_numero(histograma.soma)}")
+                    linhas.append(f"{nome}_count{self._rotulos(acao=acao)} {histograma.contagem}")
+
+            linhas.append("# HELP automaweb_acao_tentativas_total Repetições feitas por impedimentos (elemento interceptado, obsoleto...).")
+            linhas.append("# TYPE automaweb_acao_tentativas_total counter")
+            for acao, dados in acoes:
+                linhas.append(f"automaweb_acao_tentativas_total{self._rotulos(acao=acao)} {dados['tentativas']}")
+
+            linhas.append("# HELP automaweb_acao_resultados_total Execuções de cada ação por resultado.")
+            linhas.append("# TYPE automaweb_acao_resultados_total counter")
+            for acao, dados in acoes:
+                for resultado, quantidade in sorted(dados["resultados"].items()):
+                    linhas.append(f"automaweb_acao_resultados_total{self._rotulos(acao=acao, resultado=resultado)} {quantidade}")
+
+        self._gravar(caminho, "\n".join(linhas) + "\n")
+
+    def _rotulos(self, **extras):
+
+        '''função interna que monta o bloco {chave="valor",...} do Prometheus'''
+        rotulos = {**self.rotulos, **extras}
+        partes = []
+        for chave, valor in rotulos.items():
+            valor = str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            partes.append(f'{chave}="{valor}"')
+        return "{" + ",".join(partes) + "}"
+
+    @staticmethod
+    def _gravar(caminho: str, conteudo: str):
+
+        '''função interna que grava de forma atômica (o coletor nunca lê um arquivo pela metade)'''
+        temporario = f"{caminho}.tmp"
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, caminho)
+
+def _numero(valor: float):
+
+    '''formata um float para o Prometheus'''
+    if math.isinf(valor):
+        return "+Inf" if valor > 0 else "-Inf"
+    return repr(float(valor))
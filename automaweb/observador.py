@@ -0,0 +1,323 @@
+"""
+observação de pastas: avisa quando um arquivo novo termina de ser gravado
+
+no Linux usa o inotify (via ctypes, sem dependências): o sistema avisa cada arquivo
+criado, fechado ou renomeado para dentro da pasta, sem listar a pasta de novo.
+nos outros sistemas (ou se o inotify não estiver disponível) compara listagens
+da pasta a cada intervalo.
+
+um arquivo só é entregue depois de ficar "estável" (sem eventos e com o mesmo
+tamanho e data de modificação por alguns instantes), então downloads e cópias
+ainda em andamento não são processados pela metade. os arquivos temporários de
+download (.crdownload, .part...) são ignorados: o evento chega quando o navegador
+os renomeia para o nome final.
+"""
+
+#bibliotecas para o inotify e as tarefas em segundo plano
+from concurrent.futures import ThreadPoolExecutor
+import ctypes.util
+import threading
+import fnmatch
+import select
+import ctypes
+import struct
+import time
+import os
+
+#eventos do inotify (ver "man inotify")
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_EVENTOS_ARQUIVO = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVED_FROM | IN_DELETE | IN_DELETE_SELF
+_CABECALHO_EVENTO = struct.Struct("iIII") #wd, mask, cookie, len (seguido do nome)
+
+#arquivos temporários de download/cópia: nunca são entregues
+IGNORAR_PADRAO = ("*.crdownload", "*.part", "*.partial", "*.download", "*.tmp", "*.temp", ".~lock.*", "~$*", ".goutputstream-*")
+
+def _carregar_inotify():
+
+    '''função interna que carrega as funções do inotify da libc (ou None fora do Linux)'''
+    if not hasattr(os, "uname") or os.uname().sysname != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+class ObservadorPasta:
+    '''
+    Observa uma pasta e chama a função para cada arquivo novo (ou alterado) assim que ele fica estável.
+    As chamadas rodam num grupo de threads, então arquivos diferentes são processados em paralelo.
+
+    Args:
+        pasta (str): A pasta observada (não inclui subpastas).
+        ao_detectar (callable): Função chamada com o caminho completo de cada arquivo pronto.
+        padroes (tuple, opcional): Padrões de nome aceitos (ex: ("*.pdf", "relatorio_*")). Padrão é aceitar todos.
+        ignorar (tuple): Padrões de nome ignorados. Padrão são os arquivos temporários de download (IGNORAR_PADRAO).
+        estabilidade (float): Por quantos segundos o arquivo deve ficar sem mudanças antes de ser entregue. Padrão é 1.
+        trabalhadores (int): Quantos arquivos processar ao mesmo tempo. Padrão é 4.
+        incluir_existentes (bool): Se True, também entrega os arquivos que já estavam na pasta. Padrão é False.
+        intervalo_polling (float): Intervalo entre as listagens quando o inotify não está disponível. Padrão é 1.
+        usar_inotify (bool): Se False, usa sempre a comparação de listagens. Padrão é True.
+    '''
+    def __init__(self, pasta: str, ao_detectar, padroes: tuple = None, ignorar: tuple = IGNORAR_PADRAO, estabilidade: float = 1,
+                 trabalhadores: int = 4, incluir_existentes: bool = False, intervalo_polling: float = 1, usar_inotify: bool = True):
+
+        self.pasta = os.path.abspath(pasta)
+        self.ao_detectar = ao_detectar
+        self.padroes = tuple(padroes) if padroes else None
+        self.ignorar = tuple(ignorar or ())
+        self.estabilidade = estabilidade
+        self.trabalhadores = trabalhadores
+        self.incluir_existentes = incluir_existentes
+        self.intervalo_polling = intervalo_polling
+        self.usar_inotify = usar_inotify
+        self.modo = None #"inotify" ou "polling", definido ao iniciar
+        self.entregues = 0
+        self._pendentes = {} #caminho -> [último evento, assinatura (tamanho, mtime)]
+        self._entregues = {} #caminho -> assinatura já entregue (evita entregar o mesmo arquivo duas vezes)
+        self._ignorar_uma_vez = {} #caminho -> assinatura de arquivos gerados pelas próprias regras
+        self._trava = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._descritor = None
+
+    def _aceito(self, nome: str):
+
+        '''função interna que aplica os padrões de nome aceitos e ignorados'''
+        if any(fnmatch.fnmatch(nome, padrao) for padrao in self.ignorar):
+            return False
+        return self.padroes is None or any(fnmatch.fnmatch(nome, padrao) for padrao in self.padroes)
+
+    @staticmethod
+    def _assinatura(caminho: str):
+
+        '''função interna que devolve (tamanho, mtime) de um arquivo comum, ou None se ele não existir (ou for uma pasta)'''
+        try:
+            informacoes = os.stat(caminho)
+        except OSError:
+            return None
+        if not os.path.isfile(caminho):
+            return None
+        return (informacoes.st_size, informacoes.st_mtime_ns)
+
+    def _marcar(self, nome: str):
+
+        '''função interna que registra um evento num arquivo (reinicia a contagem da estabilidade)'''
+        if not self._aceito(nome):
+            return
+        caminho = os.path.join(self.pasta, nome)
+        with self._trava:
+            self._pendentes[caminho] = [time.monotonic(), self._assinatura(caminho)]
+
+    def ignorar_uma_vez(self, caminho: str):
+
+        '''
+        Não entrega o próximo evento deste arquivo (usado para os arquivos gerados pelo próprio processamento,
+        ex: um arquivo renomeado na mesma pasta, evitando que ele seja processado de novo).
+
+        Args:
+            caminho (str): O caminho do arquivo.
+        '''
+        caminho = os.path.abspath(caminho)
+        #arquivos de fora da pasta ou de nomes não aceitos nunca geram um evento que consumiria o registro
+        if os.path.dirname(caminho) != self.pasta or not self._aceito(os.path.basename(caminho)):
+            return
+        with self._trava:
+            self._ignorar_uma_vez[caminho] = self._assinatura(caminho)
+
+    def _entregar_estaveis(self):
+
+        '''função interna que envia ao grupo de threads os arquivos sem mudanças há pelo menos "estabilidade" segundos'''
+        agora = time.monotonic()
+        prontos = []
+        with self._trava:
+            for caminho, (momento, assinatura) in list(self._pendentes.items()):
+                if agora - momento < self.estabilidade:
+                    continue
+                atual = self._assinatura(caminho)
+                if atual is None: #apagado ou movido (antes ou depois de ser entregue)
+                    del self._pendentes[caminho]
+                    self._entregues.pop(caminho, None)
+                    self._ignorar_uma_vez.pop(caminho, None)
+                    continue
+                if atual != assinatura: #ainda está sendo gravado: espera mais um período
+                    self._pendentes[caminho] = [agora, atual]
+                    continue
+                del self._pendentes[caminho]
+                if self._ignorar_uma_vez.pop(caminho, False) == atual or self._entregues.get(caminho) == atual:
+                    continue
+                self._entregues[caminho] = atual
+                prontos.append(caminho)
+            #marcados para ignorar que sumiram sem gerar evento (ex: apagados entre duas listagens)
+            for caminho in [caminho for caminho in self._ignorar_uma_vez if caminho not in self._pendentes]:
+                if not os.path.exists(caminho):
+                    del self._ignorar_uma_vez[caminho]
+        for caminho in prontos:
+            self.entregues += 1
+            self._executor.submit(self._chamar, caminho)
+
+    def _chamar(self, caminho: str):
+
+        '''função interna que chama ao_detectar sem deixar um erro derrubar o grupo de threads'''
+        try:
+            self.ao_detectar(caminho)
+        except Exception as e:
+            print(f"Erro ao processar '{caminho}': {e}")
+
+    def _listar(self):
+
+        '''função interna que lista os arquivos da pasta com as suas assinaturas'''
+        arquivos = {}
+        try:
+            with os.scandir(self.pasta) as itens:
+                for item in itens:
+                    try:
+                        if item.is_file():
+                            informacoes = item.stat()
+                            arquivos[item.name] = (informacoes.st_size, informacoes.st_mtime_ns)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        return arquivos
+
+    def _iniciar_inotify(self):
+
+        '''função interna que cria o descritor do inotify (ou devolve False se não for possível)'''
+        libc = _carregar_inotify() if self.usar_inotify else None
+        if libc is None:
+            return False
+        descritor = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if descritor < 0:
+            return False
+        if libc.inotify_add_watch(descritor, os.fsencode(self.pasta), _EVENTOS_ARQUIVO) < 0:
+            os.close(descritor)
+            return False
+        self._descritor = descritor
+        return True
+
+    def _ler_eventos(self):
+
+        '''função interna que lê os eventos pendentes do inotify'''
+        try:
+            dados = os.read(self._descritor, 64 * 1024)
+        except BlockingIOError:
+            return
+        posicao = 0
+        while posicao + _CABECALHO_EVENTO.size <= len(dados):
+            _, mascara, _, tamanho = _CABECALHO_EVENTO.unpack_from(dados, posicao)
+            posicao += _CABECALHO_EVENTO.size
+            nome = os.fsdecode(dados[posicao:posicao + tamanho].rstrip(b"\0"))
+            posicao += tamanho
+            if mascara & IN_Q_OVERFLOW:
+                #a fila do sistema transbordou: eventos foram perdidos, então a pasta inteira é verificada
+                for nome_arquivo in self._listar():
+                    self._marcar(nome_arquivo)
+            elif mascara & (IN_DELETE_SELF | IN_IGNORED):
+                print(f"A pasta observada foi removida: {self.pasta}")
+                self._parar.set()
+            elif nome and not mascara & IN_ISDIR:
+                self._marcar(nome)
+
+    def _executar_inotify(self):
+
+        while not self._parar.is_set():
+            #acorda a cada fração da estabilidade para entregar os arquivos que ficaram prontos
+            prontos, _, _ = select.select([self._descritor], [], [], max(min(self.estabilidade / 2, 0.5), 0.05))
+            if prontos:
+                self._ler_eventos()
+            self._entregar_estaveis()
+
+    def _executar_polling(self, anterior: dict):
+
+        while not self._parar.wait(self.intervalo_polling):
+            atual = self._listar()
+            for nome, assinatura in atual.items():
+                if anterior.get(nome) != assinatura:
+                    self._marcar(nome)
+            #os apagados também são marcados, para saírem dos registros de entregues e ignorados
+            for nome in anterior.keys() - atual.keys():
+                self._marcar(nome)
+            anterior = atual
+            self._entregar_estaveis()
+
+    def iniciar(self):
+
+        '''
+        Começa a observar a pasta (numa thread em segundo plano).
+
+        Returns:
+            ObservadorPasta: O próprio observador.
+        '''
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        if not os.path.isdir(self.pasta):
+            raise FileNotFoundError(f"A pasta '{self.pasta}' não existe.")
+        self._parar.clear()
+        self._executor = ThreadPoolExecutor(max_workers=max(self.trabalhadores, 1), thread_name_prefix="automaweb-pasta")
+        self.modo = "inotify" if self._iniciar_inotify() else "polling"
+        if self.incluir_existentes:
+            for nome in self._listar():
+                self._marcar(nome)
+        if self.modo == "inotify":
+            alvo, argumentos = self._executar_inotify, ()
+        else:
+            #a primeira listagem é feita aqui, para não perder arquivos criados logo depois de iniciar()
+            alvo, argumentos = self._executar_polling, (self._listar(),)
+        self._thread = threading.Thread(target=alvo, args=argumentos, name="automaweb-observador", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self, aguardar: bool = True):
+
+        '''
+        Para de observar a pasta.
+
+        Args:
+            aguardar (bool): Se True, espera os arquivos em processamento terminarem. Padrão é True.
+        '''
+        self._parar.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._descritor is not None:
+            os.close(self._descritor)
+            self._descritor = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=aguardar)
+            self._executor = None
+
+    def aguardar(self, timeout: float = None):
+
+        '''
+        Bloqueia enquanto o observador estiver ativo (ex: num worker dedicado), até parar() ou a pasta ser removida.
+
+        Args:
+            timeout (float, opcional): Tempo máximo de espera (em segundos).
+
+        Returns:
+            bool: True se o observador parou, False se o tempo acabou antes.
+        '''
+        return self._parar.wait(timeout)
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *erro):
+        self.parar()
@@ -0,0 +1,427 @@
+"""
+planos de ações: uma sequência de passos (clicar, digitar, selecionar...) declarada
+como dados (lista, JSON ou YAML), validada antes de rodar e executada em lotes
+
+passos vizinhos que podem rodar dentro da página são agrupados num único script:
+a busca do elemento, a espera e a ação acontecem no navegador, e o lote inteiro
+custa uma ida e volta ao driver em vez de várias por passo.
+
+exemplo:
+    plano = PlanoAcoes([
+        {"acao": "digitar", "xpath": "//input[@id='nome']", "texto": "Maria"},
+        {"acao": "selecionar_texto", "xpath": "//select[@id='estado']", "texto": "São Paulo"},
+        {"acao": "clicar", "xpath": "//button[@id='enviar']"},
+        {"acao": "obter_texto", "xpath": "//div[@id='resultado']", "nome": "resultado"},
+    ], semantica="script")
+    resultado = nav.executar_plano(plano)
+    print(resultado.valores["resultado"], resultado.tempos())
+"""
+
+#bibliotecas para manipulação de dados
+import json
+import time
+import os
+
+from .erros import PlanoInvalidoErro, ErroPlano, XPathInvalidoErro
+from .localizadores import analisar_xpath, compilar_localizador, seletor_css
+
+#ação -> argumentos obrigatórios (na ordem usada pela forma abreviada ["clicar", "//xpath"])
+ACOES = {
+    "abrir_url": ("url",),
+    "clicar": ("xpath",),
+    "clicar_forcado": ("xpath",),
+    "digitar": ("xpath", "texto"),
+    "digitar_forcado": ("xpath", "texto"),
+    "limpar": ("xpath",),
+    "passar_mouse": ("xpath",),
+    "selecionar_texto": ("xpath", "texto"),
+    "selecionar_valor": ("xpath", "valor"),
+    "obter_texto": ("xpath",),
+    "obter_atributo": ("xpath", "atributo"),
+    "rolar_ate_elemento": ("xpath",),
+    "aguardar_elemento_sumir": ("xpath",),
+    "entrar_iframe": ("xpath",),
+    "sair_iframe": (),
+    "pausar": ("segundos",),
+}
+
+#campos aceitos em qualquer passo, além dos argumentos da ação
+CAMPOS_GERAIS = ("acao", "nome", "timeout", "semantica")
+
+#passos que rodam dentro da página com o mesmo resultado da versão nativa (leituras e esperas)
+LOTE_SEMPRE = {"obter_texto", "obter_atributo", "rolar_ate_elemento", "aguardar_elemento_sumir"}
+
+#passos que só rodam dentro da página com semantica="script": os eventos são disparados pelo
+#JavaScript (sem mouse/teclado reais e sem a verificação de elemento sobreposto do driver)
+LOTE_SCRIPT = {"clicar", "digitar", "limpar", "passar_mouse", "selecionar_texto", "selecionar_valor"}
+
+#passos que podem trocar de página: o lote precisa terminar neles
+ENCERRAM_LOTE = {"clicar"}
+
+#condição de espera de cada passo executado em lote (a mesma usada pelos métodos do Navegador)
+CONDICOES_LOTE = {
+    "clicar": "clicavel",
+    "digitar": "clicavel",
+    "limpar": "clicavel",
+    "passar_mouse": "clicavel",
+    "selecionar_texto": "clicavel",
+    "selecionar_valor": "clicavel",
+    "obter_texto": "visivel",
+    "obter_atributo": "presente",
+    "rolar_ate_elemento": "presente",
+}
+
+SCRIPT_LOTE = r"""
+const passos = arguments[0], intervalo = arguments[1];
+const agora = () => performance.now();
+const buscar = (p) => p.css ? document.querySelector(p.css)
+    : document.evaluate(p.xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+const visivel = (el) => !!el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length) && getComputedStyle(el).visibility !== 'hidden';
+const condicoes = {
+    presente: (el) => !!el,
+    visivel: (el) => visivel(el),
+    clicavel: (el) => visivel(el) && !el.disabled,
+};
+const esperar = (teste, timeout) => new Promise((resolver, rejeitar) => {
+    const limite = agora() + timeout;
+    const verificar = () => {
+        let r = null;
+        try { r = teste(); } catch (e) { r = null; }
+        if (r) return resolver(r);
+        if (agora() >= limite) return rejeitar(new Error('tempo de espera esgotado (' + timeout + ' ms)'));
+        setTimeout(verificar, intervalo);
+    };
+    verificar();
+});
+const disparar = (el, tipo) => el.dispatchEvent(new Event(tipo, {bubbles: true}));
+const definirValor = (el, valor) => {
+    //usa o setter nativo para que frameworks (React, Vue...) percebam a mudança
+    const prototipo = el instanceof HTMLTextAreaElement ? HTMLTextAreaElement.prototype
+        : el instanceof HTMLSelectElement ? HTMLSelectElement.prototype : HTMLInputElement.prototype;
+    Object.getOwnPropertyDescriptor(prototipo, 'value').set.call(el, valor);
+    disparar(el, 'input');
+    disparar(el, 'change');
+};
+const selecionar = (el, teste, descricao) => {
+    const opcao = Array.from(el.options).find(teste);
+    if (!opcao) throw new Error('opção não encontrada: ' + descricao);
+    definirValor(el, opcao.value);
+};
+const acoes = {
+    clicar: (el) => { el.scrollIntoView({block: 'center', inline: 'center'}); el.click(); },
+    digitar: (el, p) => { el.focus(); definirValor(el, (el.value || '') + p.texto); },
+    limpar: (el) => { el.focus(); definirValor(el, ''); },
+    passar_mouse: (el) => {
+        for (const tipo of ['mouseover', 'mouseenter', 'mousemove']) {
+            el.dispatchEvent(new MouseEvent(tipo, {bubbles: tipo !== 'mouseenter'}));
+        }
+    },
+    selecionar_texto: (el, p) => selecionar(el, (o) => o.text.trim() === String(p.texto).trim(), p.texto),
+    selecionar_valor: (el, p) => selecionar(el, (o) => o.value === String(p.valor), p.valor),
+    obter_texto: (el) => el.innerText,
+    obter_atributo: (el, p) => p.atributo === 'value' ? el.value : el.getAttribute(p.atributo),
+    rolar_ate_elemento: (el) => el.scrollIntoView(true),
+};
+return (async () => {
+    const resultados = [];
+    for (const p of passos) {
+        const inicio = agora();
+        try {
+            if (p.acao === 'aguardar_elemento_sumir') {
+                await esperar(() => !visivel(buscar(p)), p.timeout);
+                resultados.push({ok: true, valor: null, ms: agora() - inicio, espera_ms: agora() - inicio});
+                continue;
+            }
+            const el = await esperar(() => { const el = buscar(p); return condicoes[p.condicao](el) ? el : null; }, p.timeout);
+            const espera = agora() - inicio;
+            const valor = acoes[p.acao](el, p);
+            resultados.push({ok: true, valor: valor === undefined ? null : valor, ms: agora() - inicio, espera_ms: espera});
+        } catch (e) {
+            resultados.push({ok: false, erro: String((e && e.message) || e), ms: agora() - inicio});
+            break;
+        }
+    }
+    return resultados;
+})();
+"""
+
+def _verificar_xpath(xpath):
+
+    '''função interna que verifica (sem navegador) a sintaxe de um XPath e devolve o problema encontrado ou None'''
+    if not isinstance(xpath, str) or not xpath.strip():
+        return "XPath vazio"
+    try:
+        analisar_xpath(xpath)
+    except XPathInvalidoErro as e:
+        return f"{e.problema}, posição {e.posicao}"
+    return None
+
+class ResultadoPlano:
+    '''
+    Resultado da execução de um plano de ações.
+
+    Atributos:
+        passos (list): Um dicionário por passo executado (indice, acao, nome, modo, lote, ms, espera_ms, valor).
+        valores (dict): Os valores devolvidos pelos passos de leitura (chave: o "nome" do passo ou a sua posição).
+        lotes (int): Quantos scripts foram enviados ao navegador.
+        duracao (float): O tempo total da execução (em segundos).
+    '''
+    def __init__(self):
+
+        self.passos = []
+        self.valores = {}
+        self.lotes = 0
+        self.duracao = 0.0
+
+    def tempos(self):
+
+        '''devolve {nome ou posição do passo: tempo em milissegundos}'''
+        return {passo["nome"] if passo["nome"] is not None else passo["indice"]: passo["ms"] for passo in self.passos}
+
+    def __repr__(self):
+        return f"ResultadoPlano({len(self.passos)} passos, {self.lotes} lotes, {self.duracao:.3f}s)"
+
+class PlanoAcoes:
+    '''
+    Sequência de passos validada e agrupada em lotes.
+
+    Cada passo é um dicionário {"acao": ..., argumentos..., "nome": opcional, "timeout": opcional,
+    "semantica": opcional} ou a forma abreviada ["acao", argumento1, argumento2].
+
+    Args:
+        passos (list): Os passos do plano.
+        semantica (str): "nativa" (padrão) ou "script". Na nativa, só leituras e esperas são agrupadas em
+            lotes e as demais ações usam o driver (cliques e teclas reais). Na "script", cliques, digitação e
+            seleções também rodam dentro da página, disparando os eventos por JavaScript (bem mais rápido).
+        timeout (float, opcional): Tempo máximo de espera de cada passo em lote (em segundos). Padrão é o tempo_wait do driver.
+    '''
+    def __init__(self, passos: list, semantica: str = "nativa", timeout: float = None):
+
+        if semantica not in ("nativa", "script"):
+            raise PlanoInvalidoErro(f"Semântica '{semantica}' inválida. Escolha entre: nativa, script.")
+        self.semantica = semantica
+        self.timeout = timeout
+        self.passos = self._validar(passos)
+        self.lotes = self._agrupar()
+
+    @classmethod
+    def de_json(cls, origem: str, **kwargs):
+
+        '''
+        Cria o plano a partir de um arquivo JSON ou de um texto JSON.
+        O conteúdo pode ser a lista de passos ou {"passos": [...], "semantica": ..., "timeout": ...}.
+        '''
+        if os.path.isfile(origem):
+            with open(origem, "r", encoding="utf-8") as arquivo:
+                dados = json.load(arquivo)
+        else:
+            dados = json.loads(origem)
+        return cls._de_dados(dados, **kwargs)
+
+    @classmethod
+    def de_yaml(cls, origem: str, **kwargs):
+
+        '''
+        Cria o plano a partir de um arquivo YAML ou de um texto YAML (requer PyYAML).
+        '''
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Para ler planos em YAML instale o PyYAML: pip install pyyaml")
+        if os.path.isfile(origem):
+            with open(origem, "r", encoding="utf-8") as arquivo:
+                dados = yaml.safe_load(arquivo)
+        else:
+            dados = yaml.safe_load(origem)
+        return cls._de_dados(dados, **kwargs)
+
+    @classmethod
+    def carregar(cls, caminho: str, **kwargs):
+
+        '''
+        Cria o plano a partir de um arquivo .json, .yaml ou .yml.
+        '''
+        if caminho.lower().endswith((".yaml", ".yml")):
+            return cls.de_yaml(caminho, **kwargs)
+        return cls.de_json(caminho, **kwargs)
+
+    @classmethod
+    def _de_dados(cls, dados, **kwargs):
+
+        if isinstance(dados, dict):
+            opcoes = {chave: dados[chave] for chave in ("semantica", "timeout") if chave in dados}
+            opcoes.update(kwargs)
+            return cls(dados.get("passos", []), **opcoes)
+        return cls(dados, **kwargs)
+
+    def _validar(self, passos):
+
+        '''função interna que normaliza os passos e reúne todos os erros numa única exceção'''
+        if not isinstance(passos, (list, tuple)):
+            raise PlanoInvalidoErro("O plano deve ser uma lista de passos.")
+        normalizados = []
+        erros = []
+        for indice, passo in enumerate(passos):
+            if isinstance(passo, (list, tuple)) and passo:
+                acao, argumentos = passo[0], list(passo[1:])
+                nomes = ACOES.get(acao, ())
+                if len(argumentos) > len(nomes):
+                    erros.append(f"passo {indice} ({acao}): argumentos demais")
+                    continue
+                passo = {"acao": acao, **dict(zip(nomes, argumentos))}
+            if not isinstance(passo, dict) or "acao" not in passo:
+                erros.append(f"passo {indice}: informe um dicionário com 'acao' ou uma lista ['acao', ...]")
+                continue
+            acao = passo["acao"]
+            if acao not in ACOES:
+                erros.append(f"passo {indice}: ação '{acao}' desconhecida")
+                continue
+            faltando = [nome for nome in ACOES[acao] if nome not in passo]
+            if faltando:
+                erros.append(f"passo {indice} ({acao}): faltando {', '.join(faltando)}")
+            desconhecidos = [chave for chave in passo if chave not in ACOES[acao] and chave not in CAMPOS_GERAIS]
+            if desconhecidos:
+                erros.append(f"passo {indice} ({acao}): campos desconhecidos {', '.join(desconhecidos)}")
+            if "xpath" in ACOES[acao] and "xpath" in passo:
+                problema = _verificar_xpath(passo["xpath"])
+                if problema:
+                    erros.append(f"passo {indice} ({acao}): XPath inválido ({problema}): {passo['xpath']}")
+            if passo.get("semantica", self.semantica) not in ("nativa", "script"):
+                erros.append(f"passo {indice} ({acao}): semântica '{passo['semantica']}' inválida")
+            normalizados.append(dict(passo))
+        if erros:
+            raise PlanoInvalidoErro("Plano de ações inválido:\n" + "\n".join(erros))
+        return normalizados
+
+    def _pode_agrupar(self, passo: dict):
+
+        '''função interna que decide se o passo pode rodar dentro da página'''
+        if passo["acao"] in LOTE_SEMPRE:
+            return True
+        return passo["acao"] in LOTE_SCRIPT and passo.get("semantica", self.semantica) == "script"
+
+    def _agrupar(self):
+
+        '''função interna que junta os passos vizinhos que podem rodar no mesmo script (listas de índices)'''
+        lotes = []
+        atual = []
+        for indice, passo in enumerate(self.passos):
+            if self._pode_agrupar(passo):
+                atual.append(indice)
+                if passo["acao"] in ENCERRAM_LOTE:
+                    lotes.append(atual)
+                    atual = []
+            else:
+                if atual:
+                    lotes.append(atual)
+                    atual = []
+                lotes.append([indice])
+        if atual:
+            lotes.append(atual)
+        return lotes
+
+    def __len__(self):
+        return len(self.passos)
+
+    def __repr__(self):
+        return f"PlanoAcoes({len(self.passos)} passos em {len(self.lotes)} etapas, semantica={self.semantica!r})"
+
+def executar_plano(plano: PlanoAcoes, navegador):
+
+    '''
+    Executa o plano no navegador: os lotes com mais de um passo viram um único script,
+    os demais passos chamam os métodos do Navegador.
+
+    Args:
+        plano (PlanoAcoes): O plano.
+        navegador (Navegador): O navegador com o driver aberto.
+
+    Returns:
+        ResultadoPlano: Os tempos de cada passo e os valores lidos.
+    '''
+    resultado = ResultadoPlano()
+    inicio = time.perf_counter()
+    try:
+        for numero_lote, indices in enumerate(plano.lotes):
+            if len(indices) > 1:
+                _executar_lote(plano, navegador, indices, numero_lote, resultado)
+            else:
+                _executar_nativo(plano, navegador, indices[0], numero_lote, resultado)
+    finally:
+        resultado.duracao = time.perf_counter() - inicio
+    return resultado
+
+def _registrar(resultado: ResultadoPlano, indice: int, passo: dict, modo: str, lote: int, ms: float, espera_ms: float, valor):
+
+    '''função interna que guarda o tempo e o valor de um passo'''
+    resultado.passos.append({
+        "indice": indice, "acao": passo["acao"], "nome": passo.get("nome"), "modo": modo,
+        "lote": lote, "ms": ms, "espera_ms": espera_ms, "valor": valor,
+    })
+    if passo["acao"] in ("obter_texto", "obter_atributo"):
+        resultado.valores[passo["nome"] if passo.get("nome") is not None else indice] = valor
+
+def _executar_nativo(plano: PlanoAcoes, navegador, indice: int, numero_lote: int, resultado: ResultadoPlano):
+
+    '''função interna que executa um passo chamando o método do Navegador'''
+    passo = plano.passos[indice]
+    argumentos = {nome: passo[nome] for nome in ACOES[passo["acao"]]}
+    inicio = time.perf_counter()
+    try:
+        if passo["acao"] == "pausar":
+            time.sleep(float(argumentos["segundos"]))
+            valor = None
+        else:
+            valor = getattr(navegador, passo["acao"])(**argumentos)
+    except Exception as e:
+        raise ErroPlano(f"Passo {indice} ({passo['acao']}) falhou: {e}", indice, passo, resultado) from e
+    _registrar(resultado, indice, passo, "nativo", numero_lote, (time.perf_counter() - inicio) * 1000, None, valor)
+
+def _limite_script(driver):
+
+    '''função interna que lê o tempo limite de scripts atual do driver (em segundos), ou None se não for possível'''
+    try:
+        return driver.timeouts.script #selenium e DrissionPage expõem o mesmo atributo
+    except Exception:
+        return None
+
+def _definir_limite_script(driver, segundos: float):
+
+    '''função interna que define o tempo limite de scripts do driver (em segundos)'''
+    if hasattr(driver, "set_script_timeout"): #selenium
+        driver.set_script_timeout(segundos)
+    elif hasattr(getattr(driver, "set", None), "timeouts"): #DrissionPage
+        driver.set.timeouts(script=segundos)
+
+def _executar_lote(plano: PlanoAcoes, navegador, indices: list, numero_lote: int, resultado: ResultadoPlano):
+
+    '''função interna que executa vários passos num único script dentro da página'''
+    passos = []
+    for indice in indices:
+        passo = plano.passos[indice]
+        timeout = passo.get("timeout", plano.timeout)
+        timeout = navegador._tempo_wait if timeout is None else timeout
+        passos.append({
+            "acao": passo["acao"],
+            "condicao": CONDICOES_LOTE.get(passo["acao"]),
+            "timeout": float(timeout) * 1000,
+            **{nome: passo[nome] for nome in ACOES[passo["acao"]]},
+        })
+        if "xpath" in passos[-1]: #XPaths simples viram querySelector dentro da página
+            passos[-1]["css"] = seletor_css(compilar_localizador(passos[-1]["xpath"], navegador.compilar_xpath))
+    navegador._aplicar_stun()
+    #o limite de script vale para a sessão inteira: é aumentado só durante o lote e depois restaurado
+    anterior = _limite_script(navegador.driver)
+    _definir_limite_script(navegador.driver, sum(p["timeout"] for p in passos) / 1000 + 30)
+    try:
+        respostas = navegador._executar_script(SCRIPT_LOTE, passos, max(int(navegador._intervalo_poll * 1000), 10))
+    finally:
+        if anterior is not None:
+            _definir_limite_script(navegador.driver, anterior)
+    resultado.lotes += 1
+    for indice, resposta in zip(indices, respostas):
+        passo = plano.passos[indice]
+        if not resposta.get("ok"):
+            raise ErroPlano(f"Passo {indice} ({passo['acao']}) falhou: {resposta.get('erro')}", indice, passo, resultado)
+        navegador._acumular("espera", resposta.get("espera_ms", 0) / 1000)
+        _registrar(resultado, indice, passo, "lote", numero_lote, resposta["ms"], resposta.get("espera_ms"), resposta.get("valor"))
@@ -0,0 +1,330 @@
+"""
+processos do navegador: árvore, memória, registro em disco e encerramento garantido
+
+o driver (chromedriver/geckodriver/msedgedriver) é iniciado no seu próprio grupo de
+processos e os PIDs de cada sessão ficam registrados em ~/.cache/automaweb/processos
+(um arquivo por processo Python). assim o fechamento pode encerrar o grupo inteiro
+(SIGTERM e, se preciso, SIGKILL) quando o quit() trava, e uma execução seguinte
+consegue encontrar e encerrar os navegadores órfãos de um processo que morreu
+(ex: kill -9, falta de memória) sem mexer em navegadores de outros programas.
+
+a árvore e a memória são lidas do /proc, portanto só funcionam no Linux. o momento de
+início de cada processo (que distingue um PID reaproveitado) vem do /proc no Linux e do
+GetProcessTimes no Windows; nos outros sistemas ele não é conhecido e os órfãos não são encerrados.
+"""
+
+#bibliotecas para os processos e o registro em disco
+import threading
+import signal
+import json
+import time
+import os
+
+from .binarios import PASTA_CACHE_PADRAO
+
+#argumentos do subprocess.Popen que colocam o driver no seu próprio grupo de processos
+POPEN_NOVA_SESSAO = {"start_new_session": True} if os.name == "posix" else {}
+
+_SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM) #o Windows não tem SIGKILL
+
+if os.name == "nt":
+    import ctypes
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.OpenProcess.restype = wintypes.HANDLE
+    _kernel32.OpenProcess.argtypes = (wintypes.DWORD, wintypes.BOOL, wintypes.DWORD)
+    _kernel32.GetExitCodeProcess.argtypes = (wintypes.HANDLE, ctypes.POINTER(wintypes.DWORD))
+    _kernel32.GetProcessTimes.argtypes = (wintypes.HANDLE,) + (ctypes.POINTER(wintypes.FILETIME),) * 4
+    _kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+_CONSULTA_LIMITADA = 0x1000 #PROCESS_QUERY_LIMITED_INFORMATION
+_AINDA_ATIVO = 259 #STILL_ACTIVE
+
+def _arvore_processos(pids_raiz: list):
+
+    '''função interna que devolve os PIDs raiz e todos os seus descendentes (lendo o /proc do Linux)'''
+    if not os.path.isdir("/proc") or not pids_raiz:
+        return []
+    filhos = {}
+    for nome in os.listdir("/proc"):
+        if not nome.isdigit():
+            continue
+        try:
+            with open(f"/proc/{nome}/stat", "rb") as arquivo:
+                #o nome do processo pode ter espaços e parênteses, por isso o corte no último ")"
+                campos = arquivo.read().rsplit(b")", 1)[1].split()
+            filhos.setdefault(int(campos[1]), []).append(int(nome))
+        except (OSError, IndexError, ValueError):
+            continue
+    encontrados = []
+    pendentes = [pid for pid in pids_raiz if os.path.exists(f"/proc/{pid}")]
+    while pendentes:
+        pid = pendentes.pop()
+        if pid in encontrados:
+            continue
+        encontrados.append(pid)
+        pendentes.extend(filhos.get(pid, []))
+    return encontrados
+
+def _memoria_processos(pids: list):
+
+    '''função interna que soma a memória residente (em bytes) de uma lista de processos'''
+    tamanho_pagina = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/statm") as arquivo:
+                total += int(arquivo.read().split()[1]) * tamanho_pagina
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+def _estado_processo(pid: int):
+
+    '''função interna que lê o estado (R, S, Z...) e o momento de início de um processo, ou None se ele não existe'''
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as arquivo:
+            campos = arquivo.read().rsplit(b")", 1)[1].split()
+        return campos[0].decode(), int(campos[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+def _processo_windows(pid: int):
+
+    '''função interna que devolve (ainda ativo, momento de criação) de um processo no Windows, ou None se ele não existe'''
+    handle = _kernel32.OpenProcess(_CONSULTA_LIMITADA, False, pid)
+    if not handle:
+        return None
+    try:
+        codigo = wintypes.DWORD()
+        if not _kernel32.GetExitCodeProcess(handle, ctypes.byref(codigo)):
+            return None
+        tempos = [wintypes.FILETIME() for _ in range(4)] #criação, saída, kernel e usuário
+        if not _kernel32.GetProcessTimes(handle, *(ctypes.byref(tempo) for tempo in tempos)):
+            return codigo.value == _AINDA_ATIVO, None
+        return codigo.value == _AINDA_ATIVO, (tempos[0].dwHighDateTime << 32) | tempos[0].dwLowDateTime
+    finally:
+        _kernel32.CloseHandle(handle)
+
+def _inicio_processo(pid: int):
+
+    '''função interna que devolve o momento de início de um processo (distingue um PID reaproveitado), ou None se não for possível saber'''
+    if os.path.isdir("/proc"):
+        return (_estado_processo(pid) or (None, None))[1]
+    if os.name == "nt":
+        return (_processo_windows(pid) or (None, None))[1]
+    return None
+
+def _vivo(pid: int, inicio: int = None):
+
+    '''função interna que informa se o processo ainda roda (zumbis não contam) e, se informado, se é o mesmo processo (PID não reaproveitado)'''
+    if os.path.isdir("/proc"):
+        estado = _estado_processo(pid)
+        if estado is None or estado[0] in ("Z", "X"):
+            return False
+        return inicio is None or estado[1] == inicio
+    if os.name == "nt": #no Windows o os.kill(pid, 0) encerraria o processo (TerminateProcess)
+        processo = _processo_windows(pid)
+        if processo is None or not processo[0]:
+            return False
+        return inicio is None or processo[1] == inicio
+    try: #macOS/BSD: o sinal 0 apenas verifica se o PID existe
+        os.kill(pid, 0)
+        return True
+    except PermissionError: #existe, mas é de outro usuário
+        return True
+    except OSError:
+        return False
+
+def _recolher(pid: int):
+
+    '''função interna que recolhe o status de um processo filho já encerrado (evita zumbis)'''
+    try:
+        os.waitpid(pid, os.WNOHANG)
+    except (ChildProcessError, OSError, AttributeError):
+        pass
+
+def _sinalizar(pid: int, sinal):
+
+    '''função interna que envia o sinal ao grupo do processo (se ele for o líder de um grupo próprio) ou só ao processo'''
+    try:
+        if hasattr(os, "killpg") and os.getpgid(pid) == pid and pid != os.getpgid(0):
+            os.killpg(pid, sinal)
+        else:
+            os.kill(pid, sinal)
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+def encerrar_processos(pids: list, espera: float = 3):
+
+    '''
+    Encerra uma lista de processos: envia SIGTERM, aguarda e envia SIGKILL aos que não terminaram.
+    Processos líderes de um grupo próprio (o driver) recebem o sinal no grupo inteiro.
+
+    Args:
+        pids (list): Os PIDs (ou pares (pid, momento de início), para não atingir um PID reaproveitado).
+        espera (float): Quanto tempo aguardar (em segundos) entre o SIGTERM e o SIGKILL. Padrão é 3.
+
+    Returns:
+        int: Quantos processos precisaram de SIGKILL.
+    '''
+    alvos = [tuple(pid) if isinstance(pid, (list, tuple)) else (pid, None) for pid in pids]
+    #sem o momento de início informado, ele é lido agora: o SIGKILL depois da espera não atinge um PID reaproveitado nesse meio-tempo
+    alvos = [(pid, _inicio_processo(pid) if inicio is None else inicio) for pid, inicio in alvos]
+    alvos = [(pid, inicio) for pid, inicio in alvos if pid != os.getpid() and _vivo(pid, inicio)]
+    for pid, _ in alvos:
+        _sinalizar(pid, signal.SIGTERM)
+
+    limite = time.monotonic() + espera
+    while True:
+        for pid, _ in alvos:
+            _recolher(pid)
+        alvos = [(pid, inicio) for pid, inicio in alvos if _vivo(pid, inicio)]
+        if not alvos or time.monotonic() >= limite:
+            break
+        time.sleep(0.05)
+
+    for pid, _ in alvos:
+        _sinalizar(pid, _SIGKILL)
+    for pid, _ in alvos:
+        _recolher(pid)
+    return len(alvos)
+
+class RegistroProcessos:
+    '''
+    Registro em disco dos processos de navegador iniciados por este processo Python.
+    Cada processo Python grava um arquivo (<pid>.json) com as sessões abertas e os PIDs delas.
+
+    Args:
+        pasta (str, opcional): A pasta do registro. Padrão é ~/.cache/automaweb/processos (ou AUTOMAWEB_CACHE/processos).
+    '''
+    def __init__(self, pasta: str = None):
+
+        self.pasta = pasta or os.path.join(os.environ.get("AUTOMAWEB_CACHE") or PASTA_CACHE_PADRAO, "processos")
+        self._sessoes = {}
+        self._trava = threading.Lock()
+        self._dono = os.getpid()
+
+    def _arquivo(self, dono: int = None):
+
+        '''função interna que devolve o arquivo de registro de um processo Python'''
+        return os.path.join(self.pasta, f"{dono or self._dono}.json")
+
+    def _gravar(self):
+
+        '''função interna que grava as sessões deste processo (ou apaga o arquivo se não houver nenhuma)'''
+        if os.getpid() != self._dono: #processo filho (fork): o registro pertence ao pai
+            self._sessoes = {}
+            self._dono = os.getpid()
+        arquivo = self._arquivo()
+        try:
+            if not self._sessoes:
+                if os.path.exists(arquivo):
+                    os.remove(arquivo)
+                return
+            os.makedirs(self.pasta, exist_ok=True)
+            temporario = f"{arquivo}.tmp"
+            with open(temporario, "w", encoding="utf-8") as saida:
+                json.dump({"dono": [self._dono, _inicio_processo(self._dono)], "sessoes": self._sessoes}, saida)
+            os.replace(temporario, arquivo)
+        except OSError as e:
+            print(f"Não foi possível gravar o registro de processos: {e}")
+
+    def registrar(self, chave: str, pids: list):
+
+        '''
+        Registra (ou atualiza) os PIDs de uma sessão.
+
+        Args:
+            chave (str): A identificação da sessão.
+            pids (list): Os PIDs do driver e do navegador.
+        '''
+        with self._trava:
+            self._sessoes[chave] = [[pid, _inicio_processo(pid)] for pid in pids]
+            self._gravar()
+
+    def pids(self, chave: str):
+
+        '''
+        Devolve os PIDs registrados de uma sessão (com o momento de início de cada um).
+
+        Args:
+            chave (str): A identificação da sessão.
+
+        Returns:
+            list: Pares [pid, momento de início].
+        '''
+        with self._trava:
+            return list(self._sessoes.get(chave, []))
+
+    def remover(self, chave: str):
+
+        '''
+        Remove uma sessão do registro (depois de fechada).
+
+        Args:
+            chave (str): A identificação da sessão.
+        '''
+        with self._trava:
+            if self._sessoes.pop(chave, None) is not None:
+                self._gravar()
+
+    def limpar_orfaos(self, espera: float = 3):
+
+        '''
+        Encerra os navegadores registrados por processos Python que já morreram e apaga os registros deles.
+
+        Args:
+            espera (float): Quanto tempo aguardar entre o SIGTERM e o SIGKILL. Padrão é 3.
+
+        Returns:
+            int: Quantos processos órfãos foram encerrados.
+        '''
+        if not os.path.isdir(self.pasta):
+            return 0
+        encerrados = 0
+        for nome in os.listdir(self.pasta):
+            if not nome.endswith(".json"):
+                continue
+            arquivo = os.path.join(self.pasta, nome)
+            try:
+                with open(arquivo, encoding="utf-8") as entrada:
+                    conteudo = json.load(entrada)
+                dono, inicio_dono = conteudo["dono"]
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+            if dono == os.getpid() or _vivo(dono, inicio_dono):
+                continue
+            raizes = [pid for sessao in conteudo.get("sessoes", {}).values() for pid in sessao]
+            #sem o momento de início não há como saber se o PID ainda é do navegador ou foi reaproveitado: não é encerrado
+            vivos = [(pid, inicio) for pid, inicio in raizes if inicio is not None and _vivo(pid, inicio)]
+            #os descendentes (abas, GPU) também entram, mesmo que tenham sido adotados pelo init
+            alvos = vivos + [(pid, None) for pid in _arvore_processos([pid for pid, _ in vivos]) if pid not in dict(vivos)]
+            encerrar_processos(alvos, espera)
+            encerrados += len(alvos)
+            try:
+                os.remove(arquivo)
+            except OSError:
+                pass
+        return encerrados
+
+registro_processos = RegistroProcessos()
+
+def limpar_processos_orfaos(espera: float = 3):
+
+    '''
+    Encerra os navegadores e drivers deixados para trás por execuções anteriores que morreram sem fechar o driver
+    (ex: processo morto com kill -9 ou pelo sistema por falta de memória). Navegadores de outros programas não são afetados.
+
+    Args:
+        espera (float): Quanto tempo aguardar entre o SIGTERM e o SIGKILL (em segundos). Padrão é 3.
+
+    Returns:
+        int: Quantos processos órfãos foram encerrados.
+    '''
+    try:
+        return registro_processos.limpar_orfaos(espera)
+    except Exception as e:
+        print(f"Erro ao limpar os processos órfãos: {e}")
+        return 0
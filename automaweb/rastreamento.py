@@ -0,0 +1,163 @@
+"""
+rastreamento dos comandos WebDriver/CDP no formato do chrome://tracing (Trace Event Format)
+
+o arquivo gerado pode ser aberto no chrome://tracing ou em https://ui.perfetto.dev
+"""
+
+#bibliotecas para tarefas em segundo plano
+import threading
+
+#bibliotecas para manipulação de arquivos
+import json
+import time
+import os
+
+class RastreadorComandos:
+    '''
+    Registra cada comando enviado ao driver (com início, fim, sessão, aba e localizador)
+    e as ações do Navegador que os originaram, como eventos do chrome://tracing.
+
+    Args:
+        nome_processo (str): O nome exibido para o processo no visualizador. Padrão é "automaweb".
+    '''
+    def __init__(self, nome_processo: str = "automaweb"):
+
+        self.nome_processo = nome_processo
+        self._eventos = []
+        self._threads = {} #id da thread -> nome
+        self._lock = threading.Lock()
+        self._instalados = [] #(executor, execute original)
+        self._abas = {} #id da sessão -> handle da aba atual
+        self._pid = os.getpid()
+
+    @staticmethod
+    def _agora():
+
+        '''função interna que devolve o instante atual em microssegundos'''
+        return time.perf_counter_ns() // 1000
+
+    def instalar(self, driver, ao_comando=None):
+
+        '''
+        Passa a interceptar os comandos do executor do driver (selenium ou undetected-chromedriver).
+
+        Args:
+            driver: O driver cujo command_executor será interceptado.
+            ao_comando (callable, opcional): Função chamada (sem argumentos) a cada comando enviado.
+        '''
+        executor = getattr(driver, "command_executor", None)
+        if executor is None:
+            raise NotImplementedError("O driver atual não usa o executor de comandos do selenium e não pode ser rastreado.")
+        if any(instalado[0] is executor for instalado in self._instalados):
+            return
+
+        try:
+            self._abas[driver.session_id] = driver.current_window_handle
+        except Exception:
+            pass
+
+        original = executor.execute
+        rastreador = self
+
+        def execute(command, params):
+            params = params or {}
+            #o executor remove alguns parâmetros (ex: sessionId) ao montar a URL, então eles são lidos antes
+            sessao = params.get("sessionId")
+            argumentos = {"sessao": sessao, "aba": rastreador._abas.get(sessao)}
+            nome = command
+            if command == "executeCdpCommand":
+                nome = f"CDP {params.get('cmd')}"
+            #a busca pode sair como xpath, css ou id (ver localizadores.py): todas registram o localizador
+            if "using" in params:
+                argumentos["estrategia"] = params["using"]
+                argumentos["localizador"] = params.get("value")
+                if params["using"] == "xpath":
+                    argumentos["xpath"] = params.get("value")
+            if command == "switchToWindow":
+                argumentos["destino"] = params.get("handle")
+            if ao_comando is not None:
+                ao_comando()
+
+            inicio = rastreador._agora()
+            try:
+                return original(command, params)
+            except Exception as e:
+                argumentos["erro"] = type(e).__name__
+                raise
+            finally:
+                fim = rastreador._agora()
+                if command == "switchToWindow" and "erro" not in argumentos:
+                    rastreador._abas[sessao] = argumentos["destino"]
+                rastreador._adicionar(nome, "webdriver", inicio, fim, argumentos)
+
+        executor.execute = execute
+        self._instalados.append((executor, original))
+
+    def desinstalar(self):
+
+        '''
+        Para de interceptar os comandos (os eventos já registrados são mantidos).
+        '''
+        for executor, original in self._instalados:
+            executor.execute = original
+        self._instalados.clear()
+
+    def registrar_acao(self, nome: str, inicio: int, fim: int, argumentos: dict = None):
+
+        '''
+        Registra uma ação do Navegador (que engloba os comandos enviados durante ela).
+
+        Args:
+            nome (str): O nome da ação.
+            inicio (int): O instante de início (em microssegundos, ver _agora).
+            fim (int): O instante de término (em microssegundos).
+            argumentos (dict, opcional): Dados extras exibidos no visualizador.
+        '''
+        self._adicionar(nome, "acao", inicio, fim, argumentos or {})
+
+    def limpar(self):
+
+        '''descarta os eventos registrados'''
+        with self._lock:
+            self._eventos.clear()
+
+    def salvar(self, caminho: str):
+
+        '''
+        Salva os eventos num arquivo JSON compatível com chrome://tracing e Perfetto.
+
+        Args:
+            caminho (str): O caminho do arquivo JSON.
+
+        Returns:
+            str: O caminho do arquivo salvo.
+        '''
+        with self._lock:
+            eventos = list(self._eventos)
+            threads = dict(self._threads)
+
+        metadados = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": self.nome_processo}}]
+        for tid, nome in threads.items():
+            metadados.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": nome}})
+
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"traceEvents": metadados + eventos, "displayTimeUnit": "ms"}, arquivo, ensure_ascii=False)
+        return caminho
+
+    def _adicionar(self, nome, categoria, inicio, fim, argumentos):
+
+        '''função interna que adiciona um evento completo ("X") à lista'''
+        thread = threading.current_thread()
+        evento = {
+            "name": nome,
+            "cat": categoria,
+            "ph": "X",
+            "ts": inicio,
+            "dur": max(fim - inicio, 0),
+            "pid": self._pid,
+            "tid": thread.ident,
+            "args": argumentos,
+        }
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._eventos.append(evento)
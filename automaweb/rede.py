@@ -0,0 +1,244 @@
+"""
+captura das respostas de rede (XHR/fetch) de uma aba via CDP
+
+em vez de esperar a página renderizar os dados e lê-los célula a célula,
+a captura devolve o JSON que a própria página recebeu do servidor.
+"""
+
+#bibliotecas para tarefas em segundo plano
+import threading
+import queue
+
+#bibliotecas para manipulação de dados
+import base64
+import json
+import time
+import re
+
+class RespostaCapturada:
+    '''
+    Resposta de rede capturada numa aba.
+
+    Atributos:
+        url (str): A URL da requisição.
+        metodo (str): O método HTTP (GET, POST...).
+        status (int): O código HTTP.
+        tipo (str): O tipo do recurso segundo o navegador (XHR, Fetch, Document...).
+        mime (str): O tipo do conteúdo (ex: application/json).
+        cabecalhos (dict): Os cabeçalhos da resposta.
+        corpo (str | bytes): O corpo da resposta (bytes quando o conteúdo é binário).
+    '''
+    def __init__(self, url, metodo, status, tipo, mime, cabecalhos, corpo):
+
+        self.url = url
+        self.metodo = metodo
+        self.status = status
+        self.tipo = tipo
+        self.mime = mime
+        self.cabecalhos = cabecalhos
+        self.corpo = corpo
+
+    def json(self):
+
+        '''o corpo interpretado como JSON'''
+        corpo = self.corpo.decode("utf-8") if isinstance(self.corpo, bytes) else self.corpo
+        return json.loads(corpo)
+
+    def __repr__(self):
+        return f"RespostaCapturada({self.metodo} {self.url} -> {self.status})"
+
+class CapturaRede:
+    '''
+    Captura as respostas de uma aba cujas URLs combinam com um padrão.
+
+    Args:
+        sessao (SessaoCDP): A sessão CDP da aba.
+        padrao_url (str): Expressão regular procurada na URL (ex: r"/api/pedidos").
+        tipos (tuple, opcional): Tipos de recurso aceitos. Padrão é ("XHR", "Fetch"). Use None para aceitar todos.
+        metodo (str, opcional): Se fornecido, aceita apenas este método HTTP (ex: "POST").
+        fechar_sessao (bool): Se True, fecha a sessão CDP ao parar a captura. Padrão é False.
+    '''
+    def __init__(self, sessao, padrao_url: str, tipos: tuple = ("XHR", "Fetch"), metodo: str = None, fechar_sessao: bool = False):
+
+        self.sessao = sessao
+        self.padrao = re.compile(padrao_url)
+        self.tipos = tuple(tipos) if tipos else None
+        self.metodo = metodo.upper() if metodo else None
+        self._metodos = {} #id da requisição -> método
+        self._pendentes = {} #id da requisição -> dados da resposta ainda sem corpo
+        self._finalizadas = queue.Queue() #requisições prontas para buscar o corpo
+        self._respostas = queue.Queue() #respostas completas, na ordem de chegada
+        self._thread = None
+        self._fechar_sessao = fechar_sessao
+        self.ativa = False
+
+    def iniciar(self):
+
+        '''
+        Começa a capturar (habilita o domínio Network do CDP).
+        '''
+        if self.ativa:
+            return self
+        self.sessao.ao_receber("Network.requestWillBeSent", self._ao_enviar)
+        self.sessao.ao_receber("Network.responseReceived", self._ao_responder)
+        self.sessao.ao_receber("Network.loadingFinished", self._ao_finalizar)
+        self.sessao.ao_receber("Network.loadingFailed", self._ao_falhar)
+        #o corpo só pode ser pedido fora da thread de leitura do websocket (senão ela esperaria por si mesma)
+        self._thread = threading.Thread(target=self._buscar_corpos, name="automaweb-rede", daemon=True)
+        self._thread.start()
+        self.sessao.executar("Network.enable")
+        self.ativa = True
+        return self
+
+    def parar(self):
+
+        '''
+        Para a captura (as respostas já capturadas continuam disponíveis em aguardar()).
+        '''
+        if not self.ativa:
+            return
+        self.ativa = False
+        try:
+            if self.sessao.aberta:
+                self.sessao.executar("Network.disable", timeout=5)
+        finally:
+            for evento, funcao in (
+                ("Network.requestWillBeSent", self._ao_enviar),
+                ("Network.responseReceived", self._ao_responder),
+                ("Network.loadingFinished", self._ao_finalizar),
+                ("Network.loadingFailed", self._ao_falhar),
+            ):
+                self.sessao.remover_ouvinte(evento, funcao)
+            self._finalizadas.put(None)
+            self._thread.join()
+            self._respostas.put(None) #acorda quem estiver iterando
+            if self._fechar_sessao:
+                self.sessao.fechar()
+
+    def retomar(self, sessao):
+
+        '''
+        Volta a capturar numa nova sessão CDP (ex: depois de reciclar o navegador). As respostas já
+        capturadas continuam disponíveis; as requisições em andamento na sessão antiga são descartadas.
+
+        Args:
+            sessao (SessaoCDP): A sessão da aba do navegador reaberto.
+        '''
+        self.parar()
+        self._metodos.clear()
+        self._pendentes.clear()
+        self.sessao = sessao
+        return self.iniciar()
+
+    def aguardar(self, timeout: float = 30):
+
+        '''
+        Bloqueia até a próxima resposta capturada.
+
+        Args:
+            timeout (float): Tempo máximo de espera (em segundos). Padrão é 30.
+
+        Returns:
+            RespostaCapturada: A resposta.
+        '''
+        limite = time.monotonic() + timeout
+        while True:
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                raise TimeoutError(f"Nenhuma resposta para '{self.padrao.pattern}' em {timeout} segundos.")
+            try:
+                resposta = self._respostas.get(timeout=restante)
+            except queue.Empty:
+                continue
+            if resposta is not None:
+                return resposta
+            if not self.ativa and self._respostas.empty():
+                raise TimeoutError(f"A captura de '{self.padrao.pattern}' foi encerrada sem novas respostas.")
+
+    def iterar(self, timeout: float = None):
+
+        '''
+        Gera as respostas conforme chegam, até a captura ser parada
+        (ou até passar "timeout" segundos sem nenhuma resposta nova).
+
+        Args:
+            timeout (float, opcional): Tempo máximo de espera entre uma resposta e outra (em segundos).
+        '''
+        while True:
+            try:
+                resposta = self._respostas.get(timeout=timeout)
+            except queue.Empty:
+                return
+            if resposta is None:
+                if not self.ativa:
+                    return
+                continue
+            yield resposta
+
+    def __iter__(self):
+        return self.iterar()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
+
+    def _aceita(self, url: str, tipo: str = None):
+
+        '''função interna que aplica os filtros de URL e tipo'''
+        if self.tipos is not None and tipo is not None and tipo not in self.tipos:
+            return False
+        return bool(self.padrao.search(url))
+
+    def _ao_enviar(self, parametros):
+
+        pedido = parametros.get("request", {})
+        if self._aceita(pedido.get("url", ""), parametros.get("type")):
+            self._metodos[parametros["requestId"]] = pedido.get("method")
+
+    def _ao_responder(self, parametros):
+
+        resposta = parametros.get("response", {})
+        if not self._aceita(resposta.get("url", ""), parametros.get("type")):
+            return
+        metodo = self._metodos.pop(parametros["requestId"], None)
+        if self.metodo and metodo and metodo.upper() != self.metodo:
+            return
+        self._pendentes[parametros["requestId"]] = {
+            "url": resposta.get("url"),
+            "metodo": metodo,
+            "status": resposta.get("status"),
+            "tipo": parametros.get("type"),
+            "mime": resposta.get("mimeType"),
+            "cabecalhos": resposta.get("headers", {}),
+        }
+
+    def _ao_finalizar(self, parametros):
+
+        dados = self._pendentes.pop(parametros["requestId"], None)
+        if dados is not None:
+            self._finalizadas.put((parametros["requestId"], dados))
+
+    def _ao_falhar(self, parametros):
+
+        self._pendentes.pop(parametros["requestId"], None)
+        self._metodos.pop(parametros["requestId"], None)
+
+    def _buscar_corpos(self):
+
+        '''função interna (thread própria) que pede o corpo de cada resposta finalizada'''
+        while True:
+            item = self._finalizadas.get()
+            if item is None:
+                return
+            id_requisicao, dados = item
+            try:
+                resultado = self.sessao.executar("Network.getResponseBody", {"requestId": id_requisicao})
+                corpo = resultado.get("body", "")
+                if resultado.get("base64Encoded"):
+                    corpo = base64.b64decode(corpo)
+            except Exception as e:
+                print(f"Erro ao obter o corpo de {dados['url']}: {e}")
+                continue
+            self._respostas.put(RespostaCapturada(corpo=corpo, **dados))
@@ -0,0 +1,354 @@
+"""
+sessão HTTP leve (http.client) que reaproveita a autenticação do navegador
+
+útil para as etapas que só baixam CSV/JSON/arquivos depois do login:
+as requisições saem direto do Python, sem passar pelo renderizador do navegador.
+"""
+
+#bibliotecas de rede da biblioteca padrão
+from urllib.parse import urlsplit, urlencode, urljoin
+import urllib.request
+import http.cookiejar
+import http.client
+import ssl
+
+#bibliotecas para tarefas em segundo plano
+import threading
+
+#bibliotecas para manipulação de arquivos
+import json as _json
+import zlib
+import gzip
+import os
+
+class RespostaHTTP:
+    '''
+    Resposta de uma requisição feita pela SessaoHTTP.
+
+    Atributos:
+        status (int): O código HTTP da resposta.
+        url (str): A URL final (após redirecionamentos).
+        cabecalhos (dict): Os cabeçalhos da resposta (nomes em minúsculas).
+        conteudo (bytes): O corpo da resposta (já descompactado).
+    '''
+    def __init__(self, status: int, url: str, cabecalhos: dict, conteudo: bytes):
+
+        self.status = status
+        self.url = url
+        self.cabecalhos = cabecalhos
+        self.conteudo = conteudo
+
+    @property
+    def ok(self):
+
+        '''True se o status for 2xx'''
+        return 200 <= self.status < 300
+
+    @property
+    def texto(self):
+
+        '''o corpo da resposta decodificado como texto (usa o charset informado pelo servidor)'''
+        tipo = self.cabecalhos.get("content-type", "")
+        codificacao = "utf-8"
+        if "charset=" in tipo:
+            codificacao = tipo.split("charset=")[-1].split(";")[0].strip()
+        return self.conteudo.decode(codificacao, errors="replace")
+
+    def json(self):
+
+        '''o corpo da resposta interpretado como JSON'''
+        return _json.loads(self.texto)
+
+    def verificar(self):
+
+        '''lança um erro se o status não for 2xx (devolve a própria resposta, para encadear)'''
+        if not self.ok:
+            raise http.client.HTTPException(f"HTTP {self.status} ao acessar {self.url}")
+        return self
+
+class _RespostaCookies:
+    '''adaptador mínimo para o http.cookiejar ler os cabeçalhos Set-Cookie de um http.client.HTTPResponse'''
+    def __init__(self, mensagem):
+        self._mensagem = mensagem
+
+    def info(self):
+        return self._mensagem
+
+class SessaoHTTP:
+    '''
+    Sessão HTTP com cookies e conexões keep-alive reaproveitadas (pool por host). Pode ser usada por várias threads.
+
+    Args:
+        cabecalhos (dict, opcional): Cabeçalhos enviados em todas as requisições (ex: User-Agent).
+        conexoes_por_host (int): Quantas conexões ociosas manter abertas por host. Padrão é 4.
+        timeout (float): Tempo máximo de cada operação de rede (em segundos). Padrão é 60.
+        verificar_ssl (bool): Se False, aceita certificados inválidos. Padrão é True.
+    '''
+    REDIRECIONAMENTOS = (301, 302, 303, 307, 308)
+
+    def __init__(self, cabecalhos: dict = None, conexoes_por_host: int = 4, timeout: float = 60, verificar_ssl: bool = True):
+
+        self.cookies = http.cookiejar.CookieJar()
+        self.cabecalhos = dict(cabecalhos or {})
+        self.conexoes_por_host = conexoes_por_host
+        self.timeout = timeout
+        self._contexto_ssl = ssl.create_default_context() if verificar_ssl else ssl._create_unverified_context()
+        self._ociosas = {} #(esquema, host, porta) -> lista de conexões livres
+        self._lock = threading.Lock()
+        self.cookies_alterados = False #indica que o servidor enviou cookies novos (ver Navegador.sincronizar_cookies_http)
+
+    ### COOKIES
+
+    def carregar_cookies(self, cookies: list):
+
+        '''
+        Adiciona cookies no formato do selenium (get_cookies) ou do CDP (Network.getAllCookies).
+
+        Args:
+            cookies (list): Lista de dicionários com name, value, domain, path, secure, expiry/expires...
+        '''
+        for cookie in cookies:
+            dominio = cookie.get("domain") or ""
+            expiracao = cookie.get("expiry", cookie.get("expires"))
+            if expiracao is not None and expiracao < 0: #o CDP usa -1 para cookies de sessão
+                expiracao = None
+            self.cookies.set_cookie(http.cookiejar.Cookie(
+                version=0, name=cookie["name"], value=cookie["value"],
+                port=None, port_specified=False,
+                domain=dominio, domain_specified=dominio.startswith("."), domain_initial_dot=dominio.startswith("."),
+                path=cookie.get("path") or "/", path_specified=True,
+                secure=bool(cookie.get("secure")),
+                expires=int(expiracao) if expiracao is not None else None, discard=expiracao is None,
+                comment=None, comment_url=None,
+                rest={"HttpOnly": None} if cookie.get("httpOnly") else {},
+            ))
+
+    def exportar_cookies(self):
+
+        '''
+        Devolve os cookies da sessão no formato do selenium/CDP (para devolvê-los ao navegador).
+
+        Returns:
+            list: Lista de dicionários com name, value, domain, path, secure, httpOnly e expiry.
+        '''
+        cookies = []
+        for cookie in self.cookies:
+            dados = {
+                "name": cookie.name,
+                "value": cookie.value,
+                "domain": cookie.domain,
+                "path": cookie.path,
+                "secure": cookie.secure,
+                "httpOnly": cookie.has_nonstandard_attr("HttpOnly"),
+            }
+            if cookie.expires is not None:
+                dados["expiry"] = int(cookie.expires)
+            cookies.append(dados)
+        return cookies
+
+    ### REQUISIÇÕES
+
+    def requisitar(self, metodo: str, url: str, dados=None, json=None, cabecalhos: dict = None, seguir_redirecionamentos: bool = True):
+
+        '''
+        Faz uma requisição HTTP e lê a resposta inteira em memória.
+
+        Args:
+            metodo (str): O método HTTP (GET, POST, PUT...).
+            url (str): A URL da requisição.
+            dados (dict | str | bytes, opcional): O corpo. Dicionários são enviados como formulário (x-www-form-urlencoded).
+            json (opcional): Um objeto enviado como JSON no corpo.
+            cabecalhos (dict, opcional): Cabeçalhos extras desta requisição.
+            seguir_redirecionamentos (bool): Se True, segue redirecionamentos (até 10). Padrão é True.
+
+        Returns:
+            RespostaHTTP: A resposta.
+        '''
+        resposta, conexao, url = self._enviar(metodo, url, dados, json, cabecalhos, seguir_redirecionamentos, compactado=True)
+        try:
+            conteudo = resposta.read()
+        except Exception:
+            conexao.close()
+            raise
+        self._devolver(conexao, resposta)
+
+        codificacao = (resposta.getheader("Content-Encoding") or "").lower()
+        if codificacao == "gzip":
+            conteudo = gzip.decompress(conteudo)
+        elif codificacao == "deflate":
+            conteudo = zlib.decompress(conteudo)
+        cabecalhos_resposta = {chave.lower(): valor for chave, valor in resposta.getheaders()}
+        return RespostaHTTP(resposta.status, url, cabecalhos_resposta, conteudo)
+
+    def get(self, url: str, **kwargs):
+
+        '''atalho para requisitar("GET", url, ...)'''
+        return self.requisitar("GET", url, **kwargs)
+
+    def post(self, url: str, dados=None, json=None, **kwargs):
+
+        '''atalho para requisitar("POST", url, ...)'''
+        return self.requisitar("POST", url, dados=dados, json=json, **kwargs)
+
+    def baixar(self, url: str, destino: str, metodo: str = "GET", dados=None, tamanho_bloco: int = 1024 * 1024, cabecalhos: dict = None):
+
+        '''
+        Baixa um arquivo gravando direto em disco, em blocos (não carrega o arquivo inteiro na memória).
+
+        Args:
+            url (str): A URL do arquivo.
+            destino (str): O caminho do arquivo de saída ou uma pasta (o nome vem do Content-Disposition ou da URL).
+            metodo (str): O método HTTP. Padrão é "GET".
+            dados (opcional): O corpo da requisição (ver requisitar).
+            tamanho_bloco (int): O tamanho de cada bloco lido (em bytes). Padrão é 1 MB.
+            cabecalhos (dict, opcional): Cabeçalhos extras desta requisição.
+
+        Returns:
+            str: O caminho do arquivo baixado.
+        '''
+        resposta, conexao, url = self._enviar(metodo, url, dados, None, cabecalhos, True, compactado=False)
+        try:
+            if not 200 <= resposta.status < 300:
+                resposta.read()
+                raise http.client.HTTPException(f"HTTP {resposta.status} ao baixar {url}")
+            if os.path.isdir(destino):
+                destino = os.path.join(destino, self._nome_arquivo(resposta, url))
+            temporario = f"{destino}.parcial"
+            with open(temporario, "wb") as arquivo:
+                while True:
+                    bloco = resposta.read(tamanho_bloco)
+                    if not bloco:
+                        break
+                    arquivo.write(bloco)
+            os.replace(temporario, destino)
+        except Exception:
+            conexao.close()
+            raise
+        self._devolver(conexao, resposta)
+        return destino
+
+    def fechar(self):
+
+        '''
+        Fecha todas as conexões ociosas do pool.
+        '''
+        with self._lock:
+            conexoes = [conexao for lista in self._ociosas.values() for conexao in lista]
+            self._ociosas.clear()
+        for conexao in conexoes:
+            conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.fechar()
+
+    ### FUNÇÕES INTERNAS
+
+    def _enviar(self, metodo, url, dados, json, cabecalhos, seguir_redirecionamentos, compactado):
+
+        '''função interna que envia a requisição (seguindo redirecionamentos) e devolve a resposta ainda não lida'''
+        corpo, tipo = self._montar_corpo(dados, json)
+        for _ in range(10):
+            pedido = urllib.request.Request(url, method=metodo)
+            self.cookies.add_cookie_header(pedido)
+            cabecalhos_envio = {
+                "Accept-Encoding": "gzip, deflate" if compactado else "identity",
+                **self.cabecalhos,
+                **(cabecalhos or {}),
+            }
+            if pedido.get_header("Cookie"):
+                cabecalhos_envio["Cookie"] = pedido.get_header("Cookie")
+            if tipo and corpo is not None:
+                cabecalhos_envio.setdefault("Content-Type", tipo)
+
+            partes = urlsplit(url)
+            caminho = partes.path or "/"
+            if partes.query:
+                caminho += f"?{partes.query}"
+
+            resposta, conexao = self._executar(partes, metodo, caminho, corpo, cabecalhos_envio)
+            self.cookies.extract_cookies(_RespostaCookies(resposta.msg), pedido)
+            if resposta.msg.get_all("Set-Cookie"):
+                self.cookies_alterados = True
+
+            if not seguir_redirecionamentos or resposta.status not in self.REDIRECIONAMENTOS or not resposta.getheader("Location"):
+                return resposta, conexao, url
+
+            #redirecionamento: descarta o corpo, devolve a conexão e repete na nova URL
+            resposta.read()
+            self._devolver(conexao, resposta)
+            url = urljoin(url, resposta.getheader("Location"))
+            if resposta.status == 303 or (resposta.status in (301, 302) and metodo == "POST"):
+                metodo, corpo, tipo = "GET", None, None
+        raise http.client.HTTPException(f"Redirecionamentos demais ao acessar {url}")
+
+    def _executar(self, partes, metodo, caminho, corpo, cabecalhos):
+
+        '''função interna que envia numa conexão do pool (refaz uma vez se a conexão reaproveitada tiver sido fechada)'''
+        for tentativa in range(2):
+            conexao, reaproveitada = self._obter_conexao(partes)
+            try:
+                conexao.request(metodo, caminho, body=corpo, headers=cabecalhos)
+                return conexao.getresponse(), conexao
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.BadStatusLine):
+                conexao.close()
+                if not reaproveitada or tentativa:
+                    raise
+            except Exception:
+                conexao.close()
+                raise
+
+    def _obter_conexao(self, partes):
+
+        '''função interna que pega uma conexão ociosa do pool ou abre uma nova'''
+        esquema = partes.scheme.lower()
+        porta = partes.port or (443 if esquema == "https" else 80)
+        chave = (esquema, partes.hostname, porta)
+        with self._lock:
+            ociosas = self._ociosas.get(chave)
+            if ociosas:
+                return ociosas.pop(), True
+        if esquema == "https":
+            conexao = http.client.HTTPSConnection(partes.hostname, porta, timeout=self.timeout, context=self._contexto_ssl)
+        else:
+            conexao = http.client.HTTPConnection(partes.hostname, porta, timeout=self.timeout)
+        conexao._automaweb_chave = chave
+        return conexao, False
+
+    def _devolver(self, conexao, resposta):
+
+        '''função interna que devolve a conexão ao pool (se o servidor permitir keep-alive)'''
+        if resposta.will_close:
+            conexao.close()
+            return
+        with self._lock:
+            ociosas = self._ociosas.setdefault(conexao._automaweb_chave, [])
+            if len(ociosas) < self.conexoes_por_host:
+                ociosas.append(conexao)
+                return
+        conexao.close()
+
+    @staticmethod
+    def _montar_corpo(dados, json):
+
+        '''função interna que converte os dados da requisição em bytes e informa o Content-Type'''
+        if json is not None:
+            return _json.dumps(json).encode("utf-8"), "application/json"
+        if dados is None:
+            return None, None
+        if isinstance(dados, dict):
+            return urlencode(dados).encode("utf-8"), "application/x-www-form-urlencoded"
+        if isinstance(dados, str):
+            return dados.encode("utf-8"), None
+        return dados, None
+
+    @staticmethod
+    def _nome_arquivo(resposta, url):
+
+        '''função interna que descobre o nome do arquivo pelo Content-Disposition ou pela URL'''
+        disposicao = resposta.getheader("Content-Disposition") or ""
+        if "filename=" in disposicao:
+            return os.path.basename(disposicao.split("filename=")[-1].split(";")[0].strip().strip('"'))
+        return os.path.basename(urlsplit(url).path) or "download"
@@ -0,0 +1,233 @@
+"""
+benchmark offline do Navegador usando o site sintético local (site_sintetico.py)
+
+mede, para cada combinação de navegador, perfil de abertura, modo headless, tempo de stun e intervalo de poll:
+    - tempo de inicialização do driver
+    - ações por segundo (digitar, limpar, clicar, selecionar, obter texto)
+    - leitura de tabelas grandes
+    - latência das esperas (quanto tempo após o elemento aparecer a espera retorna)
+    - troca de iframes aninhados
+    - downloads
+    - memória do navegador (RSS, apenas Linux)
+
+exemplo:
+    python benchmark.py --navegadores chrome firefox --perfis padrao servidor --headless sim --stuns 0 0.1 --polls 0.5 0.1
+"""
+
+import sys
+import os
+
+diretorio_atual = os.path.dirname(os.path.abspath(__file__))
+diretorio_raiz = os.path.dirname(os.path.dirname(diretorio_atual))
+sys.path.append(diretorio_raiz)
+
+from site_sintetico import SiteSintetico
+from automaweb import Navegador, aguardar_arquivo
+import automaweb
+
+import statistics
+import itertools
+import argparse
+import datetime
+import platform
+import tempfile
+import shutil
+import json
+import time
+import csv
+
+def medir(funcao, repeticoes: int):
+
+    '''executa a função N vezes e devolve as estatísticas de tempo'''
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    tempos_ordenados = sorted(tempos)
+    return {
+        "repeticoes": repeticoes,
+        "total_s": sum(tempos),
+        "por_segundo": repeticoes / sum(tempos) if sum(tempos) else None,
+        "media_ms": statistics.mean(tempos) * 1000,
+        "p50_ms": tempos_ordenados[len(tempos) // 2] * 1000,
+        "p95_ms": tempos_ordenados[min(int(len(tempos) * 0.95), len(tempos) - 1)] * 1000,
+    }
+
+def cenario_formulario(nav: Navegador, site: SiteSintetico, repeticoes: int):
+
+    nav.abrir_url(site.url("formulario"))
+    return {
+        "digitar": medir(lambda: nav.digitar("//input[@id='nome']", "automaweb"), repeticoes),
+        "limpar": medir(lambda: nav.limpar("//input[@id='nome']"), repeticoes),
+        "clicar": medir(lambda: nav.clicar("//button[@id='enviar']"), repeticoes),
+        "selecionar_valor": medir(lambda: nav.selecionar_valor("//select[@id='estado']", "RJ"), repeticoes),
+        "obter_texto": medir(lambda: nav.obter_texto("//div[@id='resultado']"), repeticoes),
+        "verifica_selecionado": medir(lambda: nav.verifica_selecionado("//input[@id='aceite']"), repeticoes),
+    }
+
+def cenario_tabela(nav: Navegador, site: SiteSintetico, repeticoes: int, linhas: int):
+
+    carregamento = medir(lambda: nav.abrir_url(site.url(f"tabela?linhas={linhas}&colunas=10")), 1)
+    return {
+        "abrir_url": carregamento,
+        "encontrar_elementos_linhas": medir(lambda: nav.encontrar_elementos("//table[@id='tabela']/tbody/tr"), max(repeticoes // 5, 1)),
+        "obter_texto_celula": medir(lambda: nav.obter_texto(f"//tr[@id='linha-{linhas - 1}']/td[@class='c9']"), repeticoes),
+    }
+
+def cenario_espera(nav: Navegador, site: SiteSintetico, repeticoes: int, atraso_ms: int):
+
+    excessos = []
+    sumir = []
+    for _ in range(repeticoes):
+        nav.abrir_url(site.url(f"atrasado?ms={atraso_ms}"))
+        nav.obter_texto("//div[@id='alvo']")
+        #quanto tempo depois do elemento aparecer a espera percebeu (depende do intervalo de poll)
+        excessos.append(nav._executar_script("return performance.now() - window.__inserido;"))
+        inicio = time.perf_counter()
+        nav.aguardar_elemento_sumir("//div[@id='carregando']")
+        sumir.append((time.perf_counter() - inicio) * 1000)
+    return {
+        "atraso_ms": atraso_ms,
+        "latencia_deteccao_media_ms": statistics.mean(excessos),
+        "latencia_deteccao_max_ms": max(excessos),
+        "aguardar_elemento_sumir_media_ms": statistics.mean(sumir),
+    }
+
+def cenario_iframes(nav: Navegador, site: SiteSintetico, repeticoes: int, niveis: int):
+
+    nav.abrir_url(site.url(f"iframes?niveis={niveis}"))
+
+    def entrar_clicar_sair():
+        for _ in range(niveis):
+            nav.entrar_iframe("//iframe[@id='quadro']")
+        nav.clicar("//button[@id='botao']")
+        nav.sair_iframe()
+
+    return {"niveis": niveis, "entrar_clicar_sair": medir(entrar_clicar_sair, repeticoes)}
+
+def cenario_download(nav: Navegador, site: SiteSintetico, repeticoes: int, kb: int):
+
+    if nav.navegador == "firefox":
+        return {"ignorado": "o Firefox não permite trocar a pasta de download em tempo de execução"}
+    pasta = tempfile.mkdtemp(prefix="automaweb_benchmark_")
+    try:
+        nav._executar_cdp("Browser.setDownloadBehavior", {"behavior": "allow", "downloadPath": pasta})
+        contador = itertools.count()
+
+        def baixar():
+            nome = f"arquivo_{next(contador)}.bin"
+            nav.abrir_url(site.url(f"download?kb={kb}&link=1&nome={nome}"))
+            nav.clicar("//a[@id='baixar']")
+            aguardar_arquivo(os.path.join(pasta, nome), timeout=60)
+
+        return {"kb": kb, "baixar": medir(baixar, repeticoes)}
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+def executar_configuracao(configuracao: dict, site: SiteSintetico, argumentos):
+
+    '''abre um navegador com a configuração informada, roda todos os cenários e fecha'''
+    nav = Navegador(tempo_stun=configuracao["stun"], navegador=configuracao["navegador"])
+    resultado = {"configuracao": configuracao}
+
+    resultado["inicializacao_s"] = nav.abrir_driver(
+        headless=configuracao["headless"], intervalo_poll=configuracao["poll"], perfil=configuracao["perfil"]
+    )
+
+    try:
+        cenarios = {
+            "formulario": lambda: cenario_formulario(nav, site, argumentos.repeticoes),
+            "tabela": lambda: cenario_tabela(nav, site, argumentos.repeticoes, argumentos.linhas),
+            "espera": lambda: cenario_espera(nav, site, max(argumentos.repeticoes // 5, 1), argumentos.atraso),
+            "iframes": lambda: cenario_iframes(nav, site, max(argumentos.repeticoes // 5, 1), argumentos.niveis),
+            "download": lambda: cenario_download(nav, site, max(argumentos.repeticoes // 10, 1), argumentos.kb),
+        }
+        for nome, cenario in cenarios.items():
+            if argumentos.cenarios and nome not in argumentos.cenarios:
+                continue
+            try:
+                resultado[nome] = cenario()
+            except Exception as e:
+                resultado[nome] = {"erro": f"{type(e).__name__}: {e}"}
+        resultado["memoria_mb"] = nav.memoria_navegador()
+        resultado["metricas"] = nav.metricas.resumo()
+    finally:
+        nav.fechar_driver()
+    return resultado
+
+def linhas_csv(resultado: dict):
+
+    '''achata as medições de um resultado em linhas (configuração, cenário, medida, valor)'''
+    configuracao = resultado["configuracao"]
+    base = [configuracao["navegador"], configuracao["perfil"], configuracao["headless"], configuracao["stun"], configuracao["poll"]]
+    yield base + ["geral", "inicializacao_s", resultado["inicializacao_s"]]
+    yield base + ["geral", "memoria_mb", resultado.get("memoria_mb")]
+    for cenario, medidas in resultado.items():
+        if cenario in ("configuracao", "inicializacao_s", "memoria_mb", "metricas") or not isinstance(medidas, dict):
+            continue
+        for medida, valor in medidas.items():
+            if isinstance(valor, dict):
+                for chave in ("por_segundo", "media_ms", "p95_ms"):
+                    yield base + [cenario, f"{medida}.{chave}", valor.get(chave)]
+            else:
+                yield base + [cenario, medida, valor]
+
+def main(argv=None):
+
+    analisador = argparse.ArgumentParser(description="Benchmark offline do automaweb.")
+    analisador.add_argument("--navegadores", nargs="+", default=["chrome"], choices=["chrome", "edge", "firefox"])
+    analisador.add_argument("--headless", nargs="+", default=["sim"], choices=["sim", "nao"])
+    analisador.add_argument("--perfis", nargs="+", default=["padrao"], choices=["padrao", "servidor"])
+    analisador.add_argument("--stuns", nargs="+", type=float, default=[0])
+    analisador.add_argument("--polls", nargs="+", type=float, default=[0.5])
+    analisador.add_argument("--cenarios", nargs="+", choices=["formulario", "tabela", "espera", "iframes", "download"])
+    analisador.add_argument("--repeticoes", type=int, default=20)
+    analisador.add_argument("--linhas", type=int, default=2000, help="linhas da tabela grande")
+    analisador.add_argument("--atraso", type=int, default=300, help="atraso (ms) do elemento na página de espera")
+    analisador.add_argument("--niveis", type=int, default=3, help="níveis de iframes aninhados")
+    analisador.add_argument("--kb", type=int, default=512, help="tamanho do arquivo de download")
+    analisador.add_argument("--saida", default=os.path.join(diretorio_atual, "resultados_benchmark"))
+    argumentos = analisador.parse_args(argv)
+
+    os.makedirs(argumentos.saida, exist_ok=True)
+    carimbo = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    execucao = {
+        "gerado_em": datetime.datetime.now().isoformat(),
+        "ambiente": {
+            "python": platform.python_version(),
+            "sistema": platform.platform(),
+            "automaweb": getattr(automaweb, "__version__", None),
+            "argumentos": vars(argumentos),
+        },
+        "resultados": [],
+    }
+
+    with SiteSintetico() as site:
+        combinacoes = itertools.product(argumentos.navegadores, argumentos.perfis, argumentos.headless, argumentos.stuns, argumentos.polls)
+        for navegador, perfil, headless, stun, poll in combinacoes:
+            configuracao = {"navegador": navegador, "perfil": perfil, "headless": headless == "sim", "stun": stun, "poll": poll}
+            print(f"Executando {configuracao}...")
+            try:
+                execucao["resultados"].append(executar_configuracao(configuracao, site, argumentos))
+            except Exception as e:
+                execucao["resultados"].append({"configuracao": configuracao, "erro": f"{type(e).__name__}: {e}"})
+                print(f"Erro na configuração {configuracao}: {e}")
+
+    caminho_json = os.path.join(argumentos.saida, f"benchmark_{carimbo}.json")
+    with open(caminho_json, "w", encoding="utf-8") as arquivo:
+        json.dump(execucao, arquivo, indent=4, ensure_ascii=False)
+
+    caminho_csv = os.path.join(argumentos.saida, f"benchmark_{carimbo}.csv")
+    with open(caminho_csv, "w", newline="", encoding="utf-8") as arquivo:
+        escritor = csv.writer(arquivo)
+        escritor.writerow(["navegador", "perfil", "headless", "stun", "poll", "cenario", "medida", "valor"])
+        for resultado in execucao["resultados"]:
+            if "erro" not in resultado:
+                escritor.writerows(linhas_csv(resultado))
+
+    print(f"Resultados salvos em:\n{caminho_json}\n{caminho_csv}")
+    return caminho_json
+
+if __name__ == "__main__":
+    main()
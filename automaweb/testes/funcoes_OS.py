@@ -1,11 +1,13 @@
 import sys
 import os
 
+#o main.py usa imports relativos (from .cdp import ...), então precisa ser importado como
+#parte do pacote automaweb: a raiz do repositório entra no sys.path, e não a pasta automaweb
 diretorio_atual = os.path.dirname(os.path.abspath(__file__))
-diretorio_pai = os.path.dirname(diretorio_atual)
-sys.path.append(diretorio_pai)
+diretorio_raiz = os.path.dirname(os.path.dirname(diretorio_atual))
+sys.path.append(diretorio_raiz)
 
-from main import *
+from automaweb import *
 
 # arquivo = automaweb.selecionar_arquivo()
 # print(arquivo)
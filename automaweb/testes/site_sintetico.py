@@ -0,0 +1,181 @@
+"""
+site sintético servido localmente (http.server), usado pelo benchmark.py
+
+páginas disponíveis:
+    /formulario                 campos de texto, select, checkbox e botão
+    /tabela?linhas=N&colunas=M  tabela grande
+    /atrasado?ms=N              elemento que aparece (e spinner que some) após N ms
+    /iframes?niveis=N           iframes aninhados com um botão no mais interno
+    /download?kb=N              arquivo binário para download
+"""
+
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+import threading
+
+PAGINA = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{titulo}</title></head>
+<body>
+{corpo}
+</body></html>"""
+
+FORMULARIO = """
+<form id="formulario" onsubmit="return false;">
+    <input id="nome" name="nome" type="text">
+    <input id="email" name="email" type="email">
+    <textarea id="descricao" name="descricao"></textarea>
+    <select id="estado" name="estado">
+        <option value="">Selecione</option>
+        <option value="SP">São Paulo</option>
+        <option value="RJ">Rio de Janeiro</option>
+        <option value="MG">Minas Gerais</option>
+    </select>
+    <input id="aceite" type="checkbox">
+    <button id="enviar" type="button" onclick="document.getElementById('resultado').textContent = 'enviado ' + (++window.envios);">Enviar</button>
+</form>
+<div id="resultado">nada</div>
+<script>window.envios = 0;</script>
+"""
+
+ATRASADO = """
+<div id="carregando">carregando...</div>
+<div id="area"></div>
+<script>
+setTimeout(function () {{
+    var alvo = document.createElement('div');
+    alvo.id = 'alvo';
+    alvo.textContent = 'pronto';
+    document.getElementById('area').appendChild(alvo);
+    document.getElementById('carregando').style.display = 'none';
+    window.__inserido = performance.now();
+}}, {ms});
+</script>
+"""
+
+class _Manipulador(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1" #mantém as conexões abertas (keep-alive), como um servidor real
+
+    def log_message(self, *args):
+        #silencia o log de cada requisição (poluiria a saída do benchmark)
+        pass
+
+    def do_GET(self):
+
+        url = urlparse(self.path)
+        parametros = {chave: valores[0] for chave, valores in parse_qs(url.query).items()}
+        rota = getattr(self, f"_pagina_{url.path.strip('/') or 'inicio'}", None)
+        if rota is None:
+            self.send_error(404)
+            return
+        rota(parametros)
+
+    def _responder(self, conteudo, tipo="text/html; charset=utf-8", cabecalhos=None):
+
+        if isinstance(conteudo, str):
+            conteudo = conteudo.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(conteudo)))
+        for chave, valor in (cabecalhos or {}).items():
+            self.send_header(chave, valor)
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def _pagina_inicio(self, parametros):
+
+        links = "".join(f'<li><a href="/{nome}">{nome}</a></li>' for nome in ("formulario", "tabela", "atrasado", "iframes", "download"))
+        self._responder(PAGINA.format(titulo="inicio", corpo=f"<ul>{links}</ul>"))
+
+    def _pagina_formulario(self, parametros):
+
+        self._responder(PAGINA.format(titulo="formulario", corpo=FORMULARIO))
+
+    def _pagina_tabela(self, parametros):
+
+        linhas = int(parametros.get("linhas", 1000))
+        colunas = int(parametros.get("colunas", 10))
+        partes = ['<table id="tabela"><thead><tr>']
+        partes.extend(f"<th>coluna {c}</th>" for c in range(colunas))
+        partes.append("</tr></thead><tbody>")
+        for l in range(linhas):
+            partes.append(f'<tr id="linha-{l}">')
+            partes.extend(f'<td class="c{c}">{l}-{c}</td>' for c in range(colunas))
+            partes.append("</tr>")
+        partes.append("</tbody></table>")
+        self._responder(PAGINA.format(titulo="tabela", corpo="".join(partes)))
+
+    def _pagina_atrasado(self, parametros):
+
+        self._responder(PAGINA.format(titulo="atrasado", corpo=ATRASADO.format(ms=int(parametros.get("ms", 500)))))
+
+    def _pagina_iframes(self, parametros):
+
+        niveis = int(parametros.get("niveis", 3))
+        if niveis <= 0:
+            corpo = '<button id="botao" onclick="this.textContent = \'clicado\';">interno</button>'
+        else:
+            corpo = f'<div>nível {niveis}</div><iframe id="quadro" src="/iframes?niveis={niveis - 1}" width="600" height="400"></iframe>'
+        self._responder(PAGINA.format(titulo=f"iframes {niveis}", corpo=corpo))
+
+    def _pagina_download(self, parametros):
+
+        kb = int(parametros.get("kb", 512))
+        nome = parametros.get("nome", f"arquivo_{kb}kb.bin")
+        if parametros.get("link"):
+            corpo = f'<a id="baixar" href="/download?kb={kb}&nome={nome}" download="{nome}">baixar</a>'
+            self._responder(PAGINA.format(titulo="download", corpo=corpo))
+            return
+        self._responder(b"\0" * (kb * 1024), "application/octet-stream", {"Content-Disposition": f'attachment; filename="{nome}"'})
+
+class SiteSintetico:
+    '''
+    Servidor HTTP local com páginas sintéticas para medir o desempenho das automações sem depender da internet.
+
+    Args:
+        porta (int): A porta do servidor. Padrão é 0 (uma porta livre qualquer).
+    '''
+    def __init__(self, porta: int = 0):
+
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", porta), _Manipulador)
+        self._servidor.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endereco(self):
+
+        '''o endereço base do site (ex: http://127.0.0.1:8123)'''
+        host, porta = self._servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def url(self, caminho: str):
+
+        '''monta a URL completa de uma página do site'''
+        return f"{self.endereco}/{caminho.lstrip('/')}"
+
+    def iniciar(self):
+
+        '''inicia o servidor numa thread separada'''
+        self._thread = threading.Thread(target=self._servidor.serve_forever, name="site-sintetico", daemon=True)
+        self._thread.start()
+        return self
+
+    def parar(self):
+
+        '''encerra o servidor'''
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *args):
+        self.parar()
+
+if __name__ == "__main__":
+    with SiteSintetico(8000) as site:
+        print(f"Site sintético em {site.endereco} (Ctrl+C para sair)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
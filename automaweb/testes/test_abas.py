@@ -0,0 +1,90 @@
+"""
+testes do registro de abas no backend do DrissionPage (Edge undetected), com um ChromiumPage falso
+"""
+
+from automaweb.main import Navegador
+from automaweb.backends import BackendDrission
+
+class AbaFalsa:
+    '''imita o ChromiumTab: cada aba tem a sua URL e executa os scripts nela mesma'''
+    def __init__(self, navegador, tab_id):
+
+        self.navegador = navegador
+        self.tab_id = tab_id
+        self.url = "about:blank"
+
+    def get(self, url):
+        self.url = url
+
+    def refresh(self):
+        pass
+
+    def run_js(self, script, *args):
+        return self.url
+
+class PaginaFalsa(AbaFalsa):
+    '''imita o ChromiumPage: preso à primeira aba, mas cria, ativa e fecha as outras'''
+    def __init__(self):
+
+        super().__init__(self, "aba-0")
+        self.outras = {}
+        self.ativa = self.tab_id
+
+    @property
+    def tab_ids(self):
+        return [self.tab_id] + list(self.outras)
+
+    def new_tab(self):
+        aba = AbaFalsa(self, f"aba-{len(self.outras) + 1}")
+        self.outras[aba.tab_id] = aba
+        return aba
+
+    def get_tab(self, tab_id):
+        return self.outras[tab_id]
+
+    def activate_tab(self, tab_id):
+        self.ativa = tab_id
+
+    def close_tabs(self, tab_id):
+        del self.outras[tab_id]
+
+def _navegador():
+
+    nav = Navegador(navegador="edge")
+    nav.driver, nav.wait = PaginaFalsa(), object()
+    nav._backend = BackendDrission(nav)
+    nav._registrar_aba_inicial()
+    return nav
+
+def test_abrir_alternar_e_fechar_abas():
+
+    nav = _navegador()
+    nav.abrir_url("https://exemplo.com/inicio")
+    handle = nav.abrir_nova_aba("https://exemplo.com/relatorio", nome="relatorio")
+    assert handle == "aba-1" and nav.driver.ativa == "aba-1"
+    #a aba nova recebeu a URL e os scripts rodam nela, não na aba do ChromiumPage
+    assert nav._executar_script("return location.href") == "https://exemplo.com/relatorio"
+    assert nav.driver.url == "https://exemplo.com/inicio"
+
+    nav.alternar_aba("principal")
+    assert nav._executar_script("return location.href") == "https://exemplo.com/inicio"
+    nav.alternar_aba("relatorio")
+    assert nav._backend.url_atual() == "https://exemplo.com/relatorio"
+
+    nav.fechar_aba("relatorio")
+    assert nav.driver.tab_ids == ["aba-0"]
+    assert nav.abas == {"principal": "aba-0"}
+    assert nav._aba_atual == "aba-0" and nav.driver.ativa == "aba-0"
+
+def test_processar_em_abas_fecha_as_abas_de_trabalho():
+
+    nav = _navegador()
+    #o carregamento falso termina na hora (o script de verificação devolve um valor verdadeiro)
+    resultados = dict(nav.processar_em_abas(
+        ["https://exemplo.com/1", "https://exemplo.com/2", "https://exemplo.com/3"],
+        lambda navegador, url: navegador._aba_atual, quantidade_abas=2,
+    ))
+    assert sorted(resultados) == ["https://exemplo.com/1", "https://exemplo.com/2", "https://exemplo.com/3"]
+    assert set(resultados.values()) == {"aba-1", "aba-2"}
+    assert nav.driver.tab_ids == ["aba-0"]
+    assert nav._aba_atual == "aba-0"
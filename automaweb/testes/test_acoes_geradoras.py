@@ -0,0 +1,126 @@
+"""
+testes das ações que são geradores (processar_em_abas, paginar): métricas, reciclagem e trava do modo seguro_threads
+"""
+
+import threading
+import time
+import gc
+
+import pytest
+
+from automaweb.main import Navegador
+
+def _gerador(self, quantidade, pausa=0.0):
+    for indice in range(quantidade):
+        self._acumular("espera", 0.01)
+        time.sleep(pausa)
+        yield indice
+
+Navegador._teste_gerador = Navegador._verifica_driver(_gerador)
+
+def _navegador(**opcoes):
+
+    nav = Navegador(navegador="chrome", **opcoes)
+    nav.driver, nav.wait = object(), object() #sem navegador de verdade: só o gerador roda
+    return nav
+
+def _trava_livre(nav):
+
+    '''tenta obter a trava da sessão em outra thread'''
+    resultado = []
+
+    def tentar():
+        obtida = nav._trava.acquire(timeout=0.1)
+        if obtida:
+            nav._trava.release()
+        resultado.append(obtida)
+
+    thread = threading.Thread(target=tentar)
+    thread.start()
+    thread.join()
+    return resultado[0]
+
+def test_metricas_e_reciclagem_acompanham_o_gerador():
+
+    nav = _navegador()
+    gerador = nav._teste_gerador(3, 0.02)
+    assert nav._reciclagem_suspensa == 1 #já na chamada, antes do primeiro next()
+    assert list(gerador) == [0, 1, 2]
+    assert nav._reciclagem_suspensa == 0
+    resumo = nav.metricas.resumo()["_gerador"]
+    assert resumo["duracao"]["soma"] >= 0.06
+    assert round(resumo["espera"]["soma"], 3) == 0.03
+
+def test_gerador_fechado_ou_abandonado_libera_a_reciclagem():
+
+    nav = _navegador()
+    gerador = nav._teste_gerador(5)
+    next(gerador)
+    gerador.close()
+    nav._teste_gerador(5) #nunca iniciado
+    gc.collect()
+    assert nav._reciclagem_suspensa == 0
+
+def test_trava_obtida_a_cada_passo():
+
+    nav = _navegador(seguro_threads=True)
+    gerador = nav._teste_gerador(3, 0.3)
+    next(gerador)
+    assert _trava_livre(nav) #entre um item e outro a sessão fica livre
+
+    bloqueada = []
+    thread = threading.Thread(target=lambda: (time.sleep(0.1), bloqueada.append(not _trava_livre(nav))))
+    thread.start()
+    next(gerador) #durante o passo a trava é do gerador
+    thread.join()
+    assert bloqueada == [True]
+
+def test_gerador_abandonado_em_outra_thread_nao_prende_a_trava():
+
+    nav = _navegador(seguro_threads=True)
+    geradores = []
+
+    def criar():
+        geradores.append(nav._teste_gerador(3))
+        next(geradores[0])
+
+    thread = threading.Thread(target=criar)
+    thread.start()
+    thread.join()
+    geradores.clear() #finalizado (close) nesta thread
+    gc.collect()
+    assert _trava_livre(nav)
+    assert nav._reciclagem_suspensa == 0
+
+def test_fechar_driver_respeita_tempo_limite_por_posicao():
+
+    nav = _navegador(seguro_threads=True)
+    esperas = []
+    nav._travar = lambda tempo_limite=None: esperas.append(tempo_limite) or False
+    nav._encerrar_driver = lambda tempo_limite: None
+    nav.fechar_driver(3) #como em fechar_todos_drivers
+    nav.fechar_driver(tempo_limite=4)
+    nav.fechar_driver()
+    assert [espera for espera in esperas if espera is not None] == [3, 4, 10]
+
+def test_paginar_valida_os_argumentos_na_chamada():
+
+    nav = _navegador(seguro_threads=True)
+    for argumentos in ({}, {"proxima": "//a[@rel='next']", "url_modelo": "https://exemplo.com/?p={pagina}"}):
+        with pytest.raises(ValueError):
+            nav.paginar(lambda navegador: [], **argumentos) #sem next(): o erro vem na própria chamada
+    assert nav._reciclagem_suspensa == 0
+    assert _trava_livre(nav)
+
+def test_paginar_registrado_com_o_nome_publico():
+
+    nav = _navegador()
+    nav._backend = type("BackendFalso", (), {"aguardar": lambda self, *args: None})()
+    nav._pagina_carregada = lambda: True
+    nav._iniciar_carregamento = lambda url: None
+    paginas = iter([["a", "b"], ["c"], []])
+    gerador = nav.paginar(lambda navegador: next(paginas), url_modelo="https://exemplo.com/?p={pagina}", pre_carregar=False)
+    assert nav._reciclagem_suspensa == 1
+    assert list(gerador) == ["a", "b", "c"]
+    assert nav._reciclagem_suspensa == 0
+    assert nav.metricas.resumo()["paginar"]["duracao"]["contagem"] == 1
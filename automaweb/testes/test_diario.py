@@ -0,0 +1,81 @@
+"""
+testes do diário de tarefas (diario.py): reservas, concorrência entre workers e retomada das falhas
+"""
+
+import threading
+import time
+
+from automaweb.diario import DiarioTarefas
+
+def test_reserva_expirada_volta_para_a_fila(tmp_path):
+
+    diario = DiarioTarefas(str(tmp_path / "lote.db"), tempo_reserva=0.05)
+    diario.adicionar(["a"])
+    primeira = diario.proximo("w1")
+    assert diario.proximo("w2") is None #ainda reservada para o w1
+
+    time.sleep(0.1)
+    segunda = diario.proximo("w2")
+    assert (segunda.chave, segunda.tentativas, segunda.trabalhador) == ("a", 2, "w2")
+
+    #a conclusão atrasada do w1 é ignorada, a do w2 vale
+    assert diario.concluir(primeira, "atrasado") is False
+    assert diario.falhar(primeira, "atrasado") is False
+    assert diario.concluir(segunda, "ok") is True
+    assert diario.resumo()["concluida"] == 1
+
+def test_proximo_concorrente_nao_repete_tarefas(tmp_path):
+
+    caminho = str(tmp_path / "lote.db")
+    DiarioTarefas(caminho).adicionar(range(200))
+    #dois diários (duas conexões) no mesmo arquivo, cada um com duas threads
+    diarios = [DiarioTarefas(caminho), DiarioTarefas(caminho)]
+    reservadas = []
+    trava = threading.Lock()
+
+    def trabalhar(diario, nome):
+        while True:
+            tarefa = diario.proximo(nome)
+            if tarefa is None:
+                return
+            with trava:
+                reservadas.append(tarefa.chave)
+            diario.concluir(tarefa)
+
+    threads = [
+        threading.Thread(target=trabalhar, args=(diario, f"w{indice}-{thread}"))
+        for indice, diario in enumerate(diarios) for thread in range(2)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(reservadas, key=int) == [str(numero) for numero in range(200)]
+    assert diarios[0].resumo() == {"pendente": 0, "executando": 0, "concluida": 200, "falhou": 0, "esgotada": 0}
+
+def test_resumo_nao_esgota_tarefa_em_andamento(tmp_path):
+
+    diario = DiarioTarefas(str(tmp_path / "lote.db"), max_tentativas=1, tempo_reserva=0.05)
+    diario.adicionar(["a"])
+    diario.proximo("w1")
+    assert diario.resumo()["executando"] == 1 #última tentativa, mas a reserva ainda vale
+
+    time.sleep(0.1)
+    assert diario.resumo()["esgotada"] == 1
+
+def test_reiniciar_falhas_inclui_worker_morto_na_ultima_tentativa(tmp_path):
+
+    diario = DiarioTarefas(str(tmp_path / "lote.db"), max_tentativas=1, tempo_reserva=0.05)
+    diario.adicionar(["falhou", "morreu", "ok"])
+    diario.falhar(diario.proximo("w1"), RuntimeError("erro"))
+    diario.proximo("w1") #o worker morre sem concluir nem falhar
+    diario.concluir(diario.proximo("w1"))
+    time.sleep(0.1)
+    assert diario.proximo("w2") is None #sem tentativas restantes
+
+    assert [falha["chave"] for falha in diario.falhas()] == ["falhou", "morreu"]
+    assert diario.falhas()[0]["erro"] == "RuntimeError: erro"
+    assert diario.reiniciar_falhas() == 2
+    assert diario.resumo() == {"pendente": 2, "executando": 0, "concluida": 1, "falhou": 0, "esgotada": 0}
+    assert {diario.proximo("w2").chave, diario.proximo("w2").chave} == {"falhou", "morreu"}
@@ -0,0 +1,73 @@
+"""
+testes da exportação da gravação de tela quando uma ação falha (sem navegador de verdade)
+"""
+
+import os
+
+import pytest
+
+from automaweb.main import Navegador
+
+class GravadorFalso:
+    '''imita o GravadorTela: só registra as exportações'''
+    def __init__(self):
+
+        self.exportacoes = []
+
+    def exportar(self, destino, segundos):
+        self.exportacoes.append(destino)
+
+def _interna(self):
+    raise ValueError("falhou")
+
+def _externa(self):
+    self._teste_interna()
+
+def _gerador_falho(self):
+    yield 1
+    self._teste_interna()
+
+Navegador._teste_interna = Navegador._verifica_driver(_interna)
+Navegador._teste_externa = Navegador._verifica_driver(_externa)
+Navegador._teste_gerador_falho = Navegador._verifica_driver(_gerador_falho)
+
+@pytest.fixture
+def nav(tmp_path):
+
+    nav = Navegador(navegador="chrome")
+    nav.driver, nav.wait = object(), object()
+    nav._gravador_tela = GravadorFalso()
+    nav._pasta_falhas = str(tmp_path)
+    return nav
+
+def _acoes_exportadas(nav):
+
+    #as pastas exportadas se chamam <ação>_<data>_<hora>
+    return [os.path.basename(destino).rsplit("_", 3)[0] for destino in nav._gravador_tela.exportacoes]
+
+def test_falha_de_qualquer_acao_exporta_a_gravacao(nav):
+
+    with pytest.raises(ValueError):
+        nav._teste_interna()
+    assert _acoes_exportadas(nav) == ["_interna"]
+
+def test_acao_chamada_por_outra_exporta_uma_vez(nav):
+
+    with pytest.raises(ValueError):
+        nav._teste_externa()
+    assert _acoes_exportadas(nav) == ["_externa"]
+
+def test_falha_dentro_de_um_gerador_exporta_uma_vez(nav):
+
+    gerador = nav._teste_gerador_falho()
+    assert next(gerador) == 1
+    with pytest.raises(ValueError):
+        next(gerador)
+    assert _acoes_exportadas(nav) == ["_gerador_falho"]
+
+def test_sem_pasta_de_falhas_nao_exporta(nav):
+
+    nav._pasta_falhas = None
+    with pytest.raises(ValueError):
+        nav._teste_interna()
+    assert nav._gravador_tela.exportacoes == []
@@ -0,0 +1,120 @@
+"""
+testes do índice de conteúdo (indice_hash.py) e das opções de duplicado de mover_arquivo/copiar_arquivo
+"""
+
+import os
+
+import pytest
+
+from automaweb import indice_hash
+from automaweb.indice_hash import IndiceHash
+from automaweb.main import mover_arquivo, copiar_arquivo
+
+@pytest.fixture
+def leituras(monkeypatch):
+
+    '''conta os arquivos lidos por calcular_hash'''
+    lidos = []
+    original = indice_hash.calcular_hash
+
+    def contar(caminho, algoritmo="sha256"):
+        lidos.append(caminho)
+        return original(caminho, algoritmo)
+
+    monkeypatch.setattr(indice_hash, "calcular_hash", contar)
+    return lidos
+
+@pytest.fixture
+def indice(tmp_path):
+
+    indice = IndiceHash(str(tmp_path / "hashes.db"))
+    yield indice
+    indice.fechar()
+
+def _entradas(indice):
+
+    '''o conteúdo do índice como {caminho: hash}'''
+    return dict(indice._conexao().execute("SELECT caminho, hash FROM arquivos").fetchall())
+
+def _arquivo(pasta, nome, conteudo):
+
+    caminho = pasta / nome
+    caminho.parent.mkdir(parents=True, exist_ok=True)
+    caminho.write_bytes(conteudo)
+    return str(caminho)
+
+def test_tamanho_diferente_nao_le_o_arquivo(indice, leituras, tmp_path):
+
+    guardado = _arquivo(tmp_path / "guardados", "a.bin", b"abc")
+    indice.indexar(str(tmp_path / "guardados"))
+    leituras.clear()
+
+    novo = _arquivo(tmp_path, "novo.bin", b"abcd")
+    assert indice.duplicado(novo) is None
+    assert leituras == [] #nenhum arquivo indexado tem 4 bytes
+
+    igual = _arquivo(tmp_path, "igual.bin", b"abc")
+    assert indice.duplicado(igual) == guardado
+    assert leituras == [igual]
+
+def test_arquivo_sem_mudanca_usa_o_hash_guardado(indice, leituras, tmp_path):
+
+    caminho = _arquivo(tmp_path, "a.bin", b"conteudo")
+    valor = indice.hash(caminho)
+    assert indice.hash(caminho) == valor
+    assert indice.indexar([caminho]) == {caminho: valor}
+    assert leituras == [caminho] #só a primeira chamada leu o arquivo
+
+    #mudou o tamanho e a data de modificação: o arquivo é lido de novo
+    with open(caminho, "ab") as arquivo:
+        arquivo.write(b"!")
+    os.utime(caminho, ns=(0, 0))
+    assert indice.hash(caminho) != valor
+    assert leituras == [caminho, caminho]
+
+@pytest.mark.parametrize("operacao", [mover_arquivo, copiar_arquivo])
+def test_duplicado_link(indice, tmp_path, operacao):
+
+    existente = _arquivo(tmp_path / "guardados", "a.bin", b"mesmo conteudo")
+    valor = indice.registrar(existente)
+    origem = _arquivo(tmp_path / "baixados", "b.bin", b"mesmo conteudo")
+    (tmp_path / "destino").mkdir()
+
+    destino = operacao(origem, str(tmp_path / "destino"), indice=indice, duplicado="link")
+    assert destino == str(tmp_path / "destino" / "b.bin")
+    assert os.stat(existente).st_nlink == 2
+    assert os.path.samefile(existente, destino)
+    assert os.path.exists(origem) == (operacao is copiar_arquivo)
+
+    entradas = _entradas(indice)
+    assert entradas[existente] == entradas[destino] == valor
+    assert (origem in entradas) == (operacao is copiar_arquivo)
+
+@pytest.mark.parametrize("operacao", [mover_arquivo, copiar_arquivo])
+def test_duplicado_excluir(indice, tmp_path, operacao):
+
+    existente = _arquivo(tmp_path / "guardados", "a.bin", b"mesmo conteudo")
+    indice.registrar(existente)
+    origem = _arquivo(tmp_path / "baixados", "b.bin", b"mesmo conteudo")
+    (tmp_path / "destino").mkdir()
+
+    assert operacao(origem, str(tmp_path / "destino"), indice=indice, duplicado="excluir") == existente
+    assert os.listdir(tmp_path / "destino") == []
+    assert os.stat(existente).st_nlink == 1
+    assert os.path.exists(origem) == (operacao is copiar_arquivo)
+    assert (origem in _entradas(indice)) == (operacao is copiar_arquivo)
+
+@pytest.mark.parametrize("operacao", [mover_arquivo, copiar_arquivo])
+def test_conteudo_novo_e_gravado_e_registrado(indice, tmp_path, operacao):
+
+    _arquivo(tmp_path / "guardados", "a.bin", b"outro conteudo")
+    indice.indexar(str(tmp_path / "guardados"))
+    origem = _arquivo(tmp_path / "baixados", "b.bin", b"conteudo novo!")
+    (tmp_path / "destino").mkdir()
+
+    destino = operacao(origem, str(tmp_path / "destino"), indice=indice, duplicado="link")
+    assert destino == str(tmp_path / "destino" / "b.bin")
+    assert os.stat(destino).st_nlink == 1
+    assert _entradas(indice)[destino] == indice_hash.calcular_hash(destino)
+    #mesmo tamanho do arquivo guardado: a origem foi lida e registrada, e ao mover sai do índice
+    assert (origem in _entradas(indice)) == (operacao is copiar_arquivo)
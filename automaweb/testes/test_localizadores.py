@@ -0,0 +1,88 @@
+"""
+testes da tradução dos XPaths (localizadores.py): execute com "python -m pytest automaweb/testes"
+"""
+
+import pytest
+
+from automaweb.localizadores import compilar_localizador, seletor_css, validar_xpath
+from automaweb.erros import XPathInvalidoErro
+
+#XPath -> (estratégia, valor esperado)
+TRADUCOES = [
+    ("//*[@id='email']", ("id", "email")),
+    ("//*[@id='a b']", ("css", "*[id='a b']")),
+    ("//input[@id='email']", ("css", "input[id='email']")),
+    ("//form[@name='login']//button[1]", ("css", "form[name='login'] button:nth-of-type(1)")),
+    ("//div[contains(@class, 'card') and @role]", ("css", "div[class*='card'][role]")),
+    ("//a[starts-with(@href, 'https')]", ("css", "a[href^='https']")),
+    ("//ul/li[2]", ("css", "ul > li:nth-of-type(2)")),
+    ("//ul/*[2]", ("css", "ul > *:nth-child(2)")),
+    ("//li[last()]", ("css", "li:last-of-type")),
+    ("//ul/*[last()]", ("css", "ul > *:last-child")),
+    ("//a[@x!='1']", ("css", "a[x]:not([x='1'])")),
+    ("//a[not(@disabled)]", ("css", "a:not([disabled])")),
+    ("//a[@title=\"it's\"]", ("css", "a[title='it\\'s']")),
+    ("//a[@title='c:\\d']", ("css", "a[title='c:\\\\d']")),
+    ("//a[@title='linha\num']", ("css", "a[title='linha\\a um']")),
+    ("//a[@title='a\r\nb']", ("css", "a[title='a\\d \\a b']")),
+    ("//a[text()='x']", ("xpath", "//a[text()='x']")),
+    ("//a[contains(@class, '')]", ("xpath", "//a[contains(@class, '')]")),
+    ("//li[@class='x'][1]", ("xpath", "//li[@class='x'][1]")),
+    ("//div/following-sibling::span", ("xpath", "//div/following-sibling::span")),
+    ("//a | //b", ("xpath", "//a | //b")),
+    ("/html/body", ("xpath", "/html/body")),
+    ("//svg:rect", ("xpath", "//svg:rect")),
+    #o CSS compara estes valores sem diferenciar maiúsculas no HTML: ficam no XPath
+    ("//input[@type='TEXT']", ("xpath", "//input[@type='TEXT']")),
+    ("//form[@method='post']", ("xpath", "//form[@method='post']")),
+    ("//a[@rel!='nofollow']", ("xpath", "//a[@rel!='nofollow']")),
+    ("//a[starts-with(@target, '_b')]", ("xpath", "//a[starts-with(@target, '_b')]")),
+    ("//input[@TYPE='text']", ("xpath", "//input[@TYPE='text']")),
+    ("//input[@type and @name='q']", ("css", "input[type][name='q']")),
+    ("//input[not(@checked)]", ("css", "input:not([checked])")),
+]
+
+#XPaths malformados, recusados antes de ir ao navegador
+INVALIDOS = [
+    "",
+    "//div[",
+    "//div[@id='x'",
+    "//div]",
+    "//div[@id='x]",
+    "//div[@id=]",
+    "//div[contains(@class 'x')]",
+    "//div[@id='a'\n",
+    "//div//",
+    "//div[funcao_inexistente()]",
+]
+
+@pytest.mark.parametrize("xpath, esperado", TRADUCOES)
+def test_traducao(xpath, esperado):
+
+    localizador = compilar_localizador(xpath)
+    assert (localizador.estrategia, localizador.valor) == esperado
+    assert localizador.xpath == xpath
+
+@pytest.mark.parametrize("xpath", [xpath for xpath, _ in TRADUCOES])
+def test_sem_traducao_mantem_xpath(xpath):
+
+    localizador = compilar_localizador(xpath, traduzir=False)
+    assert (localizador.estrategia, localizador.valor) == ("xpath", xpath)
+
+@pytest.mark.parametrize("xpath", INVALIDOS)
+def test_xpath_invalido(xpath):
+
+    with pytest.raises(XPathInvalidoErro):
+        validar_xpath(xpath)
+    with pytest.raises(XPathInvalidoErro):
+        compilar_localizador(xpath)
+
+@pytest.mark.parametrize("xpath, seletor", [
+    ("//*[@id='email']", "[id='email']"),
+    ("//*[@id='x\ny']", "*[id='x\\a y']"),
+    ("//input[@name='q']", "input[name='q']"),
+    ("//a[text()='x']", None),
+])
+def test_seletor_css(xpath, seletor):
+
+    assert seletor_css(compilar_localizador(xpath)) == seletor
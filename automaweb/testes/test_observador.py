@@ -0,0 +1,79 @@
+"""
+testes do observador de pastas (observador.py), com inotify e com a comparação de listagens
+"""
+
+import threading
+import time
+
+import pytest
+
+from automaweb.observador import ObservadorPasta
+
+def _aguardar(condicao, timeout: float = 5):
+
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if condicao():
+            return True
+        time.sleep(0.02)
+    return condicao()
+
+@pytest.fixture(params=[True, False], ids=["inotify", "polling"])
+def observar(request, tmp_path):
+
+    observadores = []
+
+    def criar(ao_detectar, **opcoes):
+        observador = ObservadorPasta(
+            str(tmp_path), ao_detectar, estabilidade=0.1, intervalo_polling=0.05, usar_inotify=request.param, **opcoes
+        )
+        observadores.append(observador.iniciar())
+        return observador
+
+    yield criar
+    for observador in observadores:
+        observador.parar()
+
+def test_entrega_arquivo_estavel_uma_vez(observar, tmp_path):
+
+    entregues = []
+    trava = threading.Lock()
+
+    def ao_detectar(caminho):
+        with trava:
+            entregues.append(caminho)
+
+    observar(ao_detectar, padroes=("*.txt",))
+    (tmp_path / "ignorado.crdownload").write_text("parcial")
+    (tmp_path / "outro.csv").write_text("x")
+    arquivo = tmp_path / "relatorio.txt"
+    arquivo.write_text("conteudo")
+    assert _aguardar(lambda: entregues)
+    time.sleep(0.3)
+    assert entregues == [str(arquivo)]
+
+def test_apagados_saem_dos_registros(observar, tmp_path):
+
+    entregues = []
+    observador = observar(entregues.append)
+    arquivo = tmp_path / "a.txt"
+    arquivo.write_text("a")
+    assert _aguardar(lambda: observador._entregues)
+
+    arquivo.unlink()
+    assert _aguardar(lambda: not observador._entregues and not observador._pendentes)
+
+    #um arquivo marcado para ser ignorado e apagado antes do evento também sai do registro
+    gerado = tmp_path / "gerado.txt"
+    gerado.write_text("g")
+    observador.ignorar_uma_vez(str(gerado))
+    gerado.unlink()
+    assert _aguardar(lambda: not observador._ignorar_uma_vez and not observador._pendentes)
+    assert entregues == [str(arquivo)]
+
+def test_ignorar_uma_vez_so_registra_arquivos_observados(observar, tmp_path):
+
+    observador = observar(lambda caminho: None, padroes=("*.pdf",))
+    observador.ignorar_uma_vez(str(tmp_path / "nota.txt")) #nome não aceito
+    observador.ignorar_uma_vez(str(tmp_path.parent / "fora.pdf")) #fora da pasta
+    assert observador._ignorar_uma_vez == {}
@@ -0,0 +1,108 @@
+"""
+testes da validação e do agrupamento em lotes dos planos de ações (plano.py), sem navegador
+"""
+
+import pytest
+
+from automaweb.plano import PlanoAcoes
+from automaweb.erros import PlanoInvalidoErro
+
+def test_forma_abreviada():
+
+    plano = PlanoAcoes([
+        ["clicar", "//button"],
+        ("digitar", "//input[@name='q']", "busca"),
+        ["sair_iframe"],
+        {"acao": "obter_texto", "xpath": "//h1", "nome": "titulo"},
+    ])
+    assert plano.passos == [
+        {"acao": "clicar", "xpath": "//button"},
+        {"acao": "digitar", "xpath": "//input[@name='q']", "texto": "busca"},
+        {"acao": "sair_iframe"},
+        {"acao": "obter_texto", "xpath": "//h1", "nome": "titulo"},
+    ]
+
+def test_erros_reunidos_numa_unica_excecao():
+
+    with pytest.raises(PlanoInvalidoErro) as erro:
+        PlanoAcoes([
+            ["clicar", "//a", "sobrando"],
+            "clicar",
+            {"acao": "voar"},
+            {"acao": "digitar", "xpath": "//input"},
+            {"acao": "clicar", "xpath": "//a", "cor": "azul"},
+            {"acao": "clicar", "xpath": "//div["},
+            {"acao": "clicar", "xpath": "//a", "semantica": "magica"},
+            ["obter_texto", "//p"], #válido: não aparece na mensagem
+        ])
+    linhas = str(erro.value).splitlines()
+    assert linhas[0] == "Plano de ações inválido:"
+    assert linhas[1:6] == [
+        "passo 0 (clicar): argumentos demais",
+        "passo 1: informe um dicionário com 'acao' ou uma lista ['acao', ...]",
+        "passo 2: ação 'voar' desconhecida",
+        "passo 3 (digitar): faltando texto",
+        "passo 4 (clicar): campos desconhecidos cor",
+    ]
+    assert linhas[6].startswith("passo 5 (clicar): XPath inválido (")
+    assert linhas[7] == "passo 6 (clicar): semântica 'magica' inválida"
+    assert len(linhas) == 8
+
+@pytest.mark.parametrize("passos", [None, "clicar", {"acao": "clicar"}])
+def test_plano_que_nao_e_lista(passos):
+
+    with pytest.raises(PlanoInvalidoErro):
+        PlanoAcoes(passos)
+
+def test_semantica_do_plano_invalida():
+
+    with pytest.raises(PlanoInvalidoErro):
+        PlanoAcoes([], semantica="rapida")
+
+#passos usados nos testes de agrupamento
+LEITURAS = [["obter_texto", "//p"], ["obter_atributo", "//a", "href"]]
+ACOES_PAGINA = [["digitar", "//input", "x"], ["selecionar_valor", "//select", "1"], ["clicar", "//button"]]
+
+def test_nativa_agrupa_so_leituras_e_esperas():
+
+    plano = PlanoAcoes(LEITURAS + ACOES_PAGINA + [["rolar_ate_elemento", "//footer"], ["aguardar_elemento_sumir", "//div"]])
+    assert plano.lotes == [[0, 1], [2], [3], [4], [5, 6]]
+
+def test_script_agrupa_acoes_e_clicar_encerra_o_lote():
+
+    plano = PlanoAcoes(LEITURAS + ACOES_PAGINA + LEITURAS, semantica="script")
+    assert plano.lotes == [[0, 1, 2, 3, 4], [5, 6]]
+
+    #cliques seguidos: cada um fecha o seu lote
+    plano = PlanoAcoes([["clicar", "//a"], ["clicar", "//b"], ["obter_texto", "//p"]], semantica="script")
+    assert plano.lotes == [[0], [1], [2]]
+
+def test_passos_fora_do_script_quebram_o_lote():
+
+    plano = PlanoAcoes([
+        ["digitar", "//input", "x"],
+        ["abrir_url", "https://exemplo.com"], #nunca roda dentro da página
+        ["obter_texto", "//p"],
+        ["pausar", 1],
+        ["limpar", "//input"],
+        ["passar_mouse", "//menu"],
+    ], semantica="script")
+    assert plano.lotes == [[0], [1], [2], [3], [4, 5]]
+
+def test_semantica_por_passo():
+
+    #na nativa, um passo pode pedir o script (e vice-versa)
+    plano = PlanoAcoes([
+        ["obter_texto", "//p"],
+        {"acao": "digitar", "xpath": "//input", "texto": "x", "semantica": "script"},
+        {"acao": "clicar", "xpath": "//button", "semantica": "script"},
+        ["digitar", "//input", "y"],
+    ])
+    assert plano.lotes == [[0, 1, 2], [3]]
+
+    plano = PlanoAcoes([
+        ["digitar", "//input", "x"],
+        {"acao": "limpar", "xpath": "//input", "semantica": "nativa"},
+        ["obter_texto", "//p"],
+    ], semantica="script")
+    assert plano.lotes == [[0], [1], [2]]
@@ -0,0 +1,37 @@
+"""
+testes da reciclagem do navegador (Navegador.reciclar_driver) sem abrir um navegador de verdade
+"""
+
+from automaweb.main import Navegador
+from automaweb.backends import BackendDrission
+
+class PaginaFalsa:
+    '''imita o ChromiumPage do DrissionPage: a URL fica em .url (não há current_url)'''
+    def __init__(self, url):
+
+        self.url = url
+        self.tab_id = "aba-1"
+
+    def run_js(self, script, *args):
+        return ["https://exemplo.com", {"chave": "valor"}, {}]
+
+def test_reciclar_drission_le_a_url_pelo_backend():
+
+    nav = Navegador(navegador="edge")
+    nav.driver = PaginaFalsa("https://exemplo.com/painel")
+    nav._backend = BackendDrission(nav)
+    nav._parametros_abertura = ("abrir_driver_undetected", {"headless": True})
+    aberturas, restaurados = [], []
+    nav._obter_todos_cookies = lambda: [{"name": "sessao", "value": "1"}]
+    nav._memoria_mb = lambda: None
+    nav.fechar_driver = lambda: None
+    nav.abrir_driver_undetected = lambda **parametros: aberturas.append(parametros)
+    nav._restaurar_estado = lambda url, cookies, armazenamento: restaurados.append((url, cookies, armazenamento))
+
+    nav.reciclar_driver("teste")
+
+    assert aberturas == [{"headless": True}]
+    assert restaurados == [(
+        "https://exemplo.com/painel", [{"name": "sessao", "value": "1"}], ["https://exemplo.com", {"chave": "valor"}, {}]
+    )]
+    assert nav.reciclagens == 1